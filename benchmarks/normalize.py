@@ -0,0 +1,105 @@
+"""
+Label and hostname normalization throughput, per-name calls versus the batch API.
+
+Times the original per-part check (one regex match per dot-separated part, as every ingestion
+path did before the batch API), `normalize_label` / `normalize_domain` in a loop (now one
+combined match per name), and `normalize_labels` / `normalize_domains` over the same names, for
+a wordlist of distinct labels, a list dominated by repeats (like CT results or merged host
+lists) and distinct hostnames. Best of `--repeat` runs.
+
+    python benchmarks/normalize.py --names 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from subdomain_scout.validation import (
+    _validate_hostname,
+    normalize_domain,
+    normalize_domains,
+    normalize_label,
+    normalize_labels,
+)
+
+_BATCH = 1024
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _batched(fn: Callable[[list[str]], list[str]], names: list[str]) -> Callable[[], object]:
+    def run() -> object:
+        return [fn(names[i : i + _BATCH]) for i in range(0, len(names), _BATCH)]
+
+    return run
+
+
+def _per_part(single_label: bool) -> Callable[[str], str]:
+    def normalize(raw: str) -> str:
+        value = raw.strip().strip(".").lower()
+        _validate_hostname(value, allow_single_label=single_label, value_name="name")
+        return value
+
+    return normalize
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1] if __doc__ else None)
+    parser.add_argument("--names", type=int, default=200000, help="Names per workload")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON object per workload")
+    args = parser.parse_args()
+
+    n = args.names
+    unique = [f"Host-{i}.dev" for i in range(n)]
+    repeated = [f"www{i % 500}" for i in range(n)]
+    hosts = [f"api-{i}.eu.example.com" for i in range(n)]
+    workloads: list[tuple[str, list[str], bool]] = [
+        ("labels_unique", unique, True),
+        ("labels_repeated", repeated, True),
+        ("hosts_unique", hosts, False),
+    ]
+    if not args.json:
+        print(
+            f"{'workload':>16} {'per_part_s':>11} {'per_name_s':>11} {'batch_s':>9} {'speedup':>8}"
+        )
+    for name, names, single_label in workloads:
+        one = normalize_label if single_label else normalize_domain
+        batch = normalize_labels if single_label else normalize_domains
+        part = _per_part(single_label)
+        per_part = _best(lambda: [part(item) for item in names], args.repeat)
+        per_name = _best(lambda: [one(item) for item in names], args.repeat)
+        batched = _best(_batched(batch, names), args.repeat)
+        if args.json:
+            print(
+                json.dumps(
+                    {
+                        "workload": name,
+                        "names": n,
+                        "per_part_s": round(per_part, 4),
+                        "per_name_s": round(per_name, 4),
+                        "batch_s": round(batched, 4),
+                        "speedup": round(per_part / batched, 2),
+                    }
+                )
+            )
+        else:
+            print(
+                f"{name:>16} {per_part:>11.4f} {per_name:>11.4f} {batched:>9.4f}"
+                f" {per_part / batched:>7.2f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+"""
+Throughput of the threaded scanner per thread count.
+
+Runs `scan` in-process against a local UDP responder (in its own process, so it never competes
+for this interpreter's GIL) that answers every A query instantly, to see whether extra resolver
+threads buy more names per second.
+
+    python benchmarks/thread_scaling.py --names 5000 --threads 1,2,4,8,16,32
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from subdomain_scout.scanner import scan_domains_summary_lines
+
+_A_ANSWER = b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 60, 4) + bytes([192, 0, 2, 1])
+
+
+def _serve(port_queue: multiprocessing.Queue[int]) -> None:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port_queue.put(int(sock.getsockname()[1]))
+    while True:
+        data, addr = sock.recvfrom(4096)
+        if len(data) < 17:
+            continue
+        end = data.index(b"\x00", 12) + 5  # qname terminator + qtype + qclass
+        qtype = struct.unpack("!H", data[end - 4 : end - 2])[0]
+        answers = 1 if qtype == 1 else 0
+        header = data[:2] + struct.pack("!HHHHH", 0x8180, 1, answers, 0, 0)
+        sock.sendto(header + data[12:end] + (_A_ANSWER if answers else b""), addr)
+
+
+def _gil_enabled() -> bool:
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else bool(is_enabled())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1] if __doc__ else None)
+    parser.add_argument("--names", type=int, default=5000, help="Names resolved per run")
+    parser.add_argument("--threads", default="1,2,4,8,16,32", help="Comma-separated --concurrency")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON object per run")
+    args = parser.parse_args()
+
+    port_queue: multiprocessing.Queue[int] = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(port_queue,), daemon=True)
+    server.start()
+    nameservers = [("127.0.0.1", port_queue.get(timeout=10))]
+    labels = [f"host{i}" for i in range(args.names)]
+    build = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "gil_enabled": _gil_enabled(),
+        "cpus": os.cpu_count(),
+    }
+    if not args.json:
+        print(" ".join(f"{key}={value}" for key, value in build.items()))
+        print(f"{'threads':>8} {'names/s':>10} {'elapsed_ms':>11}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for threads in (int(item) for item in str(args.threads).split(",")):
+                start = time.perf_counter()
+                summary = scan_domains_summary_lines(
+                    domain="bench.test",
+                    wordlist_lines=labels,
+                    out_path=Path(tmp) / f"out-{threads}.jsonl",
+                    timeout=2.0,
+                    concurrency=threads,
+                    nameservers=nameservers,
+                )
+                elapsed = time.perf_counter() - start
+                rate = summary.attempted / elapsed
+                if args.json:
+                    print(
+                        json.dumps(
+                            {
+                                **build,
+                                "threads": threads,
+                                "names": summary.attempted,
+                                "names_per_s": round(rate, 1),
+                                "elapsed_ms": int(elapsed * 1000),
+                            }
+                        )
+                    )
+                else:
+                    print(f"{threads:>8} {rate:>10.1f} {int(elapsed * 1000):>11}")
+    finally:
+        server.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
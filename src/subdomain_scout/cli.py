@@ -4,15 +4,40 @@ import argparse
 import contextlib
 import json
 import sys
+import time
 from pathlib import Path
+from typing import IO, Any, Iterator
 
+from .compression import open_text
 from .ct import fetch_ct_subdomains, subdomains_to_labels
-from .dns_client import load_nameservers_file, parse_nameserver
+from .dns_client import load_nameservers_file, parse_nameserver, parse_record_type
 from .diff import compute_diff, load_jsonl
-from .scanner import scan_domains_summary, scan_domains_summary_lines
-from .takeover import build_takeover_checker
-from .validation import normalize_domain
+from .distributed import Coordinator, parse_host_port, run_worker
+from .scanner import (
+    DomainSummary,
+    ScanSummary,
+    scan_domains_summary,
+    scan_domains_summary_lines,
+    scan_hosts_summary_lines,
+)
+from .model import (
+    DEFAULT_ORDER,
+    DEFAULT_PRIORITY_LABELS,
+    build_hit_stats,
+    load_hit_stats,
+    load_label_model,
+    read_host_outcomes,
+    read_observed_hosts,
+    save_hit_stats,
+    save_label_model,
+    train_label_model,
+)
+from .mutations import DEFAULT_MUTATION_BUDGET
+from .patterns import load_pattern_set, parse_pattern
+from .takeover import build_takeover_checker, load_fingerprint_catalog
+from .validation import load_domains_file, normalize_domain, parse_shard
 from .version import get_version
+from .wordlist import compile_wordlist
 
 _SCHEMA_VERSION = 1
 
@@ -23,8 +48,23 @@ def main(argv: list[str] | None = None) -> int:
 
     sub = parser.add_subparsers(dest="cmd", required=True)
     p_scan = sub.add_parser("scan", help="Scan subdomains from wordlist")
-    p_scan.add_argument("--domain", required=True)
-    p_scan.add_argument("--wordlist", required=True, help="Wordlist path (use '-' for stdin)")
+    p_scan_target = p_scan.add_mutually_exclusive_group(required=True)
+    p_scan_target.add_argument("--domain")
+    p_scan_target.add_argument(
+        "--domains-file",
+        default=None,
+        help="Path to a file of target domains (one per line; '#' comments allowed). Scans all domains in one run, interleaving queries across them and sharing resolvers, caches and output.",
+    )
+    p_scan_target.add_argument(
+        "--hosts",
+        default=None,
+        help="Scan fully qualified hostnames from a file (one per line; use '-' for stdin) instead of wordlist labels under --domain. Hosts may span many zones.",
+    )
+    p_scan.add_argument(
+        "--wordlist",
+        default=None,
+        help="Wordlist path (use '-' for stdin; required with --domain/--domains-file)",
+    )
     p_scan.add_argument(
         "--out",
         default="subdomains.jsonl",
@@ -47,12 +87,121 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Include observed CNAME chain in output records and classify CNAME-only results as status=cname (requires --resolver/--resolver-file).",
     )
+    p_scan.add_argument(
+        "--bind",
+        action="append",
+        default=None,
+        help="Local source IP address for outgoing DNS queries (repeatable; queries rotate across them, per address family; requires --resolver/--resolver-file).",
+    )
+    p_scan.add_argument(
+        "--harvest",
+        action="store_true",
+        help="Add in-scope hostnames named in responses (CNAME targets, authority NS/SOA, additional-section glue) to the scan (requires --resolver/--resolver-file).",
+    )
+    p_scan.add_argument(
+        "--mutate",
+        action="store_true",
+        help="Queue permutations of resolved names (numbers stepped, environment tokens swapped, affixes such as -dev or v2-) behind the input, each tried at most once.",
+    )
+    p_scan.add_argument(
+        "--mutate-budget",
+        type=int,
+        default=DEFAULT_MUTATION_BUDGET,
+        help=f"Maximum number of permuted names --mutate adds to the scan (default: {DEFAULT_MUTATION_BUDGET}).",
+    )
+    p_scan.add_argument(
+        "--recursive",
+        type=int,
+        default=0,
+        metavar="DEPTH",
+        help="Scan names that exist as new zones with --recursive-wordlist, up to DEPTH levels below the targets (requires --detect-wildcard; wildcard zones are dropped, and with --resolver/--resolver-file names below an NXDOMAIN are skipped).",
+    )
+    p_scan.add_argument(
+        "--recursive-wordlist",
+        default=None,
+        help="Second-level wordlist for --recursive zones (loaded into memory; keep it short).",
+    )
+    p_scan.add_argument(
+        "--query-budget",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Stop starting new names once N DNS queries have been sent in total (names in flight still finish; not with --workers/--listen).",
+    )
+    p_scan.add_argument(
+        "--record-types",
+        action="append",
+        default=None,
+        help="Comma-separated record types (e.g. MX,TXT,NS,SRV,CAA or TYPE65) to fetch for every name that exists (resolved, CNAME-only or NODATA) in pipelined batches, added as a `records` object per host (repeatable; requires --resolver/--resolver-file).",
+    )
     p_scan.add_argument(
         "--resume",
         action="store_true",
         help="Resume/append mode: skip labels already present in the existing --out file and append new results.",
     )
-    p_scan.add_argument("--concurrency", type=int, default=20)
+    p_scan.add_argument(
+        "--dedupe-memory",
+        type=int,
+        default=256,
+        help="Memory ceiling in MiB shared by the de-duplication indexes (candidates, --resume names, --harvest/--mutate/--recursive names, pruned NXDOMAIN names); beyond it, sorted fingerprint runs are spilled to temporary files (default: 256).",
+    )
+    p_scan.add_argument(
+        "--shard",
+        default=None,
+        help="Only scan this node's slice of the candidates, as i/N (1-based; e.g. 2/8). Candidates are assigned by a stable hash of the hostname, so every node can run the same command.",
+    )
+    p_scan.add_argument(
+        "--concurrency",
+        type=_concurrency_arg,
+        default=20,
+        help="Names resolved in parallel, or 'auto' to adapt the in-flight window to timeouts, SERVFAIL/REFUSED and latency (starting at 20).",
+    )
+    p_scan.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Cap total DNS queries per second (paced evenly, no bursts). Split across --workers processes; applies per worker with --listen.",
+    )
+    p_scan.add_argument(
+        "--rate-per-resolver",
+        type=float,
+        default=None,
+        help="Cap DNS queries per second sent to each resolver (paced evenly, no bursts).",
+    )
+    p_scan.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (each with its own --concurrency resolver threads and sockets). Use >1 when a single process is CPU-bound.",
+    )
+    p_scan.add_argument(
+        "--executor",
+        choices=["processes", "interpreters"],
+        default="processes",
+        help="Backend for --workers: processes, or sub-interpreters with their own GIL (Python 3.14+; falls back to threads on older interpreters).",
+    )
+    p_scan.add_argument(
+        "--listen",
+        default=None,
+        help="Coordinator mode: serve candidates to `subdomain-scout worker` processes on HOST:PORT instead of resolving locally. Output, dedupe, resume and summaries stay on this node.",
+    )
+    p_scan.add_argument(
+        "--chunk-size",
+        type=int,
+        default=256,
+        help="Candidates handed to a worker at a time (used with --listen)",
+    )
+    p_scan.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds before a chunk held by an unresponsive worker is handed out again (used with --listen)",
+    )
+    p_scan.add_argument(
+        "--token",
+        default=None,
+        help="Shared secret workers must present (used with --listen)",
+    )
     p_scan.add_argument(
         "--summary-json",
         action="store_true",
@@ -86,6 +235,43 @@ def main(argv: list[str] | None = None) -> int:
         default=0,
         help="Max CT subdomains to ingest (0 = unlimited)",
     )
+    p_scan.add_argument(
+        "--pattern",
+        action="append",
+        default=None,
+        help="Label template expanded lazily alongside the wordlist, e.g. '{word}-{env}', '{word}{0-99}', '{dev|stg}.{word}' (repeatable; {word} is each wordlist label, {lo-hi} a number range, {a|b} alternatives, {name} a --pattern-set).",
+    )
+    p_scan.add_argument(
+        "--pattern-set",
+        action="append",
+        default=None,
+        metavar="NAME=PATH",
+        help="Named value list for --pattern fields, one value per line (repeatable; e.g. env=./envs.txt for {env}).",
+    )
+    p_scan.add_argument(
+        "--model",
+        default=None,
+        help="Label model written by `model train` (used with --generate)",
+    )
+    p_scan.add_argument(
+        "--generate",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Scan the N most probable labels from --model first, best first (--wordlist becomes optional).",
+    )
+    p_scan.add_argument(
+        "--label-stats",
+        default=None,
+        help="Label statistics written by `model stats`; the wordlist's labels with the highest historical hit rate are scanned first, right after --ct labels (the wordlist is read twice, so not with --wordlist -).",
+    )
+    p_scan.add_argument(
+        "--label-stats-top",
+        type=int,
+        default=DEFAULT_PRIORITY_LABELS,
+        metavar="N",
+        help=f"How many of the best --label-stats labels to move to the front of the wordlist (default: {DEFAULT_PRIORITY_LABELS}).",
+    )
     p_scan.add_argument(
         "--status",
         action="append",
@@ -132,6 +318,17 @@ def main(argv: list[str] | None = None) -> int:
         default=50,
         help="Base backoff for retries (exponential)",
     )
+    p_scan.add_argument(
+        "--no-sweep",
+        action="store_true",
+        help="In custom resolver mode, fully resolve every candidate instead of first sweeping with a single A query and enriching only names that exist.",
+    )
+    p_scan.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Total time budget per name in seconds, across CNAME hops, A/AAAA queries, resolver fallbacks and retries. Names that run out are recorded as error_type=deadline_exceeded.",
+    )
     p_scan.add_argument(
         "--takeover-check",
         action="store_true",
@@ -150,6 +347,29 @@ def main(argv: list[str] | None = None) -> int:
     )
     p_scan.set_defaults(func=_run_scan)
 
+    p_worker = sub.add_parser("worker", help="Resolve candidates for a `scan --listen` coordinator")
+    p_worker.add_argument("--connect", required=True, help="Coordinator HOST:PORT")
+    p_worker.add_argument(
+        "--resolver",
+        action="append",
+        default=None,
+        help="Custom DNS resolver IP[:port] for this worker (repeatable; overrides the coordinator's resolvers).",
+    )
+    p_worker.add_argument(
+        "--resolver-file",
+        default=None,
+        help="Path to resolver list file for this worker (overrides the coordinator's resolvers).",
+    )
+    p_worker.add_argument("--concurrency", type=int, default=20)
+    p_worker.add_argument(
+        "--bind",
+        action="append",
+        default=None,
+        help="Local source IP address for this worker's DNS queries (repeatable; requires --resolver/--resolver-file).",
+    )
+    p_worker.add_argument("--token", default=None, help="Shared secret set on the coordinator")
+    p_worker.set_defaults(func=_run_worker)
+
     p_ct = sub.add_parser("ct", help="Fetch passive subdomains from certificate transparency logs")
     p_ct.add_argument("--domain", required=True)
     p_ct.add_argument(
@@ -166,6 +386,71 @@ def main(argv: list[str] | None = None) -> int:
     )
     p_ct.set_defaults(func=_run_ct)
 
+    p_wordlist = sub.add_parser("wordlist", help="Prepare wordlists for repeated scans")
+    wordlist_sub = p_wordlist.add_subparsers(dest="wordlist_cmd", required=True)
+    p_compile = wordlist_sub.add_parser(
+        "compile",
+        help="Compile a text wordlist into a normalized, deduplicated binary file for `scan --wordlist`",
+    )
+    p_compile.add_argument(
+        "--wordlist", required=True, help="Text wordlist path (use '-' for stdin)"
+    )
+    p_compile.add_argument("--out", required=True, help="Compiled wordlist output path")
+    p_compile.add_argument(
+        "--wire",
+        action="store_true",
+        help="Also store each label pre-encoded in DNS wire format",
+    )
+    p_compile.add_argument(
+        "--summary-json",
+        action="store_true",
+        help="Print compile summary as JSON to stderr",
+    )
+    p_compile.set_defaults(func=_run_wordlist_compile)
+
+    p_model = sub.add_parser("model", help="Learn label models from past results")
+    model_sub = p_model.add_subparsers(dest="model_cmd", required=True)
+    p_train = model_sub.add_parser(
+        "train",
+        help="Train a character n-gram label model from scan/ct outputs or host lists for `scan --generate`",
+    )
+    p_train.add_argument(
+        "--input",
+        action="append",
+        required=True,
+        help="JSONL/NDJSON output (resolved, cname and passive records) or host list; use '-' for stdin (repeatable)",
+    )
+    p_train.add_argument("--out", required=True, help="Model output path")
+    p_train.add_argument(
+        "--order",
+        type=int,
+        default=DEFAULT_ORDER,
+        help=f"Characters of context per prediction, plus one (default: {DEFAULT_ORDER})",
+    )
+    p_train.add_argument(
+        "--summary-json",
+        action="store_true",
+        help="Print training summary as JSON to stderr",
+    )
+    p_train.set_defaults(func=_run_model_train)
+    p_stats = model_sub.add_parser(
+        "stats",
+        help="Count per-label hit rates from scan/ct outputs or host lists for `scan --label-stats`",
+    )
+    p_stats.add_argument(
+        "--input",
+        action="append",
+        required=True,
+        help="JSONL/NDJSON output (resolved, cname and passive records are hits, not_found records misses) or host list; use '-' for stdin (repeatable)",
+    )
+    p_stats.add_argument("--out", required=True, help="Statistics output path")
+    p_stats.add_argument(
+        "--summary-json",
+        action="store_true",
+        help="Print summary as JSON to stderr",
+    )
+    p_stats.set_defaults(func=_run_model_stats)
+
     p_diff = sub.add_parser("diff", help="Diff two JSONL/NDJSON scan outputs")
     p_diff.add_argument("--old", required=True, help="Old JSONL path (use '-' for stdin)")
     p_diff.add_argument("--new", required=True, help="New JSONL path (use '-' for stdin)")
@@ -201,8 +486,79 @@ def main(argv: list[str] | None = None) -> int:
 
 
 def _run_scan(args: argparse.Namespace) -> int:
+    if args.hosts is not None:
+        if args.wordlist is not None:
+            print("error: --hosts and --wordlist cannot both be set", file=sys.stderr)
+            return 2
+        if args.ct:
+            print("error: --ct requires --domain/--domains-file", file=sys.stderr)
+            return 2
+        if args.pattern:
+            print("error: --pattern requires --domain/--domains-file", file=sys.stderr)
+            return 2
+        if args.generate:
+            print("error: --generate requires --domain/--domains-file", file=sys.stderr)
+            return 2
+    elif args.wordlist is None and not args.generate:
+        print(
+            "error: --wordlist is required with --domain/--domains-file (unless --generate is set)",
+            file=sys.stderr,
+        )
+        return 2
+    if args.generate < 0:
+        print("error: --generate must be >= 0", file=sys.stderr)
+        return 2
+    if args.label_stats is not None and args.hosts is not None:
+        print("error: --label-stats requires --domain/--domains-file", file=sys.stderr)
+        return 2
+    if args.label_stats is not None and args.wordlist == "-":
+        print("error: --label-stats needs a wordlist file, not stdin", file=sys.stderr)
+        return 2
+    if args.label_stats_top < 1:
+        print("error: --label-stats-top must be >= 1", file=sys.stderr)
+        return 2
+    priority_labels: list[str] = []
+    if args.label_stats is not None:
+        try:
+            priority_labels = load_hit_stats(Path(args.label_stats)).top_labels(
+                args.label_stats_top
+            )
+        except (ValueError, OSError) as e:
+            print(f"error: --label-stats: {e}", file=sys.stderr)
+            return 2
+    if bool(args.generate) != (args.model is not None):
+        print("error: --generate and --model must be used together", file=sys.stderr)
+        return 2
+    label_model = None
+    if args.model is not None:
+        try:
+            label_model = load_label_model(Path(args.model))
+        except (ValueError, OSError) as e:
+            print(f"error: --model: {e}", file=sys.stderr)
+            return 2
+    if args.pattern_set and not args.pattern:
+        print("error: --pattern-set requires --pattern", file=sys.stderr)
+        return 2
     try:
-        domain = normalize_domain(str(args.domain))
+        pattern_sets = dict(load_pattern_set(spec) for spec in args.pattern_set or ())
+        for template in args.pattern or ():
+            parse_pattern(template, pattern_sets)
+    except ValueError as e:
+        print(f"error: --pattern: {e}", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"error: --pattern-set: {e}", file=sys.stderr)
+        return 2
+    try:
+        shard = None if args.shard is None else parse_shard(str(args.shard))
+        domains: list[str] = []
+        if args.domains_file:
+            domains = load_domains_file(Path(str(args.domains_file)))
+        elif args.domain is not None:
+            domains = [normalize_domain(str(args.domain))]
+    except FileNotFoundError as e:
+        print(f"error: file not found: {e.filename}", file=sys.stderr)
+        return 2
     except ValueError as e:
         print(f"error: {e}", file=sys.stderr)
         return 2
@@ -215,6 +571,15 @@ def _run_scan(args: argparse.Namespace) -> int:
     if args.wildcard_verify_http and not args.detect_wildcard:
         print("error: --wildcard-verify-http requires --detect-wildcard", file=sys.stderr)
         return 2
+    if args.rate is not None and float(args.rate) <= 0:
+        print("error: --rate must be > 0", file=sys.stderr)
+        return 2
+    if args.rate_per_resolver is not None and float(args.rate_per_resolver) <= 0:
+        print("error: --rate-per-resolver must be > 0", file=sys.stderr)
+        return 2
+    if args.deadline is not None and float(args.deadline) <= 0:
+        print("error: --deadline must be > 0", file=sys.stderr)
+        return 2
     if int(args.wildcard_threshold) < 1:
         print("error: --wildcard-threshold must be >= 1", file=sys.stderr)
         return 2
@@ -222,28 +587,29 @@ def _run_scan(args: argparse.Namespace) -> int:
         print("error: --wildcard-http-timeout must be > 0", file=sys.stderr)
         return 2
 
-    ct_labels: list[str] = []
+    ct_labels: dict[str, list[str]] = {}
     takeover_checker = None
     if args.ct:
         limit = None if args.ct_limit == 0 else int(args.ct_limit)
-        try:
-            ct_subdomains, _ct_summary = fetch_ct_subdomains(
-                domain,
-                timeout=float(args.ct_timeout),
-                limit=limit,
-            )
-        except ValueError as e:
-            print(f"error: {e}", file=sys.stderr)
-            return 2
-        except OSError as e:
-            print(f"error: CT lookup failed: {e}", file=sys.stderr)
-            return 1
-        ct_labels = subdomains_to_labels(ct_subdomains, domain=domain)
+        for domain in domains:
+            try:
+                ct_subdomains, _ct_summary = fetch_ct_subdomains(
+                    domain,
+                    timeout=float(args.ct_timeout),
+                    limit=limit,
+                )
+            except ValueError as e:
+                print(f"error: {e}", file=sys.stderr)
+                return 2
+            except OSError as e:
+                print(f"error: CT lookup failed: {e}", file=sys.stderr)
+                return 1
+            ct_labels[domain] = subdomains_to_labels(ct_subdomains, domain=domain)
 
+    fingerprints_path = (
+        None if args.takeover_fingerprints is None else Path(str(args.takeover_fingerprints))
+    )
     if args.takeover_check:
-        fingerprints_path = (
-            None if args.takeover_fingerprints is None else Path(str(args.takeover_fingerprints))
-        )
         try:
             takeover_checker = build_takeover_checker(
                 timeout=float(args.takeover_timeout),
@@ -256,120 +622,250 @@ def _run_scan(args: argparse.Namespace) -> int:
             print(f"error: {e}", file=sys.stderr)
             return 2
 
-    nameservers = None
-    if args.resolver_file or args.resolver:
-        try:
-            resolvers: list[tuple[str, int]] = []
-            if args.resolver_file:
-                resolvers.extend(load_nameservers_file(Path(str(args.resolver_file))))
-            if args.resolver:
-                resolvers.extend(parse_nameserver(s) for s in args.resolver)
-            # Dedup while preserving order.
-            seen: set[tuple[str, int]] = set()
-            nameservers = []
-            for item in resolvers:
-                if item in seen:
-                    continue
-                seen.add(item)
-                nameservers.append(item)
-        except ValueError as e:
-            print(f"error: {e}", file=sys.stderr)
-            return 2
+    try:
+        nameservers = _load_resolvers(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
     if args.include_cname and nameservers is None:
         print(
             "error: --include-cname requires --resolver/--resolver-file (custom resolver mode)",
             file=sys.stderr,
         )
         return 2
+    record_types = [
+        spec.strip()
+        for value in args.record_types or ()
+        for spec in value.split(",")
+        if spec.strip()
+    ]
+    try:
+        for spec in record_types:
+            parse_record_type(spec)
+    except ValueError as e:
+        print(f"error: --record-types: {e}", file=sys.stderr)
+        return 2
+    if record_types and nameservers is None:
+        print(
+            "error: --record-types requires --resolver/--resolver-file (custom resolver mode)",
+            file=sys.stderr,
+        )
+        return 2
+    if args.harvest and nameservers is None:
+        print(
+            "error: --harvest requires --resolver/--resolver-file (custom resolver mode)",
+            file=sys.stderr,
+        )
+        return 2
+    if args.bind and nameservers is None:
+        print(
+            "error: --bind requires --resolver/--resolver-file (custom resolver mode)",
+            file=sys.stderr,
+        )
+        return 2
+    if args.bind and args.listen is not None:
+        print("error: --bind applies where queries are sent; pass it to `worker`", file=sys.stderr)
+        return 2
+    if args.dedupe_memory < 1:
+        print("error: --dedupe-memory must be >= 1 (MiB)", file=sys.stderr)
+        return 2
+    if args.mutate_budget < 0:
+        print("error: --mutate-budget must be >= 0", file=sys.stderr)
+        return 2
+    if args.recursive < 0:
+        print("error: --recursive must be >= 0", file=sys.stderr)
+        return 2
+    if args.recursive and not args.detect_wildcard:
+        print("error: --recursive requires --detect-wildcard", file=sys.stderr)
+        return 2
+    if bool(args.recursive) != (args.recursive_wordlist is not None):
+        print("error: --recursive and --recursive-wordlist must be used together", file=sys.stderr)
+        return 2
+    if args.query_budget is not None and args.query_budget < 1:
+        print("error: --query-budget must be >= 1", file=sys.stderr)
+        return 2
+    if args.query_budget is not None and (int(args.workers) != 1 or args.listen is not None):
+        # Worker query counts only arrive with whole chunk results, too late to stop at N.
+        print("error: --query-budget cannot be used with --workers or --listen", file=sys.stderr)
+        return 2
 
     out_path = None if args.out == "-" else Path(args.out)
-    try:
-        progress_stream = sys.stderr if args.progress else None
-        progress_every_s = float(args.progress_every)
-        if args.wordlist == "-":
-            summary = scan_domains_summary_lines(
-                domain=domain,
-                wordlist_lines=sys.stdin,
-                out_path=out_path,
-                timeout=args.timeout,
-                concurrency=args.concurrency,
-                statuses=set(args.status) if args.status else None,
-                detect_wildcard=bool(args.detect_wildcard),
-                wildcard_probes=args.wildcard_probes,
-                wildcard_threshold=args.wildcard_threshold,
-                wildcard_verify_http=bool(args.wildcard_verify_http),
-                wildcard_http_timeout=float(args.wildcard_http_timeout),
-                include_cname=bool(args.include_cname),
-                progress_stream=progress_stream,
-                progress_every_s=progress_every_s,
-                only_resolved=bool(args.only_resolved),
-                retries=args.retries,
-                retry_backoff_ms=args.retry_backoff_ms,
-                extra_labels=ct_labels,
-                ct_labels_count=len(ct_labels),
-                takeover_checker=takeover_checker,
-                nameservers=nameservers,
-                resume=bool(args.resume),
+    scan_options: dict[str, Any] = {
+        "out_path": out_path,
+        "timeout": args.timeout,
+        "concurrency": 20 if args.concurrency == "auto" else args.concurrency,
+        "adaptive_concurrency": args.concurrency == "auto",
+        "deadline": args.deadline,
+        "worker_executor": args.executor,
+        "sweep": not args.no_sweep,
+        "record_types": record_types or None,
+        "harvest": bool(args.harvest),
+        "bind": args.bind,
+        "dedupe_memory": args.dedupe_memory * 1024 * 1024,
+        "mutate": bool(args.mutate),
+        "mutate_budget": args.mutate_budget,
+        "recursive": args.recursive,
+        "recursive_wordlist": None
+        if args.recursive_wordlist is None
+        else Path(args.recursive_wordlist),
+        "query_budget": args.query_budget,
+        "statuses": set(args.status) if args.status else None,
+        "detect_wildcard": bool(args.detect_wildcard),
+        "wildcard_probes": args.wildcard_probes,
+        "wildcard_threshold": args.wildcard_threshold,
+        "wildcard_verify_http": bool(args.wildcard_verify_http),
+        "wildcard_http_timeout": float(args.wildcard_http_timeout),
+        "include_cname": bool(args.include_cname),
+        "progress_stream": sys.stderr if args.progress else None,
+        "progress_every_s": float(args.progress_every),
+        "only_resolved": bool(args.only_resolved),
+        "retries": args.retries,
+        "retry_backoff_ms": args.retry_backoff_ms,
+        "takeover_checker": takeover_checker,
+        "nameservers": nameservers,
+        "resume": bool(args.resume),
+        "workers": args.workers,
+        "shard": shard,
+        "rate": args.rate,
+        "rate_per_resolver": args.rate_per_resolver,
+    }
+    coordinator: Coordinator | None = None
+    if args.listen is not None:
+        if int(args.workers) != 1:
+            print("error: --listen and --workers cannot both be set", file=sys.stderr)
+            return 2
+        try:
+            host, port = parse_host_port(str(args.listen))
+            takeover = None
+            if args.takeover_check:
+                # Workers rebuild the checker from the catalog itself; it is shipped with the config.
+                takeover = (
+                    float(args.takeover_timeout),
+                    load_fingerprint_catalog(fingerprints_path),
+                )
+            coordinator = Coordinator(
+                host=host,
+                port=port,
+                chunk_size=int(args.chunk_size),
+                lease_timeout=float(args.lease_timeout),
+                token=args.token,
+                takeover=takeover,
             )
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        except OSError as e:
+            print(f"error: cannot listen on {args.listen}: {e}", file=sys.stderr)
+            return 2
+        listen_host, listen_port = coordinator.address
+        print(f"coordinator listening={listen_host}:{listen_port}", file=sys.stderr, flush=True)
+        scan_options["chunk_dispatcher"] = coordinator.dispatch
+    try:
+        if args.hosts is not None:
+            if args.hosts == "-":
+                summary = scan_hosts_summary_lines(hosts_lines=sys.stdin, **scan_options)
+            else:
+                with open_text(Path(args.hosts)) as hosts_fh:
+                    summary = scan_hosts_summary_lines(hosts_lines=hosts_fh, **scan_options)
         else:
-            summary = scan_domains_summary(
-                domain=domain,
-                wordlist=Path(args.wordlist),
-                out_path=out_path,
-                timeout=args.timeout,
-                concurrency=args.concurrency,
-                statuses=set(args.status) if args.status else None,
-                detect_wildcard=bool(args.detect_wildcard),
-                wildcard_probes=args.wildcard_probes,
-                wildcard_threshold=args.wildcard_threshold,
-                wildcard_verify_http=bool(args.wildcard_verify_http),
-                wildcard_http_timeout=float(args.wildcard_http_timeout),
-                include_cname=bool(args.include_cname),
-                progress_stream=progress_stream,
-                progress_every_s=progress_every_s,
-                only_resolved=bool(args.only_resolved),
-                retries=args.retries,
-                retry_backoff_ms=args.retry_backoff_ms,
-                extra_labels=ct_labels,
-                ct_labels_count=len(ct_labels),
-                takeover_checker=takeover_checker,
-                nameservers=nameservers,
-                resume=bool(args.resume),
-            )
+            scan_options["extra_labels"] = ct_labels
+            scan_options["ct_labels_count"] = sum(len(labels) for labels in ct_labels.values())
+            scan_options["patterns"] = args.pattern
+            scan_options["pattern_sets"] = pattern_sets
+            scan_options["label_model"] = label_model
+            scan_options["generate"] = args.generate
+            scan_options["priority_labels"] = priority_labels
+            if args.domains_file:
+                scan_options["domains"] = domains
+            else:
+                scan_options["domain"] = domains[0]
+            if args.wordlist is None:
+                summary = scan_domains_summary_lines(wordlist_lines=(), **scan_options)
+            elif args.wordlist == "-":
+                summary = scan_domains_summary_lines(wordlist_lines=sys.stdin, **scan_options)
+            else:
+                summary = scan_domains_summary(wordlist=Path(args.wordlist), **scan_options)
     except FileNotFoundError as e:
         print(f"error: file not found: {e.filename}", file=sys.stderr)
         return 2
     except ValueError as e:
         print(f"error: {e}", file=sys.stderr)
         return 2
+    finally:
+        if coordinator is not None:
+            coordinator.close()
     dest = "stdout" if out_path is None else str(out_path)
     if args.summary_json:
-        sys.stderr.write(
-            json.dumps(
-                {
-                    "kind": "scan_summary",
-                    "schema_version": _SCHEMA_VERSION,
-                    "attempted": summary.attempted,
-                    "resolved": summary.resolved,
-                    "wildcard": summary.wildcard,
-                    "cname": summary.cname,
-                    "not_found": summary.not_found,
-                    "error": summary.error,
-                    "wrote": summary.written,
-                    "labels_total": summary.labels_total,
-                    "labels_unique": summary.labels_unique,
-                    "labels_deduped": summary.labels_deduped,
-                    "labels_skipped_existing": summary.labels_skipped_existing,
-                    "ct_labels": summary.ct_labels,
-                    "takeover_checked": summary.takeover_checked,
-                    "takeover_suspected": summary.takeover_suspected,
-                    "elapsed_ms": summary.elapsed_ms,
-                    "out": dest,
-                }
-            )
-            + "\n"
-        )
+        payload: dict[str, Any] = {
+            "kind": "scan_summary",
+            "schema_version": _SCHEMA_VERSION,
+            "attempted": summary.attempted,
+            "resolved": summary.resolved,
+            "wildcard": summary.wildcard,
+            "cname": summary.cname,
+            "not_found": summary.not_found,
+            "error": summary.error,
+            "wrote": summary.written,
+            "labels_total": summary.labels_total,
+            "labels_unique": summary.labels_unique,
+            "labels_deduped": summary.labels_deduped,
+            "labels_skipped_existing": summary.labels_skipped_existing,
+            "ct_labels": summary.ct_labels,
+            "takeover_checked": summary.takeover_checked,
+            "takeover_suspected": summary.takeover_suspected,
+            "elapsed_ms": summary.elapsed_ms,
+            "out": dest,
+        }
+        payload["executor"] = summary.executor
+        payload["queries"] = summary.queries
+        payload["qps"] = _per_second(summary.queries, summary.elapsed_ms)
+        payload["queries_delayed"] = summary.queries_delayed
+        payload["rate_limit"] = summary.rate_limit
+        payload["rate_limit_per_resolver"] = summary.rate_limit_per_resolver
+        payload["resolvers"] = [
+            {
+                "resolver": resolver,
+                "queries": count,
+                "qps": _per_second(count, summary.elapsed_ms),
+            }
+            for resolver, count in summary.resolver_queries
+        ]
+        if summary.concurrency_auto:
+            payload["concurrency_window"] = summary.concurrency_window
+            payload["concurrency_history"] = [list(item) for item in summary.concurrency_history]
+        if summary.shard is not None:
+            payload["shard"] = summary.shard
+            payload["labels_other_shard"] = summary.labels_other_shard
+        if summary.harvest:
+            payload["labels_harvested"] = summary.labels_harvested
+        if summary.mutate:
+            payload["labels_mutated"] = summary.labels_mutated
+        if summary.recursive:
+            payload["zones_recursive"] = summary.zones_recursive
+            payload["labels_recursive"] = summary.labels_recursive
+            payload["labels_pruned"] = summary.labels_pruned
+        if summary.query_budget is not None:
+            payload["query_budget"] = summary.query_budget
+            payload["query_budget_exhausted"] = summary.query_budget_exhausted
+        if args.generate:
+            payload["labels_generated"] = summary.labels_generated
+        if args.label_stats is not None:
+            payload["labels_prioritized"] = summary.labels_prioritized
+        if args.pattern:
+            payload["labels_planned"] = summary.labels_planned
+            payload["labels_invalid"] = summary.labels_invalid
+        if summary.source_queries:
+            payload["sources"] = [
+                {"address": address, "queries": queries, "errors": errors}
+                for address, queries, errors in summary.source_queries
+            ]
+        if summary.domains:
+            payload["domains"] = [_domain_summary_dict(d) for d in summary.domains]
+        sys.stderr.write(json.dumps(payload) + "\n")
     else:
+        _print_domain_summaries(summary)
+        for address, queries, errors in summary.source_queries:
+            print(f"source address={address} queries={queries} errors={errors}", file=sys.stderr)
         print(
             "scanned"
             f" attempted={summary.attempted}"
@@ -384,15 +880,156 @@ def _run_scan(args: argparse.Namespace) -> int:
             f" labels_deduped={summary.labels_deduped}"
             f" labels_skipped_existing={summary.labels_skipped_existing}"
             f" ct_labels={summary.ct_labels}"
-            f" takeover_checked={summary.takeover_checked}"
+            + (f" labels_harvested={summary.labels_harvested}" if summary.harvest else "")
+            + (f" labels_mutated={summary.labels_mutated}" if summary.mutate else "")
+            + (
+                f" zones_recursive={summary.zones_recursive}"
+                f" labels_recursive={summary.labels_recursive}"
+                f" labels_pruned={summary.labels_pruned}"
+                if summary.recursive
+                else ""
+            )
+            + (
+                f" query_budget_exhausted={str(summary.query_budget_exhausted).lower()}"
+                if summary.query_budget is not None
+                else ""
+            )
+            + (f" labels_generated={summary.labels_generated}" if args.generate else "")
+            + (
+                f" labels_prioritized={summary.labels_prioritized}"
+                if args.label_stats is not None
+                else ""
+            )
+            + (
+                f" labels_planned={summary.labels_planned} labels_invalid={summary.labels_invalid}"
+                if args.pattern
+                else ""
+            )
+            + f" takeover_checked={summary.takeover_checked}"
             f" takeover_suspected={summary.takeover_suspected}"
-            f" elapsed_ms={summary.elapsed_ms}"
+            + (
+                f" shard={summary.shard} labels_other_shard={summary.labels_other_shard}"
+                if summary.shard is not None
+                else ""
+            )
+            + (
+                f" concurrency_window={summary.concurrency_window}"
+                if summary.concurrency_auto
+                else ""
+            )
+            + ("" if summary.executor == "threads" else f" executor={summary.executor}")
+            + f" queries={summary.queries}"
+            f" qps={_per_second(summary.queries, summary.elapsed_ms):.2f}"
+            + (
+                f" queries_delayed={summary.queries_delayed}"
+                if summary.rate_limit is not None or summary.rate_limit_per_resolver is not None
+                else ""
+            )
+            + f" elapsed_ms={summary.elapsed_ms}"
             f" out={dest}",
             file=sys.stderr,
         )
     return 1 if summary.error else 0
 
 
+def _concurrency_arg(raw: str) -> int | str:
+    if raw == "auto":
+        return raw
+    try:
+        return int(raw)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError("expected an integer or 'auto'") from e
+
+
+def _per_second(count: int, elapsed_ms: int) -> float:
+    return round(count / max(0.001, elapsed_ms / 1000.0), 2)
+
+
+def _load_resolvers(args: argparse.Namespace) -> list[tuple[str, int]] | None:
+    if not (args.resolver_file or args.resolver):
+        return None
+    resolvers: list[tuple[str, int]] = []
+    if args.resolver_file:
+        resolvers.extend(load_nameservers_file(Path(str(args.resolver_file))))
+    if args.resolver:
+        resolvers.extend(parse_nameserver(s) for s in args.resolver)
+    # Dedup while preserving order.
+    seen: set[tuple[str, int]] = set()
+    nameservers: list[tuple[str, int]] = []
+    for item in resolvers:
+        if item in seen:
+            continue
+        seen.add(item)
+        nameservers.append(item)
+    return nameservers
+
+
+def _run_worker(args: argparse.Namespace) -> int:
+    try:
+        host, port = parse_host_port(str(args.connect))
+        nameservers = _load_resolvers(args)
+    except FileNotFoundError as e:
+        print(f"error: file not found: {e.filename}", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    try:
+        summary = run_worker(
+            host,
+            port,
+            concurrency=int(args.concurrency),
+            nameservers=nameservers,
+            token=args.token,
+            bind=args.bind,
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"error: coordinator connection failed: {e}", file=sys.stderr)
+        return 1
+    print(
+        "worker"
+        f" chunks={summary.chunks}"
+        f" attempted={summary.attempted}"
+        f" elapsed_ms={summary.elapsed_ms}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _domain_summary_dict(item: DomainSummary) -> dict[str, Any]:
+    return {
+        "domain": item.domain,
+        "attempted": item.attempted,
+        "resolved": item.resolved,
+        "wildcard": item.wildcard,
+        "cname": item.cname,
+        "not_found": item.not_found,
+        "error": item.error,
+        "wrote": item.written,
+        "labels_skipped_existing": item.labels_skipped_existing,
+    }
+
+
+def _print_domain_summaries(summary: ScanSummary) -> None:
+    for item in summary.domains:
+        print(
+            "scanned"
+            f" domain={item.domain}"
+            f" attempted={item.attempted}"
+            f" resolved={item.resolved}"
+            f" wildcard={item.wildcard}"
+            f" cname={item.cname}"
+            f" not_found={item.not_found}"
+            f" error={item.error}"
+            f" wrote={item.written}"
+            f" labels_skipped_existing={item.labels_skipped_existing}",
+            file=sys.stderr,
+        )
+
+
 def _run_ct(args: argparse.Namespace) -> int:
     try:
         domain = normalize_domain(str(args.domain))
@@ -455,6 +1092,182 @@ def _run_ct(args: argparse.Namespace) -> int:
     return 0
 
 
+def _run_wordlist_compile(args: argparse.Namespace) -> int:
+    started = time.monotonic()
+    try:
+        source = sys.stdin if args.wordlist == "-" else Path(args.wordlist)
+        compiled = compile_wordlist(source, Path(args.out), wire=bool(args.wire))
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+
+    if args.summary_json:
+        sys.stderr.write(
+            json.dumps(
+                {
+                    "kind": "wordlist_summary",
+                    "schema_version": _SCHEMA_VERSION,
+                    "labels_total": compiled.labels_total,
+                    "labels_unique": compiled.labels,
+                    "labels_deduped": compiled.labels_deduped,
+                    "wire": compiled.wire,
+                    "bytes": compiled.size_bytes,
+                    "sha256": compiled.sha256,
+                    "elapsed_ms": elapsed_ms,
+                    "out": str(args.out),
+                }
+            )
+            + "\n"
+        )
+    else:
+        print(
+            "compiled"
+            f" labels_total={compiled.labels_total}"
+            f" labels_unique={compiled.labels}"
+            f" labels_deduped={compiled.labels_deduped}"
+            f" bytes={compiled.size_bytes}"
+            f" sha256={compiled.sha256}"
+            f" elapsed_ms={elapsed_ms}"
+            f" out={args.out}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def _run_model_train(args: argparse.Namespace) -> int:
+    started = time.monotonic()
+    if args.input.count("-") > 1:
+        print("error: only one --input may be '-'", file=sys.stderr)
+        return 2
+    skipped = 0
+
+    def count_skipped(count: int) -> None:
+        nonlocal skipped
+        skipped += count
+
+    def observed_hosts(stack: contextlib.ExitStack) -> Iterator[str]:
+        for fh in _model_inputs(args.input, stack):
+            yield from read_observed_hosts(fh, on_skipped=count_skipped)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            model = train_label_model(observed_hosts(stack), order=int(args.order))
+        size = save_label_model(model, Path(args.out))
+    except FileNotFoundError as e:
+        print(f"error: file not found: {e.filename}", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+
+    if args.summary_json:
+        sys.stderr.write(
+            json.dumps(
+                {
+                    "kind": "model_summary",
+                    "schema_version": _SCHEMA_VERSION,
+                    "hosts": model.hosts,
+                    "skipped": skipped,
+                    "order": model.order,
+                    "contexts": len(model.contexts),
+                    "bytes": size,
+                    "elapsed_ms": elapsed_ms,
+                    "out": str(args.out),
+                }
+            )
+            + "\n"
+        )
+    else:
+        print(
+            "trained"
+            f" hosts={model.hosts}"
+            f" skipped={skipped}"
+            f" order={model.order}"
+            f" contexts={len(model.contexts)}"
+            f" bytes={size}"
+            f" elapsed_ms={elapsed_ms}"
+            f" out={args.out}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def _run_model_stats(args: argparse.Namespace) -> int:
+    started = time.monotonic()
+    if args.input.count("-") > 1:
+        print("error: only one --input may be '-'", file=sys.stderr)
+        return 2
+    skipped = 0
+
+    def count_skipped(count: int) -> None:
+        nonlocal skipped
+        skipped += count
+
+    def outcomes(stack: contextlib.ExitStack) -> Iterator[tuple[str, bool]]:
+        for fh in _model_inputs(args.input, stack):
+            yield from read_host_outcomes(fh, on_skipped=count_skipped)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            stats = build_hit_stats(outcomes(stack))
+        size = save_hit_stats(stats, Path(args.out))
+    except FileNotFoundError as e:
+        print(f"error: file not found: {e.filename}", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+    hits = sum(1 for found, _tried in stats.labels.values() if found)
+
+    if args.summary_json:
+        sys.stderr.write(
+            json.dumps(
+                {
+                    "kind": "label_stats_summary",
+                    "schema_version": _SCHEMA_VERSION,
+                    "hosts": stats.hosts,
+                    "skipped": skipped,
+                    "labels": len(stats.labels),
+                    "labels_hit": hits,
+                    "bytes": size,
+                    "elapsed_ms": elapsed_ms,
+                    "out": str(args.out),
+                }
+            )
+            + "\n"
+        )
+    else:
+        print(
+            "stats"
+            f" hosts={stats.hosts}"
+            f" skipped={skipped}"
+            f" labels={len(stats.labels)}"
+            f" labels_hit={hits}"
+            f" bytes={size}"
+            f" elapsed_ms={elapsed_ms}"
+            f" out={args.out}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def _model_inputs(sources: list[str], stack: contextlib.ExitStack) -> Iterator[IO[str]]:
+    for source in sources:
+        yield sys.stdin if source == "-" else stack.enter_context(open_text(Path(source)))
+
+
 def _run_diff(args: argparse.Namespace) -> int:
     use_old_stdin = args.old == "-"
     use_new_stdin = args.new == "-"
@@ -467,14 +1280,10 @@ def _run_diff(args: argparse.Namespace) -> int:
     try:
         with contextlib.ExitStack() as stack:
             old_stream = (
-                sys.stdin
-                if use_old_stdin
-                else stack.enter_context(Path(args.old).open("r", encoding="utf-8"))
+                sys.stdin if use_old_stdin else stack.enter_context(open_text(Path(args.old)))
             )
             new_stream = (
-                sys.stdin
-                if use_new_stdin
-                else stack.enter_context(Path(args.new).open("r", encoding="utf-8"))
+                sys.stdin if use_new_stdin else stack.enter_context(open_text(Path(args.new)))
             )
 
             old = load_jsonl(
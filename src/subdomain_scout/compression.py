@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+from pathlib import Path
+from typing import IO, Callable
+
+# Decompressed bytes buffered ahead of the line reader; the codecs themselves pull compressed
+# input in small fixed blocks, so memory stays flat however large the archive is.
+_READ_AHEAD = 1024 * 1024
+
+_MAGIC: tuple[tuple[bytes, str], ...] = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"BZh", "bz2"),
+)
+_OPENERS: dict[str, Callable[[Path], io.BufferedIOBase]] = {
+    "gzip": lambda path: gzip.GzipFile(path, "rb"),
+    "xz": lambda path: lzma.LZMAFile(path, "rb"),
+    "bz2": lambda path: bz2.BZ2File(path, "rb"),
+}
+
+
+def detect_compression(path: Path) -> str | None:
+    """Return "gzip", "xz" or "bz2" if the file starts with that codec's magic bytes, else None."""
+    with path.open("rb") as fh:
+        head = fh.read(6)
+    for magic, codec in _MAGIC:
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def open_text(path: Path) -> IO[str]:
+    """
+    Open a UTF-8 text input, transparently decompressing gzip, xz and bz2 files.
+
+    Compression is detected from the file's magic bytes, not its name. Corrupt or truncated
+    compressed data raises ValueError (naming the file) from whichever read hits it.
+    """
+    codec = detect_compression(path)
+    if codec is None:
+        return path.open("r", encoding="utf-8")
+    raw = _DecompressedReader(_OPENERS[codec](path), source=f"{path} ({codec})")
+    return io.TextIOWrapper(io.BufferedReader(raw, buffer_size=_READ_AHEAD), encoding="utf-8")
+
+
+class _DecompressedReader(io.RawIOBase):
+    def __init__(self, inner: io.BufferedIOBase, *, source: str) -> None:
+        self._inner = inner
+        self._source = source
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:  # type: ignore[override]
+        try:
+            data = self._inner.read(len(buffer))
+        except (EOFError, lzma.LZMAError, zlib.error) as e:
+            raise ValueError(f"corrupt compressed input {self._source}: {e}") from e
+        except OSError as e:
+            # Codec errors (bad headers, CRC mismatches) carry no errno; real I/O errors do.
+            if e.errno is not None:
+                raise
+            raise ValueError(f"corrupt compressed input {self._source}: {e}") from e
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._inner.close()
+        super().close()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import itertools
 import json
 import time
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
-from .validation import normalize_label
+from .validation import normalize_domains, normalize_labels
+
+_NORMALIZE_BATCH = 1024
 
 
 @dataclass(frozen=True)
@@ -48,35 +51,44 @@ def fetch_ct_subdomains(
 
 
 def subdomains_to_labels(subdomains: Iterable[str], *, domain: str) -> list[str]:
-    labels: list[str] = []
-    seen: set[str] = set()
     suffix = f".{domain}"
+    candidates: list[str] = []
     for name in subdomains:
         item = str(name).strip().strip(".").lower()
         if item == domain or not item.endswith(suffix):
             continue
         label = item[: -len(suffix)]
-        if not label:
-            continue
-        try:
-            normalized = normalize_label(label)
-        except ValueError:
-            continue
-        if normalized in seen:
-            continue
-        seen.add(normalized)
-        labels.append(normalized)
-    return labels
+        if label:
+            candidates.append(label)
+    return list(dict.fromkeys(normalize_labels(candidates, skip_invalid=True)))
 
 
 def _extract_subdomains(
     payload: list[Any], *, domain: str, limit: int | None
 ) -> tuple[list[str], int]:
-    subdomains: list[str] = []
-    seen: set[str] = set()
+    subdomains: dict[str, None] = {}
     names_seen = 0
     suffix = f".{domain}"
+    names = enumerate(_iter_names(payload), start=1)
+    # Validate in batches and stop at the batch that reaches `limit`, so a large crt.sh
+    # response is not normalized past the names actually used.
+    while batch := list(itertools.islice(names, _NORMALIZE_BATCH)):
+        names_seen = batch[-1][0]
+        # In-scope names, each with the count of names seen up to and including it.
+        scoped = [(seen, name[2:] if name.startswith("*.") else name) for seen, name in batch]
+        scoped = [(seen, name) for seen, name in scoped if name.endswith(suffix)]
+        valid = set(normalize_domains([name for _seen, name in scoped], skip_invalid=True))
+        for seen, name in scoped:
+            if name not in valid or name in subdomains:
+                continue
+            subdomains[name] = None
+            if limit is not None and len(subdomains) >= limit:
+                # Report the names seen by the time the limit was reached.
+                return list(subdomains), seen
+    return list(subdomains), names_seen
+
 
+def _iter_names(payload: list[Any]) -> Iterator[str]:
     for row in payload:
         if not isinstance(row, dict):
             continue
@@ -85,23 +97,5 @@ def _extract_subdomains(
             continue
         for raw_name in name_value.splitlines():
             name = raw_name.strip().strip(".").lower()
-            if not name:
-                continue
-            names_seen += 1
-            if name.startswith("*."):
-                name = name[2:]
-            if name == domain:
-                continue
-            if not name.endswith(suffix):
-                continue
-            try:
-                normalize_label(name[: -len(suffix)])
-            except ValueError:
-                continue
-            if name in seen:
-                continue
-            seen.add(name)
-            subdomains.append(name)
-            if limit is not None and len(subdomains) >= limit:
-                return subdomains, names_seen
-    return subdomains, names_seen
+            if name:
+                yield name
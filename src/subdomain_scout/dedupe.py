@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import array
+import bisect
+import heapq
+import mmap
+import tempfile
+from typing import IO, Iterable, Iterator
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+_INITIAL_SLOTS = 1 << 12
+# The smallest ceiling a set accepts: its initial table.
+MIN_MEMORY_LIMIT = _INITIAL_SLOTS * 8
+# Linear probing stays short below ~70% occupancy; past it the table doubles (or spills).
+_MAX_LOAD = 0.7
+# Spilled runs are merged into one once there are more than this many, bounding lookups.
+_MAX_SPILLED_RUNS = 8
+_MERGE_BLOCK = 1 << 20
+
+
+class FingerprintSet:
+    """
+    Memory-bounded set of strings, stored as 64-bit fingerprints instead of string objects.
+
+    Fingerprints live in an open-addressing table of machine integers (8 bytes a slot, 12-24
+    bytes per member depending on load) rather than a `set[str]` (around 100 bytes per member
+    with the string kept alive). When doubling the table would pass `memory_limit` bytes, its contents are
+    sorted and spilled to an anonymous temporary file as a run that later lookups binary-search
+    through a memory map; runs are merged once there are more than a handful.
+
+    Fingerprints are Python's per-process string hash, so they are only meaningful inside the
+    process that built the set. Two different strings share a fingerprint with probability
+    about n^2 / 2^65 per set of n members (under 1 in 3,000 even at 100M), in which case the
+    later one is treated as already present.
+    """
+
+    def __init__(self, *, memory_limit: int = DEFAULT_MEMORY_LIMIT) -> None:
+        if memory_limit < MIN_MEMORY_LIMIT:
+            raise ValueError(f"memory limit must be >= {MIN_MEMORY_LIMIT} bytes")
+        self._memory_limit = memory_limit
+        self._table = array.array("q", bytes(_INITIAL_SLOTS * 8))
+        self._mask = _INITIAL_SLOTS - 1
+        self._used = 0
+        self._len = 0
+        self._runs: list[_SpilledRun] = []
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        fingerprint = _fingerprint(key)
+        return self._probe(fingerprint) < 0 or self._in_runs(fingerprint)
+
+    def add(self, key: str) -> bool:
+        """Add `key`; return True if it was not present before."""
+        fingerprint = _fingerprint(key)
+        slot = self._probe(fingerprint)
+        if slot < 0 or self._in_runs(fingerprint):
+            return False
+        self._table[slot] = fingerprint
+        self._used += 1
+        self._len += 1
+        if self._used > len(self._table) * _MAX_LOAD:
+            if len(self._table) * 16 <= self._memory_limit:
+                self._resize(len(self._table) * 2)
+            else:
+                self._spill()
+        return True
+
+    @property
+    def spilled_runs(self) -> int:
+        return len(self._runs)
+
+    def close(self) -> None:
+        """Release spilled runs; the set is empty afterwards."""
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._table = array.array("q", bytes(_INITIAL_SLOTS * 8))
+        self._mask = _INITIAL_SLOTS - 1
+        self._used = 0
+        self._len = 0
+
+    def _probe(self, fingerprint: int) -> int:
+        # Slot to store `fingerprint` in, or -1 if the table already holds it.
+        table = self._table
+        mask = self._mask
+        slot = fingerprint & mask
+        while True:
+            current = table[slot]
+            if current == fingerprint:
+                return -1
+            if current == 0:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _in_runs(self, fingerprint: int) -> bool:
+        return any(fingerprint in run for run in self._runs)
+
+    def _resize(self, slots: int) -> None:
+        old = self._table
+        self._table = array.array("q", bytes(slots * 8))
+        self._mask = slots - 1
+        self._used = 0
+        for fingerprint in old:
+            if fingerprint:
+                self._table[self._probe(fingerprint)] = fingerprint
+                self._used += 1
+
+    def _spill(self) -> None:
+        # Sort a block at a time so the boxed ints sorted() needs stay small next to the table,
+        # then merge the sorted blocks into one run on disk.
+        blocks: list[_SpilledRun] = []
+        for start in range(0, len(self._table), _MERGE_BLOCK):
+            block = self._table[start : start + _MERGE_BLOCK]
+            blocks.append(_SpilledRun.write(array.array("q", sorted(fp for fp in block if fp))))
+        self._runs.append(_merge_runs(blocks))
+        self._table = array.array("q", bytes(len(self._table) * 8))
+        self._used = 0
+        if len(self._runs) > _MAX_SPILLED_RUNS:
+            self._runs = [_merge_runs(self._runs)]
+
+
+class _SpilledRun:
+    """A sorted run of fingerprints in an anonymous temporary file, searched through mmap."""
+
+    def __init__(self, fh: IO[bytes]) -> None:
+        self._fh = fh
+        self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap).cast("q")
+
+    @classmethod
+    def write(cls, members: array.array[int]) -> _SpilledRun:
+        fh = tempfile.TemporaryFile(prefix="subdomain-scout-dedupe-")
+        members.tofile(fh)
+        fh.flush()
+        return cls(fh)
+
+    @classmethod
+    def write_iter(cls, members: Iterable[int]) -> _SpilledRun:
+        fh = tempfile.TemporaryFile(prefix="subdomain-scout-dedupe-")
+        block = array.array("q")
+        for fingerprint in members:
+            block.append(fingerprint)
+            if len(block) >= _MERGE_BLOCK:
+                block.tofile(fh)
+                block = array.array("q")
+        block.tofile(fh)
+        fh.flush()
+        return cls(fh)
+
+    def __contains__(self, fingerprint: object) -> bool:
+        view = self._view
+        pos = bisect.bisect_left(view, fingerprint)  # type: ignore[call-overload]
+        return pos < len(view) and bool(view[pos] == fingerprint)
+
+    def __iter__(self) -> Iterator[int]:
+        view = self._view
+        for start in range(0, len(view), _MERGE_BLOCK):
+            yield from view[start : start + _MERGE_BLOCK].tolist()
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+        self._fh.close()
+
+
+def _merge_runs(runs: list[_SpilledRun]) -> _SpilledRun:
+    if len(runs) == 1:
+        return runs[0]
+    merged = _SpilledRun.write_iter(heapq.merge(*runs))
+    for run in runs:
+        run.close()
+    return merged
+
+
+def _fingerprint(key: str) -> int:
+    # 0 marks an empty slot, so remap the one key that hashes to it.
+    return hash(key) or 1
@@ -0,0 +1,552 @@
+from __future__ import annotations
+
+import collections
+import functools
+import json
+import queue
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass
+from io import BufferedIOBase
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from .scanner import (
+    _chunked,
+    _ChunkResult,
+    _new_worker_state,
+    _Outcome,
+    _run_chunk,
+    _WorkerConfig,
+)
+from .takeover import (
+    FingerprintCatalog,
+    catalog_to_dict,
+    detect_takeover,
+    parse_fingerprint_catalog,
+)
+
+# Line-delimited JSON over TCP. Workers say "hello", receive the scan "config", then loop on
+# "next" -> "chunk" | "wait" | "done" and answer each chunk with "results", sending a
+# "heartbeat" every scan `timeout` seconds while they resolve it.
+_PROTOCOL_VERSION = 3
+# A worker connection silent for this many heartbeat intervals is dropped (its chunk requeued).
+_IDLE_HEARTBEATS = 4
+# Time a new connection gets to say "hello".
+_HELLO_TIMEOUT_S = 10.0
+
+_T = TypeVar("_T")
+
+
+def parse_host_port(spec: str, *, default_port: int | None = None) -> tuple[str, int]:
+    """
+    Parse "host:port" (or "[v6]:port"; bare host when `default_port` is set).
+    """
+    raw = str(spec).strip()
+    host = raw
+    port_raw: str | None = None
+    if raw.startswith("["):
+        end = raw.find("]")
+        if end == -1:
+            raise ValueError(f"invalid address {raw!r}: missing ']'")
+        host = raw[1:end]
+        rest = raw[end + 1 :]
+        if rest:
+            if not rest.startswith(":"):
+                raise ValueError(f"invalid address {raw!r}")
+            port_raw = rest[1:]
+    elif raw.count(":") == 1:
+        host, port_raw = raw.split(":", 1)
+    if port_raw is None:
+        if default_port is None:
+            raise ValueError(f"invalid address {raw!r}: expected host:port")
+        return host or "127.0.0.1", default_port
+    try:
+        port = int(port_raw)
+    except ValueError as e:
+        raise ValueError(f"invalid port in {raw!r}") from e
+    if port < 0 or port > 65535:
+        raise ValueError(f"invalid port in {raw!r}")
+    return host or "127.0.0.1", port
+
+
+def _send(wfile: BufferedIOBase, obj: dict[str, Any]) -> None:
+    wfile.write(json.dumps(obj).encode("utf-8") + b"\n")
+    wfile.flush()
+
+
+def _recv(rfile: BufferedIOBase) -> dict[str, Any] | None:
+    line = rfile.readline()
+    if not line:
+        return None
+    obj = json.loads(line)
+    if not isinstance(obj, dict):
+        raise ValueError("protocol error: expected JSON object")
+    return obj
+
+
+class _ChunkQueue:
+    """
+    Hands out candidate chunks as leases and collects their results.
+
+    Chunks held by a disconnected worker, or leased for longer than `lease_timeout`, go back to
+    the front of the queue; late or duplicate results for an already-completed chunk are dropped.
+    The source is polled again after running dry, and the queue only counts as finished once
+    every result has been handed to the scan, so candidates it feeds back (`--harvest`) are
+    still served to workers.
+    """
+
+    def __init__(
+        self,
+        candidates: Iterable[tuple[str, str]],
+        *,
+        chunk_size: int,
+        lease_timeout: float,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._source = _chunked(candidates, chunk_size)
+        self._lease_timeout = lease_timeout
+        self._requeued: collections.deque[tuple[int, list[tuple[str, str]]]] = collections.deque()
+        self._leased: dict[int, tuple[list[tuple[str, str]], float]] = {}
+        self._ready: collections.deque[list[tuple[str, str]]] = collections.deque()
+        self._next_id = 0
+        self._exhausted = False
+        self._completed = 0
+        self._delivered = 0
+        self.error: BaseException | None = None
+        self.requeued_total = 0
+        self.results: queue.Queue[_ChunkResult] = queue.Queue()
+
+    def take(self) -> tuple[int, list[tuple[str, str]]] | None:
+        with self._lock:
+            if self._requeued:
+                chunk_id, chunk = self._requeued.popleft()
+            else:
+                fresh = self._pull()
+                if fresh is None:
+                    return None
+                chunk = fresh
+                chunk_id = self._next_id
+                self._next_id += 1
+            self._leased[chunk_id] = (chunk, time.monotonic())
+            return chunk_id, chunk
+
+    def _pull(self) -> list[tuple[str, str]] | None:
+        if self._ready:
+            return self._ready.popleft()
+        if self._exhausted:
+            return None
+        try:
+            return next(self._source)
+        except StopIteration:
+            return None
+        except Exception as e:  # surfaced on the coordinator's main thread
+            self.error = e
+            self._exhausted = True
+            return None
+
+    def complete(self, chunk_id: int, result: _ChunkResult) -> None:
+        with self._lock:
+            if self._leased.pop(chunk_id, None) is None:
+                return
+            self._completed += 1
+            self.results.put(result)
+
+    def delivered(self) -> None:
+        """Record that the scan has consumed one result (and fed back anything it found)."""
+        with self._lock:
+            self._delivered += 1
+
+    def release(self, chunk_id: int) -> None:
+        with self._lock:
+            leased = self._leased.pop(chunk_id, None)
+            if leased is not None:
+                self._requeued.append((chunk_id, leased[0]))
+                self.requeued_total += 1
+
+    def expire_leases(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                chunk_id
+                for chunk_id, (_chunk, leased_at) in self._leased.items()
+                if now - leased_at > self._lease_timeout
+            ]
+            for chunk_id in expired:
+                chunk, _leased_at = self._leased.pop(chunk_id)
+                self._requeued.append((chunk_id, chunk))
+                self.requeued_total += 1
+
+    def finished(self) -> bool:
+        with self._lock:
+            if self._requeued or self._leased or self._delivered < self._completed:
+                return False
+            if self._ready:
+                return False
+            chunk = self._pull()
+            if chunk is None:
+                return True
+            self._ready.append(chunk)
+            return False
+
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, address: tuple[str, int], coordinator: Coordinator) -> None:
+        self.coordinator = coordinator
+        super().__init__(address, _CoordinatorHandler)
+
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    server: _CoordinatorServer
+    # Applied to the connection in setup(); no read may block a handler thread forever.
+    timeout = _HELLO_TIMEOUT_S
+
+    def handle(self) -> None:
+        coordinator = self.server.coordinator
+        leased: int | None = None
+        try:
+            hello = _recv(self.rfile)
+            if hello is None or hello.get("type") != "hello":
+                return
+            if coordinator.token is not None and hello.get("token") != coordinator.token:
+                _send(self.wfile, {"type": "error", "message": "invalid worker token"})
+                return
+            chunks = coordinator.chunks
+            if chunks is None:  # pragma: no cover - server only serves while dispatching
+                return
+            _send(self.wfile, coordinator.config_payload)
+            # A worker that vanishes without closing (or half-closes) is noticed here instead
+            # of holding this thread until its lease expires.
+            self.connection.settimeout(
+                _IDLE_HEARTBEATS * float(coordinator.config_payload["timeout"])
+            )
+            while True:
+                msg = _recv(self.rfile)
+                if msg is None:
+                    return
+                kind = msg.get("type")
+                if kind == "results":
+                    chunk_id = int(msg["id"])
+                    outcomes: list[_Outcome] = [
+                        (
+                            str(domain),
+                            str(label),
+                            str(status),
+                            None if line is None else str(line),
+                            tuple(str(name) for name in harvested),
+                            bool(nodata),
+                        )
+                        for domain, label, status, line, harvested, nodata in msg["outcomes"]
+                    ]
+                    chunks.complete(
+                        chunk_id,
+                        _ChunkResult(
+                            outcomes=outcomes,
+                            takeover_checked=int(msg.get("takeover_checked", 0)),
+                            takeover_suspected=int(msg.get("takeover_suspected", 0)),
+                            queries={
+                                str(resolver): int(count)
+                                for resolver, count in msg.get("queries", {}).items()
+                            },
+                            queries_delayed=int(msg.get("queries_delayed", 0)),
+                            concurrency_window=int(msg.get("concurrency_window", 0)),
+                            source_counts={
+                                str(address): (int(queries), int(errors))
+                                for address, (queries, errors) in msg.get("sources", {}).items()
+                            },
+                        ),
+                    )
+                    if leased == chunk_id:
+                        leased = None
+                elif kind == "heartbeat":
+                    continue
+                elif kind == "next":
+                    lease = chunks.take()
+                    if lease is not None:
+                        leased = lease[0]
+                        _send(
+                            self.wfile,
+                            {"type": "chunk", "id": lease[0], "candidates": lease[1]},
+                        )
+                    elif chunks.finished():
+                        _send(self.wfile, {"type": "done"})
+                        return
+                    else:
+                        # Other workers still hold leases that may come back to the queue.
+                        _send(self.wfile, {"type": "wait", "delay_s": coordinator.poll_s})
+                else:
+                    return
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        finally:
+            if leased is not None and coordinator.chunks is not None:
+                coordinator.chunks.release(leased)
+
+
+class Coordinator:
+    """
+    Serve scan candidates to `worker` processes over TCP and stream their results back.
+
+    Use `dispatch` as the `chunk_dispatcher` of a scan: the scan keeps doing input dedupe,
+    resume, output and summaries while workers do the resolving.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chunk_size: int = 256,
+        lease_timeout: float = 300.0,
+        token: str | None = None,
+        takeover: tuple[float, FingerprintCatalog] | None = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        if lease_timeout <= 0:
+            raise ValueError("lease_timeout must be > 0")
+        self.chunk_size = chunk_size
+        self.lease_timeout = lease_timeout
+        self.token = token
+        self.takeover = takeover
+        self.poll_s = 0.2
+        self.chunks: _ChunkQueue | None = None
+        self.config_payload: dict[str, Any] = {}
+        # Bind eagerly so callers can report the address (useful with port 0) before scanning.
+        self._server = _CoordinatorServer((host, port), self)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def close(self) -> None:
+        self._server.server_close()
+
+    def dispatch(
+        self, candidates: Iterable[tuple[str, str]], config: _WorkerConfig
+    ) -> Iterator[_ChunkResult]:
+        self.config_payload = _config_payload(config, takeover=self.takeover)
+        chunks = _ChunkQueue(
+            candidates, chunk_size=self.chunk_size, lease_timeout=self.lease_timeout
+        )
+        self.chunks = chunks
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            while True:
+                try:
+                    result = chunks.results.get(timeout=self.poll_s)
+                except queue.Empty:
+                    if chunks.error is not None:
+                        raise chunks.error
+                    if chunks.finished():
+                        break
+                    chunks.expire_leases()
+                    continue
+                yield result
+                chunks.delivered()
+                chunks.expire_leases()
+        finally:
+            self._server.shutdown()
+            thread.join(timeout=1)
+            self._server.server_close()
+
+
+def _with_heartbeats(wfile: BufferedIOBase, interval_s: float, run: Callable[[], _T]) -> _T:
+    """Call `run`, telling the coordinator every `interval_s` seconds that this worker is alive."""
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(interval_s):
+            try:
+                _send(wfile, {"type": "heartbeat"})
+            except OSError:
+                return
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        return run()
+    finally:
+        # Joined before anything else is written, so the results never interleave with a beat.
+        stop.set()
+        thread.join()
+
+
+def _config_payload(
+    config: _WorkerConfig, *, takeover: tuple[float, FingerprintCatalog] | None
+) -> dict[str, Any]:
+    return {
+        "type": "config",
+        "protocol": _PROTOCOL_VERSION,
+        "timeout": config.timeout,
+        "statuses": None if config.statuses is None else sorted(config.statuses),
+        "detect_wildcard": config.detect_wildcard,
+        "wildcard_probes": config.wildcard_probes,
+        "wildcard_threshold": config.wildcard_threshold,
+        "wildcard_verify_http": config.wildcard_verify_http,
+        "wildcard_http_timeout": config.wildcard_http_timeout,
+        "include_cname": config.include_cname,
+        "retries": config.retries,
+        "retry_backoff_ms": config.retry_backoff_ms,
+        "nameservers": config.nameservers,
+        "rate": config.rate,
+        "rate_per_resolver": config.rate_per_resolver,
+        "adaptive_concurrency": config.adaptive_concurrency,
+        "deadline": config.deadline,
+        "sweep": config.sweep,
+        "record_types": list(config.record_types),
+        "harvest": config.harvest,
+        "takeover": (
+            None
+            if takeover is None
+            else {"timeout": takeover[0], "catalog": catalog_to_dict(takeover[1])}
+        ),
+    }
+
+
+def _config_from_payload(
+    payload: dict[str, Any],
+    *,
+    concurrency: int,
+    nameservers: list[tuple[str, int]] | None,
+    bind: tuple[str, ...] = (),
+) -> _WorkerConfig:
+    if payload.get("protocol") != _PROTOCOL_VERSION:
+        raise ValueError(f"unsupported coordinator protocol: {payload.get('protocol')!r}")
+    if nameservers is None and payload.get("nameservers") is not None:
+        nameservers = [(str(host), int(port)) for host, port in payload["nameservers"]]
+    include_cname = bool(payload["include_cname"])
+    if include_cname and nameservers is None:
+        raise ValueError("coordinator requested include_cname but the worker has no resolvers")
+    record_types = tuple(int(qtype) for qtype in payload.get("record_types") or ())
+    if record_types and nameservers is None:
+        raise ValueError("coordinator requested record_types but the worker has no resolvers")
+    harvest = bool(payload.get("harvest", False))
+    if harvest and nameservers is None:
+        raise ValueError("coordinator requested harvest but the worker has no resolvers")
+    if bind and nameservers is None:
+        raise ValueError("bind requires resolvers (--resolver/--resolver-file)")
+    takeover_raw = payload.get("takeover")
+    takeover_checker = None
+    if takeover_raw is not None:
+        takeover_checker = functools.partial(
+            detect_takeover,
+            timeout=float(takeover_raw["timeout"]),
+            catalog=parse_fingerprint_catalog(takeover_raw["catalog"]),
+        )
+    statuses_raw = payload.get("statuses")
+    return _WorkerConfig(
+        timeout=float(payload["timeout"]),
+        concurrency=concurrency,
+        statuses=None if statuses_raw is None else {str(s) for s in statuses_raw},
+        detect_wildcard=bool(payload["detect_wildcard"]),
+        wildcard_probes=int(payload["wildcard_probes"]),
+        wildcard_threshold=int(payload["wildcard_threshold"]),
+        wildcard_verify_http=bool(payload["wildcard_verify_http"]),
+        wildcard_http_timeout=float(payload["wildcard_http_timeout"]),
+        include_cname=include_cname,
+        retries=int(payload["retries"]),
+        retry_backoff_ms=int(payload["retry_backoff_ms"]),
+        takeover_checker=takeover_checker,
+        nameservers=nameservers,
+        rate=_optional_float(payload.get("rate")),
+        rate_per_resolver=_optional_float(payload.get("rate_per_resolver")),
+        adaptive_concurrency=bool(payload.get("adaptive_concurrency", False)),
+        deadline=_optional_float(payload.get("deadline")),
+        sweep=bool(payload.get("sweep", True)),
+        record_types=record_types,
+        harvest=harvest,
+        bind=bind,
+    )
+
+
+def _optional_float(value: object) -> float | None:
+    return None if value is None else float(str(value))
+
+
+@dataclass(frozen=True)
+class WorkerSummary:
+    chunks: int
+    attempted: int
+    elapsed_ms: int
+
+
+def run_worker(
+    host: str,
+    port: int,
+    *,
+    concurrency: int = 20,
+    nameservers: list[tuple[str, int]] | None = None,
+    token: str | None = None,
+    connect_timeout: float = 10.0,
+    bind: Sequence[str] | None = None,
+) -> WorkerSummary:
+    """
+    Connect to a coordinator and resolve chunks until it reports the scan is done.
+
+    `nameservers` overrides the coordinator's resolvers, so each node can use local ones;
+    `bind` lists this node's local source addresses.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    start = time.time()
+    chunks_done = 0
+    attempted = 0
+    with socket.create_connection((host, port), timeout=connect_timeout) as sock:
+        sock.settimeout(None)
+        rfile = sock.makefile("rb")
+        wfile = sock.makefile("wb")
+        _send(wfile, {"type": "hello", "protocol": _PROTOCOL_VERSION, "token": token})
+        msg = _recv(rfile)
+        if msg is None:
+            raise OSError("coordinator closed the connection")
+        if msg.get("type") == "error":
+            raise ValueError(str(msg.get("message", "coordinator rejected worker")))
+        config = _config_from_payload(
+            msg, concurrency=concurrency, nameservers=nameservers, bind=tuple(bind or ())
+        )
+        state = _new_worker_state(config)
+        try:
+            while True:
+                _send(wfile, {"type": "next"})
+                msg = _recv(rfile)
+                if msg is None:
+                    raise OSError("coordinator closed the connection")
+                kind = msg.get("type")
+                if kind == "done":
+                    break
+                if kind == "wait":
+                    time.sleep(float(msg.get("delay_s", 0.2)))
+                    continue
+                if kind != "chunk":
+                    raise ValueError(f"protocol error: unexpected message {kind!r}")
+                chunk = [(str(domain), str(label)) for domain, label in msg["candidates"]]
+                result = _with_heartbeats(wfile, config.timeout, lambda: _run_chunk(state, chunk))
+                _send(
+                    wfile,
+                    {
+                        "type": "results",
+                        "id": msg["id"],
+                        "outcomes": result.outcomes,
+                        "takeover_checked": result.takeover_checked,
+                        "takeover_suspected": result.takeover_suspected,
+                        "queries": result.queries,
+                        "queries_delayed": result.queries_delayed,
+                        "concurrency_window": result.concurrency_window,
+                        "sources": result.source_counts,
+                    },
+                )
+                chunks_done += 1
+                attempted += len(result.outcomes)
+        finally:
+            state.close()
+    return WorkerSummary(
+        chunks=chunks_done, attempted=attempted, elapsed_ms=int((time.time() - start) * 1000)
+    )
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import ipaddress
+import select
 import socket
 import secrets
 import struct
-from dataclasses import dataclass
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Sequence
+from typing import Iterable, Sequence
+
+from .ratelimit import RateLimiter, resolver_key
+from .sources import SourceAddresses
 
 
 @dataclass(frozen=True)
@@ -20,6 +26,10 @@ class DnsQueryError(Exception):
         return f"{self.message} (rcode={self.rcode})"
 
 
+class DeadlineExceeded(Exception):
+    """The per-name time budget ran out before resolution finished."""
+
+
 @dataclass(frozen=True)
 class ResolvedHost:
     ips: list[str]
@@ -28,10 +38,47 @@ class ResolvedHost:
     ttl_min: int | None
     ttl_max: int | None
     canonical_target: str | None
+    # The name itself returned NXDOMAIN (no CNAME); otherwise an empty result is NODATA.
+    nxdomain: bool = False
+
+
+# Record types known by name; anything else is accepted as `TYPEnnn` (RFC 3597).
+RECORD_TYPES = {
+    "A": 1,
+    "NS": 2,
+    "CNAME": 5,
+    "SOA": 6,
+    "PTR": 12,
+    "MX": 15,
+    "TXT": 16,
+    "AAAA": 28,
+    "SRV": 33,
+    "CAA": 257,
+}
+_QTYPE_LABELS = {qtype: label for label, qtype in RECORD_TYPES.items()}
+_RECORD_TYPE_ORDER = ("A", "AAAA", "CNAME")
+# OPT (41) and the query-only types (TKEY..ANY) cannot be asked for as ordinary RRsets.
+_META_QTYPES = {0, 41, *range(128, 256)}
 
 
-_QTYPE_LABELS = {1: "A", 28: "AAAA"}
-_RECORD_TYPE_ORDER = ("A", "AAAA", "CNAME")
+def record_type_name(qtype: int) -> str:
+    return _QTYPE_LABELS.get(qtype, f"TYPE{qtype}")
+
+
+def parse_record_type(spec: str) -> int:
+    """Parse a record type name ("MX"), RFC 3597 form ("TYPE65") or number into a qtype."""
+    raw = str(spec).strip().upper()
+    if not raw:
+        raise ValueError("record type must be non-empty")
+    if raw in RECORD_TYPES:
+        return RECORD_TYPES[raw]
+    digits = raw[4:] if raw.startswith("TYPE") else raw
+    if not digits.isdigit():
+        raise ValueError(f"unknown record type: {spec}")
+    qtype = int(digits)
+    if qtype < 1 or qtype > 65535 or qtype in _META_QTYPES:
+        raise ValueError(f"unsupported record type: {spec}")
+    return qtype
 
 
 def _ordered_record_types(values: set[str]) -> list[str]:
@@ -118,6 +165,35 @@ def load_nameservers_file(path: Path) -> list[tuple[str, int]]:
     return entries
 
 
+def name_exists(
+    name: str,
+    *,
+    nameservers: Sequence[tuple[str, int]],
+    timeout: float,
+    limiter: RateLimiter | None = None,
+    deadline: float | None = None,
+    harvest: list[str] | None = None,
+    sources: SourceAddresses | None = None,
+) -> bool:
+    """
+    Cheap existence check: a single A query.
+
+    Only a plain NXDOMAIN (no CNAME in the answer) counts as missing; that is exactly the case
+    where `resolve_host_details` would also find nothing, so callers can skip it safely.
+    """
+    resp = _query(
+        str(name).strip().strip(".").lower(),
+        qtype=1,
+        nameservers=nameservers,
+        timeout=timeout,
+        limiter=limiter,
+        deadline=deadline,
+        sources=sources,
+    )
+    _harvest(resp, harvest)
+    return not (resp.rcode == 3 and not resp.cnames)
+
+
 def resolve_ips(
     name: str,
     *,
@@ -149,7 +225,21 @@ def resolve_host_details(
     nameservers: Sequence[tuple[str, int]],
     timeout: float,
     max_cname_depth: int = 8,
+    limiter: RateLimiter | None = None,
+    deadline: float | None = None,
+    harvest: list[str] | None = None,
+    sources: SourceAddresses | None = None,
+    sweep: bool = False,
 ) -> ResolvedHost:
+    """
+    Resolve A/AAAA (following CNAMEs) via `nameservers`.
+
+    `deadline` is a `time.monotonic()` timestamp bounding every sub-query (hops, qtypes,
+    resolver fallbacks); once it passes, `DeadlineExceeded` is raised. When `harvest` is given,
+    every hostname the responses mention (CNAME targets, authority NS/SOA, glue) is appended.
+    With `sweep`, a name whose A query is a plain NXDOMAIN is settled without asking for AAAA;
+    the result is the same, and names that exist still cost A + AAAA per hop.
+    """
     if timeout <= 0:
         raise ValueError("timeout must be > 0")
     if not nameservers:
@@ -170,6 +260,7 @@ def resolve_host_details(
 
     for _ in range(max_cname_depth + 1):
         observed_cnames: list[str] = []
+        name_error = True
 
         for qtype in (1, 28):  # A, AAAA
             resp = _query(
@@ -177,13 +268,28 @@ def resolve_host_details(
                 qtype=qtype,
                 nameservers=nameservers,
                 timeout=timeout,
+                limiter=limiter,
+                deadline=deadline,
+                sources=sources,
             )
+            _harvest(resp, harvest)
+            name_error = name_error and resp.rcode == 3 and not resp.cnames
+            if sweep and name_error and not cnames_chain:
+                return ResolvedHost(
+                    ips=[],
+                    cnames=[],
+                    record_types=[],
+                    ttl_min=None,
+                    ttl_max=None,
+                    canonical_target=None,
+                    nxdomain=True,
+                )
             for cname in resp.cnames:
                 if cname in observed_cnames:
                     continue
                 observed_cnames.append(cname)
             if resp.answers:
-                record_types_seen.add(_QTYPE_LABELS[qtype])
+                record_types_seen.add(record_type_name(qtype))
                 ttl_values.extend(resp.answer_ttls)
             for ip in resp.answers:
                 if ip in seen:
@@ -219,6 +325,8 @@ def resolve_host_details(
                 ttl_min=ttl_min,
                 ttl_max=ttl_max,
                 canonical_target=canonical_target,
+                # Past the first hop the queried name exists; only its CNAME target is missing.
+                nxdomain=name_error and not cnames_chain,
             )
 
         # Follow the first observed CNAME deterministically; record the chain for debugging/triage.
@@ -248,6 +356,161 @@ def resolve_host_details(
     )
 
 
+@dataclass
+class _Pending:
+    name: str
+    qtype: int
+    attempt: int
+    first_resolver: int
+    nameserver: tuple[str, int]
+    source: str | None
+    expires: float
+
+
+def resolve_records(
+    hosts: Iterable[str],
+    *,
+    record_types: Sequence[int],
+    nameservers: Sequence[tuple[str, int]],
+    timeout: float,
+    window: int = 64,
+    limiter: RateLimiter | None = None,
+    sources: SourceAddresses | None = None,
+) -> dict[str, dict[str, list[str]]]:
+    """
+    Query every (host, record type) pair and merge the answers into one mapping per host.
+
+    Queries are pipelined over one UDP socket per address family (per `sources` address when
+    given, rotating through them): up to `window` are in flight
+    at once and matched back by transaction id and source address, so a batch costs about one
+    round trip per `window` questions rather than one per question. Questions are spread across
+    `nameservers`; a timeout or error rcode moves a question on to the next one, and truncated
+    answers are re-asked over TCP. Types without answers (or that failed everywhere) are omitted.
+    """
+    if timeout <= 0:
+        raise ValueError("timeout must be > 0")
+    if not nameservers:
+        raise ValueError("nameservers must be non-empty")
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    names = list(dict.fromkeys(str(host).strip().strip(".").lower() for host in hosts))
+    records: dict[str, dict[str, list[str]]] = {name: {} for name in names}
+    questions = deque((name, qtype) for name in names for qtype in record_types)
+    pending: dict[int, _Pending] = {}
+    sockets: dict[int | str, socket.socket] = {}
+    sequence = 0
+
+    def send(name: str, qtype: int, attempt: int, first_resolver: int) -> None:
+        host, port = nameservers[(first_resolver + attempt) % len(nameservers)]
+        tid = _tid()
+        while tid in pending:
+            tid = _tid()
+        if limiter is not None:
+            limiter.acquire(resolver_key((host, port)))
+        source = None if sources is None else sources.pick(host)
+        entry = _Pending(name, qtype, attempt, first_resolver, (host, port), source, 0.0)
+        try:
+            family = socket.AF_INET6 if ":" in host else socket.AF_INET
+            key: int | str = family if source is None else source
+            sock = sockets.get(key)
+            if sock is None:
+                sock = _open_socket(family, socket.SOCK_DGRAM, source)
+                sockets[key] = sock
+                sock.setblocking(False)
+            sock.sendto(_build_query(tid=tid, qname=name, qtype=qtype), (host, port))
+        except (OSError, ValueError):
+            fail(entry)
+            return
+        entry.expires = time.monotonic() + timeout
+        pending[tid] = entry
+
+    def fail(entry: _Pending) -> None:
+        if sources is not None:
+            sources.failed(entry.source)
+        if entry.attempt + 1 < len(nameservers):
+            send(entry.name, entry.qtype, entry.attempt + 1, entry.first_resolver)
+
+    def settle(entry: _Pending, resp: _DnsParsed) -> None:
+        if resp.truncated:
+            host, port = entry.nameserver
+            if limiter is not None:
+                limiter.acquire(resolver_key((host, port)))
+            try:
+                resp = _tcp_query(
+                    host=host,
+                    port=port,
+                    qname=entry.name,
+                    qtype=entry.qtype,
+                    timeout=timeout,
+                    source=entry.source,
+                )
+            except (OSError, ValueError):
+                fail(entry)
+                return
+        if resp.rcode not in {0, 3}:
+            fail(entry)
+            return
+        if resp.answers:
+            records[entry.name][record_type_name(entry.qtype)] = resp.answers
+
+    try:
+        while questions or pending:
+            while questions and len(pending) < window:
+                name, qtype = questions.popleft()
+                send(name, qtype, 0, sequence % len(nameservers))
+                sequence += 1
+            if not pending:
+                continue
+            wait_s = max(0.0, min(entry.expires for entry in pending.values()) - time.monotonic())
+            ready, _, _ = select.select(list(sockets.values()), [], [], wait_s)
+            for sock in ready:
+                while True:
+                    try:
+                        data, addr = sock.recvfrom(4096)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        # e.g. ICMP port unreachable surfacing on the shared socket; the
+                        # affected question times out and moves on like any other loss.
+                        continue
+                    if len(data) < 12:
+                        continue
+                    tid = struct.unpack("!H", data[:2])[0]
+                    entry = pending.get(tid)
+                    if entry is None or not _same_address(addr, entry.nameserver):
+                        continue
+                    del pending[tid]
+                    try:
+                        resp = _parse_response(data, tid=tid, qtype=entry.qtype)
+                    except ValueError:
+                        fail(entry)
+                        continue
+                    settle(entry, resp)
+            now = time.monotonic()
+            for tid, entry in list(pending.items()):
+                if entry.expires <= now:
+                    del pending[tid]
+                    fail(entry)
+    finally:
+        for sock in sockets.values():
+            sock.close()
+    return records
+
+
+def _same_address(addr: tuple[str, int] | tuple[str, int, int, int], ns: tuple[str, int]) -> bool:
+    try:
+        return ipaddress.ip_address(addr[0]) == ipaddress.ip_address(ns[0]) and addr[1] == ns[1]
+    except ValueError:
+        return False
+
+
+def _harvest(resp: _DnsParsed, harvest: list[str] | None) -> None:
+    if harvest is not None:
+        harvest.extend(resp.cnames)
+        harvest.extend(resp.names)
+
+
 def _query_rrset(
     name: str,
     *,
@@ -264,34 +527,50 @@ def _query(
     qtype: int,
     nameservers: Sequence[tuple[str, int]],
     timeout: float,
+    limiter: RateLimiter | None = None,
+    deadline: float | None = None,
+    sources: SourceAddresses | None = None,
 ) -> _DnsParsed:
     last_err: BaseException | None = None
     for host, port in nameservers:
+        if limiter is not None:
+            limiter.acquire(resolver_key((host, port)))
+        query_timeout = _budget(timeout, deadline)
+        source = None if sources is None else sources.pick(host)
         try:
             resp = _udp_query(
                 host=host,
                 port=port,
                 qname=name,
                 qtype=qtype,
-                timeout=timeout,
+                timeout=query_timeout,
+                source=source,
             )
             if resp.truncated:
                 # TCP fallback is intentionally minimal; it keeps resolver pinning usable
                 # when UDP responses exceed limits.
+                if limiter is not None:
+                    limiter.acquire(resolver_key((host, port)))
                 resp = _tcp_query(
                     host=host,
                     port=port,
                     qname=name,
                     qtype=qtype,
-                    timeout=timeout,
+                    timeout=_budget(timeout, deadline),
+                    source=source,
                 )
             if resp.rcode in {0, 3}:
                 return resp
             raise DnsQueryError("dns error response", rcode=resp.rcode)
         except (TimeoutError, OSError, ValueError, DnsQueryError) as e:
+            if sources is not None:
+                sources.failed(source)
             last_err = e
             continue
 
+    # A timeout clipped by the deadline is the deadline's doing, not the resolver's.
+    if deadline is not None and time.monotonic() >= deadline:
+        raise DeadlineExceeded("per-name deadline exceeded")
     if last_err is None:  # pragma: no cover
         raise TimeoutError("dns query failed")
     if isinstance(last_err, TimeoutError):
@@ -301,6 +580,16 @@ def _query(
     raise DnsQueryError(str(last_err))
 
 
+def _budget(timeout: float, deadline: float | None) -> float:
+    """Socket timeout for the next sub-query, clipped to what is left before `deadline`."""
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("per-name deadline exceeded")
+    return min(timeout, remaining)
+
+
 @dataclass(frozen=True)
 class _DnsParsed:
     rcode: int
@@ -308,6 +597,8 @@ class _DnsParsed:
     answers: list[str]
     cnames: list[str]
     answer_ttls: list[int]
+    # Hostnames named outside the answer (authority NS/SOA, additional-section glue).
+    names: list[str] = field(default_factory=list)
 
 
 def _udp_query(
@@ -317,10 +608,12 @@ def _udp_query(
     qname: str,
     qtype: int,
     timeout: float,
+    source: str | None = None,
 ) -> _DnsParsed:
     tid = _tid()
     msg = _build_query(tid=tid, qname=qname, qtype=qtype)
-    with socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_DGRAM) as s:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    with _open_socket(family, socket.SOCK_DGRAM, source) as s:
         s.settimeout(timeout)
         s.sendto(msg, (host, port))
         data, _addr = s.recvfrom(4096)
@@ -334,10 +627,12 @@ def _tcp_query(
     qname: str,
     qtype: int,
     timeout: float,
+    source: str | None = None,
 ) -> _DnsParsed:
     tid = _tid()
     msg = _build_query(tid=tid, qname=qname, qtype=qtype)
-    with socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM) as s:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    with _open_socket(family, socket.SOCK_STREAM, source) as s:
         s.settimeout(timeout)
         s.connect((host, port))
         s.sendall(struct.pack("!H", len(msg)) + msg)
@@ -347,6 +642,17 @@ def _tcp_query(
     return _parse_response(data, tid=tid, qtype=qtype)
 
 
+def _open_socket(family: int, kind: int, source: str | None) -> socket.socket:
+    sock = socket.socket(family, kind)
+    if source is not None:
+        try:
+            sock.bind((source, 0))
+        except OSError:
+            sock.close()
+            raise
+    return sock
+
+
 def _recv_exact(sock: socket.socket, n: int) -> bytes:
     chunks: list[bytes] = []
     remaining = n
@@ -389,7 +695,7 @@ def _encode_qname(name: str) -> bytes:
 def _parse_response(data: bytes, *, tid: int, qtype: int) -> _DnsParsed:
     if len(data) < 12:
         raise ValueError("short dns response")
-    rid, flags, qd, an, _ns, _ar = struct.unpack("!HHHHHH", data[:12])
+    rid, flags, qd, an, ns, ar = struct.unpack("!HHHHHH", data[:12])
     if rid != tid:
         raise ValueError("dns transaction id mismatch")
     if (flags & 0x8000) == 0:
@@ -416,7 +722,6 @@ def _parse_response(data: bytes, *, tid: int, qtype: int) -> _DnsParsed:
         if offset + rdlen > len(data):
             raise ValueError("malformed dns rdata")
         rdata_offset = offset
-        rdata = data[rdata_offset : rdata_offset + rdlen]
         offset += rdlen
 
         if rclass != 1:
@@ -427,26 +732,100 @@ def _parse_response(data: bytes, *, tid: int, qtype: int) -> _DnsParsed:
             target = target.strip(".").lower()
             if target:
                 cnames.append(target)
-            continue
+            if qtype != 5:
+                continue
 
         if rtype != qtype:
             continue
-        if rtype == 1 and rdlen == 4:
-            answers.append(socket.inet_ntoa(rdata))
-            answer_ttls.append(int(ttl))
-        elif rtype == 28 and rdlen == 16:
-            answers.append(socket.inet_ntop(socket.AF_INET6, rdata))
+        value = _format_rdata(data, rtype=rtype, offset=rdata_offset, rdlen=rdlen)
+        if value is not None:
+            answers.append(value)
             answer_ttls.append(int(ttl))
 
+    # Authority and additional sections name hosts for free: NS targets, the SOA primary server
+    # and glue owners. Malformed trailing sections only lose these extras, never the answer.
+    names: list[str] = []
+    try:
+        for section_index in range(ns + ar):
+            owner, offset = _decode_name(data, offset)
+            if offset + 10 > len(data):
+                break
+            rtype, rclass, _ttl, rdlen = struct.unpack("!HHIH", data[offset : offset + 10])
+            offset += 10
+            if offset + rdlen > len(data):
+                break
+            if rclass == 1:
+                if section_index < ns and rtype in {2, 6}:  # NS target, SOA MNAME
+                    names.append(_decode_name(data, offset)[0])
+                elif section_index >= ns and rtype in {1, 28}:  # glue
+                    names.append(owner)
+            offset += rdlen
+    except ValueError:
+        pass
+
     return _DnsParsed(
         rcode=rcode,
         truncated=truncated,
         answers=answers,
         cnames=cnames,
         answer_ttls=answer_ttls,
+        names=[name.strip(".").lower() for name in names if name.strip(".")],
     )
 
 
+def _format_rdata(msg: bytes, *, rtype: int, offset: int, rdlen: int) -> str | None:
+    """
+    Render one RR's rdata in zone-file presentation form (names lowercased, no trailing dot).
+
+    Unknown types use the RFC 3597 `\\# <len> <hex>` form; malformed rdata yields None.
+    """
+    rdata = msg[offset : offset + rdlen]
+    try:
+        if rtype == 1:
+            return socket.inet_ntoa(rdata) if rdlen == 4 else None
+        if rtype == 28:
+            return socket.inet_ntop(socket.AF_INET6, rdata) if rdlen == 16 else None
+        if rtype in {2, 5, 12}:  # NS, CNAME, PTR
+            return _rdata_name(msg, offset)
+        if rtype == 15:  # MX
+            (preference,) = struct.unpack("!H", rdata[:2])
+            return f"{preference} {_rdata_name(msg, offset + 2)}"
+        if rtype == 16:  # TXT: character-strings are concatenated (as SPF/DKIM readers do)
+            parts: list[str] = []
+            pos = 0
+            while pos < rdlen:
+                length = rdata[pos]
+                if pos + 1 + length > rdlen:
+                    return None
+                parts.append(rdata[pos + 1 : pos + 1 + length].decode("utf-8", errors="replace"))
+                pos += 1 + length
+            return "".join(parts)
+        if rtype == 33:  # SRV
+            priority, weight, port = struct.unpack("!HHH", rdata[:6])
+            return f"{priority} {weight} {port} {_rdata_name(msg, offset + 6)}"
+        if rtype == 6:  # SOA
+            mname, pos = _decode_name(msg, offset)
+            rname, pos = _decode_name(msg, pos)
+            serial, refresh, retry, expire, minimum = struct.unpack("!IIIII", msg[pos : pos + 20])
+            return (
+                f"{mname.lower() or '.'} {rname.lower() or '.'} "
+                f"{serial} {refresh} {retry} {expire} {minimum}"
+            )
+        if rtype == 257:  # CAA
+            flags, tag_len = rdata[0], rdata[1]
+            tag = rdata[2 : 2 + tag_len].decode("ascii")
+            value = rdata[2 + tag_len :].decode("utf-8", errors="replace")
+            return f'{flags} {tag} "{value}"'
+    except (IndexError, struct.error, ValueError):
+        return None
+    return f"\\# {rdlen} {rdata.hex()}" if rdlen else "\\# 0"
+
+
+def _rdata_name(msg: bytes, offset: int) -> str:
+    name, _ = _decode_name(msg, offset)
+    return name.lower() or "."
+
+
 def _decode_name(msg: bytes, offset: int) -> tuple[str, int]:
     """
     Decode a possibly-compressed DNS name at `offset`.
@@ -502,10 +881,16 @@ def _skip_name(msg: bytes, offset: int) -> int:
 
 
 __all__ = [
+    "DeadlineExceeded",
     "DnsQueryError",
+    "RECORD_TYPES",
     "ResolvedHost",
+    "name_exists",
     "parse_nameserver",
+    "parse_record_type",
+    "record_type_name",
     "resolve_host",
     "resolve_host_details",
     "resolve_ips",
+    "resolve_records",
 ]
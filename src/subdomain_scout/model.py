@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import functools
+import heapq
+import itertools
+import json
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+from .compression import open_text
+from .dedupe import DEFAULT_MEMORY_LIMIT, FingerprintSet
+from .validation import normalize_domains, normalize_labels
+
+MODEL_KIND = "label_model"
+STATS_KIND = "label_stats"
+_MODEL_VERSION = 1
+DEFAULT_ORDER = 4
+# Labels from a statistics file that `scan --label-stats` puts first by default.
+DEFAULT_PRIORITY_LABELS = 10000
+_MAX_ORDER = 8
+_MAX_LABEL_LENGTH = 63
+
+# Characters a label may contain, then the end-of-label symbol; `_START` pads the first context.
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789-"
+_END = "$"
+_START = "^"
+_SYMBOLS = _ALPHABET + _END
+# Statuses of records whose hostname exists: scan results and `ct` output.
+_OBSERVED_STATUSES = frozenset({"resolved", "cname", "passive"})
+_READ_BATCH = 1024
+# Weight of the overall hit rate in each label's estimate, in tried hosts.
+_PRIOR_TRIES = 20
+
+
+@dataclass(frozen=True)
+class LabelModel:
+    """
+    Character n-gram model of subdomain labels (`model train`).
+
+    `contexts` maps every context of up to `order - 1` preceding characters (padded with `^` at
+    the start of a label) to how often each next character, or `$` for the end of the label,
+    followed it. Probabilities are interpolated across context lengths (Witten-Bell), so labels
+    never seen in training still get a small, ordered probability.
+    """
+
+    order: int
+    contexts: Mapping[str, Mapping[str, int]]
+    hosts: int = 0
+
+    def log_prob(self, label: str) -> float:
+        """Natural log of the probability of `label` (without its zone)."""
+        return sum(
+            self._distribution(_context(self.order, label[:index]))[symbol]
+            for index, symbol in enumerate(label + _END)
+        )
+
+    def _distribution(self, context: str) -> dict[str, float]:
+        # Interpolate from the empty context (backed by a uniform floor) up to the full one.
+        probs = {symbol: 1.0 / len(_SYMBOLS) for symbol in _SYMBOLS}
+        for start in range(len(context), -1, -1):
+            counts = self.contexts.get(context[start:])
+            if not counts:
+                continue
+            seen = sum(counts.values())
+            kinds = len(counts)
+            probs = {
+                symbol: (counts.get(symbol, 0) + kinds * prob) / (seen + kinds)
+                for symbol, prob in probs.items()
+            }
+        return {symbol: math.log(prob) for symbol, prob in probs.items()}
+
+
+@dataclass(frozen=True)
+class HitStats:
+    """
+    Label history across past results (`model stats`).
+
+    `labels` maps each leftmost label to (hosts where it existed, hosts where it was tried).
+    """
+
+    labels: Mapping[str, tuple[int, int]]
+    hosts: int = 0
+
+    @functools.cached_property
+    def base_rate(self) -> float:
+        """Share of all tried hosts that existed: the prior every label's rate starts from."""
+        hits = sum(hits for hits, _tried in self.labels.values())
+        tried = sum(tried for _hits, tried in self.labels.values())
+        return hits / tried if tried else 0.0
+
+    def hit_rate(self, label: str) -> float:
+        """
+        Expected chance that `label` exists on a new zone.
+
+        The observed ratio is shrunk toward `base_rate` as if every label had also been tried
+        on `_PRIOR_TRIES` more hosts, so a label seen once cannot outrank one that existed on
+        hundreds of hosts.
+        """
+        hits, tried = self.labels.get(label, (0, 0))
+        return (hits + _PRIOR_TRIES * self.base_rate) / (tried + _PRIOR_TRIES)
+
+    def top_labels(self, limit: int) -> list[str]:
+        """Up to `limit` labels that existed somewhere, by hit rate, then by existing hosts."""
+        ranked = heapq.nsmallest(
+            limit,
+            (
+                (-self.hit_rate(label), -hits, label)
+                for label, (hits, _tried) in self.labels.items()
+                if hits
+            ),
+        )
+        return [label for _rate, _hits, label in ranked]
+
+
+def read_host_outcomes(
+    lines: Iterable[str], *, on_skipped: Callable[[int], None] | None = None
+) -> Iterator[tuple[str, bool]]:
+    """
+    Yield (hostname, existed) pairs from scan output, `ct` output or plain host lists.
+
+    JSON lines count as existing when `status` is resolved, cname or passive, and as missing when
+    it is not_found; other non-empty, non-comment lines are hostnames that exist. Unusable lines
+    (other statuses, invalid JSON or names) are dropped and counted through `on_skipped`.
+    """
+    batches: dict[bool, list[str]] = {True: [], False: []}
+    skipped = 0
+
+    def flush(existed: bool) -> Iterator[tuple[str, bool]]:
+        nonlocal skipped
+        batch = batches[existed]
+        hosts = normalize_domains(batch, skip_invalid=True)
+        skipped += len(batch) - len(hosts)
+        batch.clear()
+        for host in hosts:
+            yield host, existed
+
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if not line.startswith("{"):
+            batches[True].append(line)
+        else:
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                obj = None
+            name = obj.get("subdomain") if isinstance(obj, dict) else None
+            status = obj.get("status") if isinstance(obj, dict) else None
+            if isinstance(name, str) and status in _OBSERVED_STATUSES:
+                batches[True].append(name)
+            elif isinstance(name, str) and status == "not_found":
+                batches[False].append(name)
+            else:
+                skipped += 1
+        for existed, batch in batches.items():
+            if len(batch) >= _READ_BATCH:
+                yield from flush(existed)
+    for existed in batches:
+        yield from flush(existed)
+    if on_skipped is not None and skipped:
+        on_skipped(skipped)
+
+
+def read_observed_hosts(
+    lines: Iterable[str], *, on_skipped: Callable[[int], None] | None = None
+) -> Iterator[str]:
+    """Hostnames that exist, per `read_host_outcomes`; not_found records count as skipped."""
+    skipped = 0
+
+    def count_skipped(count: int) -> None:
+        nonlocal skipped
+        skipped += count
+
+    for host, existed in read_host_outcomes(lines, on_skipped=count_skipped):
+        if existed:
+            yield host
+        else:
+            skipped += 1
+    if on_skipped is not None and skipped:
+        on_skipped(skipped)
+
+
+def train_label_model(
+    hosts: Iterable[str], *, order: int = DEFAULT_ORDER, dedupe_memory: int | None = None
+) -> LabelModel:
+    """
+    Count the leftmost label of each distinct hostname in `hosts` into a `LabelModel`.
+
+    A host seen in many outputs counts once, so a label's weight reflects on how many zones it
+    exists rather than how often a zone was rescanned.
+    """
+    if not 1 <= order <= _MAX_ORDER:
+        raise ValueError(f"order must be between 1 and {_MAX_ORDER}")
+    seen = FingerprintSet(
+        memory_limit=DEFAULT_MEMORY_LIMIT if dedupe_memory is None else dedupe_memory
+    )
+    contexts: dict[str, dict[str, int]] = {}
+    distinct = 0
+    try:
+        for host in hosts:
+            if not seen.add(host):
+                continue
+            distinct += 1
+            label = host.split(".", 1)[0]
+            for index, symbol in enumerate(label + _END):
+                context = _context(order, label[:index])
+                for start in range(len(context) + 1):
+                    counts = contexts.setdefault(context[start:], {})
+                    counts[symbol] = counts.get(symbol, 0) + 1
+    finally:
+        seen.close()
+    return LabelModel(order=order, contexts=contexts, hosts=distinct)
+
+
+def generate_labels(model: LabelModel, limit: int) -> Iterator[str]:
+    """
+    Yield up to `limit` valid labels in decreasing model probability, best first.
+
+    Best-first search over label prefixes: every heap entry is one (prefix, next symbol) pair,
+    and popping it pushes only the prefix's next-best sibling symbol and the new prefix's best
+    continuation, so the frontier grows by at most one entry per step while labels still come
+    out in exact probability order.
+    """
+    if limit < 0:
+        raise ValueError("limit must be >= 0")
+    ranked: dict[str, list[tuple[float, str]]] = {}
+
+    def successors(prefix: str) -> list[tuple[float, str]]:
+        context = _context(model.order, prefix)
+        found = ranked.get(context)
+        if found is None:
+            found = sorted((-logp, symbol) for symbol, logp in model._distribution(context).items())
+            ranked[context] = found
+        return found
+
+    tie = itertools.count()
+    # (cost of prefix + symbol, tie-breaker, prefix, cost of prefix, index into successors)
+    frontier: list[tuple[float, int, str, float, int]] = []
+    first = successors("")
+    heapq.heappush(frontier, (first[0][0], next(tie), "", 0.0, 0))
+    emitted = 0
+    while frontier and emitted < limit:
+        cost, _tie, prefix, prefix_cost, index = heapq.heappop(frontier)
+        options = successors(prefix)
+        if index + 1 < len(options):
+            sibling_cost = prefix_cost + options[index + 1][0]
+            heapq.heappush(frontier, (sibling_cost, next(tie), prefix, prefix_cost, index + 1))
+        symbol = options[index][1]
+        if symbol == _END:
+            if prefix and not prefix.endswith("-"):
+                emitted += 1
+                yield prefix
+            continue
+        if (symbol == "-" and not prefix) or len(prefix) >= _MAX_LABEL_LENGTH:
+            continue
+        label = prefix + symbol
+        best = successors(label)[0][0]
+        heapq.heappush(frontier, (cost + best, next(tie), label, cost, 0))
+
+
+def _context(order: int, prefix: str) -> str:
+    """The `order - 1` characters before the next symbol, padded with `^` near the start."""
+    if order == 1:
+        return ""
+    return (_START * (order - 1) + prefix)[-(order - 1) :]
+
+
+def build_hit_stats(
+    outcomes: Iterable[tuple[str, bool]], *, dedupe_memory: int | None = None
+) -> HitStats:
+    """
+    Count, per leftmost label, the distinct hosts where it existed and where it was tried.
+
+    A host that is missing in one output and exists in another counts as one existing host.
+    """
+    limit = DEFAULT_MEMORY_LIMIT if dedupe_memory is None else dedupe_memory
+    tried = FingerprintSet(memory_limit=limit)
+    existing = FingerprintSet(memory_limit=limit)
+    hits: dict[str, int] = {}
+    tries: dict[str, int] = {}
+    try:
+        for host, existed in outcomes:
+            label = host.split(".", 1)[0]
+            if tried.add(host):
+                tries[label] = tries.get(label, 0) + 1
+            if existed and existing.add(host):
+                hits[label] = hits.get(label, 0) + 1
+        hosts = len(tried)
+    finally:
+        tried.close()
+        existing.close()
+    return HitStats(
+        labels={label: (hits.get(label, 0), count) for label, count in tries.items()},
+        hosts=hosts,
+    )
+
+
+def save_label_model(model: LabelModel, out_path: Path) -> int:
+    """Write `model` as compact JSON (via a temporary file); returns the size in bytes."""
+    return _write_json(
+        out_path,
+        {
+            "kind": MODEL_KIND,
+            "order": model.order,
+            "hosts": model.hosts,
+            "contexts": model.contexts,
+        },
+    )
+
+
+def load_label_model(path: Path) -> LabelModel:
+    """Read a model written by `save_label_model` (optionally gzip/xz/bz2-compressed)."""
+    obj = _read_json(path, MODEL_KIND, "label model")
+    order = obj.get("order")
+    contexts = obj.get("contexts")
+    hosts = obj.get("hosts", 0)
+    if (
+        not isinstance(order, int)
+        or not 1 <= order <= _MAX_ORDER
+        or not isinstance(contexts, dict)
+        or not _is_count(hosts)
+        or not all(
+            isinstance(counts, dict) and all(map(_is_count, counts.values()))
+            for counts in contexts.values()
+        )
+    ):
+        raise ValueError(f"corrupt label model: {path}")
+    return LabelModel(order=order, contexts=contexts, hosts=hosts)
+
+
+def save_hit_stats(stats: HitStats, out_path: Path) -> int:
+    """Write `stats` as compact JSON (via a temporary file); returns the size in bytes."""
+    return _write_json(out_path, {"kind": STATS_KIND, "hosts": stats.hosts, "labels": stats.labels})
+
+
+def load_hit_stats(path: Path) -> HitStats:
+    """Read label statistics written by `save_hit_stats` (optionally compressed)."""
+    obj = _read_json(path, STATS_KIND, "label statistics file")
+    labels = obj.get("labels")
+    hosts = obj.get("hosts", 0)
+    if (
+        not isinstance(labels, dict)
+        or not _is_count(hosts)
+        or not all(
+            isinstance(entry, list)
+            and len(entry) == 2
+            and all(map(_is_count, entry))
+            and entry[0] <= entry[1]
+            for entry in labels.values()
+        )
+    ):
+        raise ValueError(f"corrupt label statistics file: {path}")
+    # Labels are scanned as-is, so hold them to the wordlist rules: drop invalid ones and merge
+    # entries that only differ in form (case, IDNA).
+    counts: dict[str, tuple[int, int]] = {}
+    for raw, (hits, tried) in labels.items():
+        for label in normalize_labels([raw], skip_invalid=True):
+            seen_hits, seen_tried = counts.get(label, (0, 0))
+            counts[label] = (seen_hits + hits, seen_tried + tried)
+    return HitStats(labels=counts, hosts=hosts)
+
+
+def _is_count(value: object) -> bool:
+    # JSON booleans load as ints; a count is a non-negative integer and nothing else.
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _write_json(out_path: Path, obj: dict[str, Any]) -> int:
+    payload = json.dumps({**obj, "version": _MODEL_VERSION}, separators=(",", ":"), sort_keys=True)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    try:
+        tmp_path.write_text(payload + "\n", encoding="utf-8")
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return len(payload) + 1
+
+
+def _read_json(path: Path, kind: str, what: str) -> dict[str, Any]:
+    with open_text(path) as fh:
+        try:
+            obj = json.load(fh)
+        except ValueError as e:
+            raise ValueError(f"not a {what}: {path}") from e
+    if not isinstance(obj, dict) or obj.get("kind") != kind:
+        raise ValueError(f"not a {what}: {path}")
+    if obj.get("version") != _MODEL_VERSION:
+        raise ValueError(f"unsupported {what} version: {obj.get('version')!r}")
+    return obj
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import re
+from typing import Iterator, Sequence
+
+# Environment and version tokens that commonly appear next to a service name.
+DEFAULT_MUTATION_WORDS: tuple[str, ...] = (
+    "dev",
+    "test",
+    "qa",
+    "uat",
+    "stg",
+    "staging",
+    "prod",
+    "beta",
+    "internal",
+    "old",
+    "new",
+    "v1",
+    "v2",
+    "v3",
+)
+
+# Permuted names a `--mutate` scan tries at most.
+DEFAULT_MUTATION_BUDGET = 2000
+
+_DIGITS_RE = re.compile(r"\d+")
+_NUMBER_STEPS = (1, -1, 2, -2)
+
+
+def mutate_label(label: str, *, words: Sequence[str] = DEFAULT_MUTATION_WORDS) -> Iterator[str]:
+    """
+    Yield variants of a discovered label, most plausible first, without repeats.
+
+    Only the leftmost part of a multi-level label changes (`api.eu` -> `api2.eu`). In order:
+    numbers stepped up and down (`web2` -> `web3`, `web1`; zero padding kept), tokens from
+    `words` swapped for each other (`api-dev` -> `api-staging`), a first number appended
+    (`api` -> `api2`), then each word as a suffix (`api-v2`) and a prefix (`dev-api`).
+    Variants are not validated; callers drop ones that are not valid labels.
+    """
+    first, dot, rest = label.partition(".")
+    tail = dot + rest
+    produced = {first}
+
+    def emit(candidate: str) -> Iterator[str]:
+        if candidate and candidate not in produced:
+            produced.add(candidate)
+            yield candidate + tail
+
+    for match in _DIGITS_RE.finditer(first):
+        digits = match.group()
+        for step in _NUMBER_STEPS:
+            value = int(digits) + step
+            if value >= 0:
+                number = str(value).zfill(len(digits))
+                yield from emit(first[: match.start()] + number + first[match.end() :])
+
+    tokens = first.split("-")
+    for index, token in enumerate(tokens):
+        if token not in words:
+            continue
+        for word in words:
+            if word != token:
+                yield from emit("-".join(tokens[:index] + [word] + tokens[index + 1 :]))
+
+    if not _DIGITS_RE.search(first):
+        for number in ("2", "1", "3"):
+            yield from emit(first + number)
+    for word in words:
+        if word not in tokens:
+            yield from emit(f"{first}-{word}")
+    for word in words:
+        if word not in tokens:
+            yield from emit(f"{word}-{first}")
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import itertools
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
+
+from .compression import open_text
+from .validation import normalize_labels
+from .wordlist import _iter_entries
+
+_FIELD_RE = re.compile(r"\{([^{}]*)\}")
+_RANGE_RE = re.compile(r"(\d+)-(\d+)")
+_SET_NAME_RE = re.compile(r"[a-z][a-z0-9_]*")
+_EXPAND_BATCH = 1024
+
+
+@dataclass(frozen=True)
+class NumberRange:
+    """The integers `lo..hi` of a `{lo-hi}` field, formatted on demand (zero-padded to `width`)."""
+
+    lo: int
+    hi: int
+    width: int = 0
+
+    def __len__(self) -> int:
+        return self.hi - self.lo + 1
+
+    def __iter__(self) -> Iterator[str]:
+        for number in range(self.lo, self.hi + 1):
+            yield str(number).zfill(self.width)
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """
+    A parsed `--pattern` template.
+
+    `segments` holds, in order, the choices for each part of the label: a tuple of literal
+    strings, a `NumberRange`, or None for `{word}` (the current wordlist label).
+    """
+
+    template: str
+    segments: tuple[tuple[str, ...] | NumberRange | None, ...]
+
+    @property
+    def uses_word(self) -> bool:
+        return None in self.segments
+
+    @property
+    def combinations(self) -> int:
+        """Labels produced per wordlist label (or in total, without `{word}`)."""
+        total = 1
+        for choices in self.segments:
+            if choices is not None:
+                total *= len(choices)
+        return total
+
+    def expand(self, word: str | None) -> Iterator[str]:
+        # Unlike itertools.product, this never materializes a part, so huge ranges stay lazy.
+        parts = [(word or "",) if choices is None else choices for choices in self.segments]
+        return _product(parts)
+
+
+def _product(parts: Sequence[Iterable[str]], prefix: str = "") -> Iterator[str]:
+    if len(parts) == 1:
+        for value in parts[0]:
+            yield prefix + value
+        return
+    for head in parts[0]:
+        yield from _product(parts[1:], prefix + head)
+
+
+def parse_pattern(template: str, sets: Mapping[str, Sequence[str]] | None = None) -> Pattern:
+    """
+    Parse a label template such as `{word}-{env}`, `{word}{0-99}` or `{dev|stg}.{word}`.
+
+    Fields are `{word}` (each wordlist label), `{lo-hi}` (integers, zero-padded to the width
+    of `lo` when it has a leading zero, e.g. `{00-99}`), `{a|b|c}` (alternatives) and `{name}`
+    (a named set from `sets`). Text outside braces is copied as is.
+    """
+    raw = str(template).strip()
+    if not raw:
+        raise ValueError("pattern must be non-empty")
+    segments: list[tuple[str, ...] | NumberRange | None] = []
+    pos = 0
+    for match in _FIELD_RE.finditer(raw):
+        if match.start() > pos:
+            segments.append((_literal(raw[pos : match.start()], raw),))
+        segments.append(_field(match.group(1).strip(), raw, sets or {}))
+        pos = match.end()
+    if pos < len(raw):
+        segments.append((_literal(raw[pos:], raw),))
+    if not any(choices is None or len(choices) > 1 for choices in segments):
+        raise ValueError(f"pattern has no fields to expand: {raw!r}")
+    return Pattern(template=raw, segments=tuple(segments))
+
+
+def load_pattern_set(spec: str) -> tuple[str, list[str]]:
+    """Parse a `NAME=PATH` spec and load the file's entries (one per line, '#' comments)."""
+    name, sep, path = str(spec).partition("=")
+    name = name.strip().lower()
+    if not sep or not path.strip():
+        raise ValueError(f"invalid pattern set {spec!r} (expected NAME=PATH)")
+    if not _SET_NAME_RE.fullmatch(name) or name == "word":
+        raise ValueError(f"invalid pattern set name: {name!r}")
+    with open_text(Path(path.strip())) as fh:
+        values = list(dict.fromkeys(entry.lower() for entry in _iter_entries(fh)))
+    if not values:
+        raise ValueError(f"pattern set {name!r} is empty")
+    return name, values
+
+
+def count_expansions(patterns: Sequence[Pattern], word_count: int) -> int:
+    """Exact number of labels `expand_patterns` produces (before validation) for `word_count`."""
+    total = word_count
+    for pattern in patterns:
+        total += pattern.combinations * (word_count if pattern.uses_word else 1)
+    return total
+
+
+def expand_patterns(
+    words: Iterable[str],
+    patterns: Sequence[Pattern],
+    *,
+    on_invalid: Callable[[int], None] | None = None,
+) -> Iterator[str]:
+    """
+    Stream `words` with every pattern expanded in line, one wordlist pass in total.
+
+    Each word is followed by its expansions; patterns without `{word}` are expanded once after
+    the last word. Expansions are normalized like wordlist labels, and ones that cannot be
+    valid labels (e.g. a part longer than 63 characters) are dropped and reported to
+    `on_invalid`. Duplicates are left to the candidate stream's de-duplication.
+    """
+    per_word = [pattern for pattern in patterns if pattern.uses_word]
+    static = [pattern for pattern in patterns if not pattern.uses_word]
+    for word in words:
+        yield word
+        for pattern in per_word:
+            yield from _valid(pattern.expand(word), on_invalid)
+    for pattern in static:
+        yield from _valid(pattern.expand(None), on_invalid)
+
+
+def _valid(labels: Iterator[str], on_invalid: Callable[[int], None] | None) -> Iterator[str]:
+    while batch := list(itertools.islice(labels, _EXPAND_BATCH)):
+        valid = normalize_labels(batch, skip_invalid=True)
+        if on_invalid is not None and len(valid) < len(batch):
+            on_invalid(len(batch) - len(valid))
+        yield from valid
+
+
+def _literal(text: str, template: str) -> str:
+    if not re.fullmatch(r"[A-Za-z0-9.-]+", text):
+        raise ValueError(f"invalid literal {text!r} in pattern {template!r}")
+    return text.lower()
+
+
+def _field(
+    body: str, template: str, sets: Mapping[str, Sequence[str]]
+) -> tuple[str, ...] | NumberRange | None:
+    if body == "word":
+        return None
+    range_match = _RANGE_RE.fullmatch(body)
+    if range_match:
+        lo_raw, hi_raw = range_match.groups()
+        lo, hi = int(lo_raw), int(hi_raw)
+        if lo > hi:
+            raise ValueError(f"empty range {{{body}}} in pattern {template!r}")
+        width = len(lo_raw) if lo_raw.startswith("0") and len(lo_raw) > 1 else 0
+        return NumberRange(lo, hi, width)
+    if "|" in body:
+        choices = tuple(dict.fromkeys(choice.strip().lower() for choice in body.split("|")))
+        for choice in choices:
+            if choice:
+                _literal(choice, template)
+        return choices
+    name = body.lower()
+    if name in sets:
+        return tuple(sets[name])
+    raise ValueError(f"unknown field {{{body}}} in pattern {template!r}")
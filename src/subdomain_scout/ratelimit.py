@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+
+# Key used for queries that go through the system resolver (getaddrinfo).
+SYSTEM_RESOLVER = "system"
+
+
+def resolver_key(nameserver: tuple[str, int]) -> str:
+    host, port = nameserver
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+
+class RateLimiter:
+    """
+    Thread-safe query pacer with a total and a per-resolver queries-per-second cap.
+
+    Each query reserves the next free send slot, so queries are spaced evenly (a token bucket
+    with a burst of one) instead of being released in bursts. Without caps it only counts.
+    """
+
+    def __init__(
+        self, *, rate: float | None = None, per_resolver_rate: float | None = None
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be > 0")
+        if per_resolver_rate is not None and per_resolver_rate <= 0:
+            raise ValueError("per_resolver_rate must be > 0")
+        self.rate = rate
+        self.per_resolver_rate = per_resolver_rate
+        self._interval = 0.0 if rate is None else 1.0 / rate
+        self._per_resolver_interval = 0.0 if per_resolver_rate is None else 1.0 / per_resolver_rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._next_slot_by_resolver: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+        self._total = 0
+        self._delayed = 0
+
+    def acquire(self, resolver: str) -> None:
+        """Block until a query to `resolver` may be sent, and count it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = now
+            if self._interval:
+                slot = max(slot, self._next_slot)
+            if self._per_resolver_interval:
+                slot = max(slot, self._next_slot_by_resolver.get(resolver, now))
+                self._next_slot_by_resolver[resolver] = slot + self._per_resolver_interval
+            if self._interval:
+                self._next_slot = slot + self._interval
+            self._counts[resolver] = self._counts.get(resolver, 0) + 1
+            self._total += 1
+            delay = slot - now
+            if delay > 0:
+                self._delayed += 1
+        if delay > 0:
+            time.sleep(delay)
+
+    def total(self) -> int:
+        """Queries counted so far, over all resolvers."""
+        with self._lock:
+            return self._total
+
+    def snapshot(self) -> tuple[dict[str, int], int]:
+        """Return (queries per resolver, queries that had to wait for a slot)."""
+        with self._lock:
+            return dict(self._counts), self._delayed
+
+    def merge(self, counts: dict[str, int], delayed: int) -> None:
+        """Fold in counts recorded by another limiter (a worker process or remote node)."""
+        with self._lock:
+            for resolver, count in counts.items():
+                self._counts[resolver] = self._counts.get(resolver, 0) + count
+                self._total += count
+            self._delayed += delayed
@@ -1,23 +1,60 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
 import contextlib
-import itertools
 import json
 import hashlib
+import heapq
+import itertools
+import logging
 import re
 import secrets
 import socket
 import sys
+import threading
 import time
 import urllib.error
 import urllib.request
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, replace
+import zlib
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Callable, Iterable, Iterator, TextIO
-
-from .dns_client import DnsQueryError, resolve_host_details
-from .validation import normalize_label
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence, TextIO, TypeVar
+
+from .dedupe import DEFAULT_MEMORY_LIMIT, MIN_MEMORY_LIMIT, FingerprintSet
+from .dns_client import (
+    DeadlineExceeded,
+    DnsQueryError,
+    parse_record_type,
+    resolve_host_details,
+    resolve_records,
+)
+from .ratelimit import SYSTEM_RESOLVER, RateLimiter
+from .sources import SourceAddresses
+from .model import LabelModel, generate_labels
+from .mutations import DEFAULT_MUTATION_BUDGET, mutate_label
+from .validation import normalize_domain, normalize_domains, normalize_labels
+from .patterns import count_expansions, expand_patterns, parse_pattern
+from .wordlist import (
+    _count_labels,
+    _iter_entries,
+    _iter_labels,
+    _iter_labels_lines,
+    _iter_normalized,
+)
+
+_log = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
 @dataclass(frozen=True)
@@ -37,6 +74,10 @@ class Result:
     ttl_min: int | None = None
     ttl_max: int | None = None
     takeover: dict[str, Any] | None = None
+    records: dict[str, list[str]] | None = None
+    # The name exists but has no address records (NOERROR/NODATA, custom resolver mode), e.g.
+    # an empty non-terminal above other names; not part of the serialized record.
+    nodata: bool = False
 
     def to_dict(self) -> dict[str, Any]:
         payload: dict[str, Any] = {
@@ -65,6 +106,8 @@ class Result:
             payload["ttl_max"] = self.ttl_max
         if self.takeover is not None:
             payload["takeover"] = self.takeover
+        if self.records is not None:
+            payload["records"] = self.records
         return payload
 
 
@@ -74,16 +117,36 @@ def _resolve(
     timeout: float,
     nameservers: list[tuple[str, int]] | None,
     include_cname: bool,
+    limiter: RateLimiter | None = None,
+    deadline: float | None = None,
+    sweep: bool = False,
+    harvest: list[str] | None = None,
+    sources: SourceAddresses | None = None,
 ) -> Result:
     start = time.time()
     try:
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded("per-name deadline exceeded")
         if nameservers is None:
+            if limiter is not None:
+                limiter.acquire(SYSTEM_RESOLVER)
             infos = socket.getaddrinfo(name, None)
             ips = [info[4][0] for info in infos]
             ips = list(dict.fromkeys(ips))
             return Result(subdomain=name, ips=ips, status="resolved", elapsed_ms=_ms(start))
         else:
-            details = resolve_host_details(name, nameservers=nameservers, timeout=timeout)
+            # With the sweep, most candidates (NXDOMAIN) are settled by their A query alone, and
+            # that same A answer is reused for names that exist.
+            details = resolve_host_details(
+                name,
+                nameservers=nameservers,
+                timeout=timeout,
+                limiter=limiter,
+                deadline=deadline,
+                harvest=harvest,
+                sources=sources,
+                sweep=sweep,
+            )
             if not details.ips:
                 status = "cname" if include_cname and details.cnames else "not_found"
                 return Result(
@@ -91,6 +154,7 @@ def _resolve(
                     ips=[],
                     status=status,
                     elapsed_ms=_ms(start),
+                    nodata=not details.nxdomain,
                     cnames=details.cnames if include_cname and details.cnames else None,
                     canonical_target=details.canonical_target,
                     dns_record_types=details.record_types or None,
@@ -125,6 +189,16 @@ def _resolve(
             error_type="gaierror",
             error_code=e.errno,
         )
+    except DeadlineExceeded as e:
+        return Result(
+            subdomain=name,
+            ips=[],
+            status="error",
+            elapsed_ms=_ms(start),
+            error=str(e),
+            error_type="deadline_exceeded",
+            error_code=None,
+        )
     except TimeoutError as e:
         return Result(
             subdomain=name,
@@ -170,41 +244,119 @@ def _is_retryable(res: Result) -> bool:
     return False
 
 
-def _resolve_with_retries(
-    name: str,
-    *,
-    timeout: float,
-    nameservers: list[tuple[str, int]] | None,
-    include_cname: bool,
-    retries: int,
-    retry_backoff_ms: int,
-) -> Result:
-    if retries < 0:
-        raise ValueError("retries must be >= 0")
-    if retry_backoff_ms < 0:
-        raise ValueError("retry_backoff_ms must be >= 0")
+# Upper bound for the `--concurrency auto` window (and its thread pool).
+_AUTO_CONCURRENCY_MAX = 512
+# DNS rcodes that signal an overloaded or rate-limiting resolver.
+_CONGESTION_RCODES = {2, 5}  # SERVFAIL, REFUSED
 
-    attempt = 0
-    while True:
-        res = _resolve(
-            name,
-            timeout=timeout,
-            nameservers=nameservers,
-            include_cname=include_cname,
-        )
-        attempts = attempt + 1
-        # Always reflect retry metadata in the emitted record for observability.
-        if res.status != "error" or (not _is_retryable(res)) or attempt >= retries:
-            return replace(res, attempts=attempts, retries=attempt)
-        if retry_backoff_ms:
-            time.sleep((retry_backoff_ms * (2**attempt)) / 1000.0)
-        attempt += 1
+
+class _ConcurrencyController:
+    """
+    AIMD controller for the in-flight window behind `--concurrency auto`.
+
+    The window doubles every round (one window's worth of results) until the first sign of
+    congestion, then grows by one per clean round. Timeouts or SERVFAIL/REFUSED (on any attempt,
+    including ones that are retried later) or a round latency far above the best seen so far
+    halve it immediately.
+    """
+
+    def __init__(self, *, initial: int, maximum: int = _AUTO_CONCURRENCY_MAX) -> None:
+        self.maximum = maximum
+        self.window = max(1, min(initial, maximum))
+        self.history: list[tuple[int, int]] = []
+        self._start = time.time()
+        self._slow_start = True
+        self._round_done = 0
+        self._round_bad = 0
+        self._round_elapsed_ms = 0
+        self._best_latency_ms: float | None = None
+        self._record()
+
+    def observe(self, res: Result) -> None:
+        self._round_done += 1
+        self._round_elapsed_ms += res.elapsed_ms
+        if _is_congestion(res):
+            self._round_bad += 1
+            # Back off as soon as a few percent of the round went bad; do not wait it out.
+            if self._round_bad > max(1, self.window // 20):
+                self._decrease()
+                return
+        if self._round_done < self.window:
+            return
+        latency = self._round_elapsed_ms / self._round_done
+        best = self._best_latency_ms
+        if best is not None and latency > max(3 * best, best + 50):
+            self._decrease()
+            return
+        self._best_latency_ms = latency if best is None else min(best, latency)
+        grown = self.window * 2 if self._slow_start else self.window + 1
+        self._set(min(self.maximum, grown))
+
+    def follow(self, window: int) -> None:
+        """Mirror a window chosen elsewhere (by a worker process or node) for reporting."""
+        self._set(window)
+
+    def _decrease(self) -> None:
+        self._slow_start = False
+        self._set(max(1, self.window // 2))
+
+    def _set(self, window: int) -> None:
+        self._round_done = 0
+        self._round_bad = 0
+        self._round_elapsed_ms = 0
+        if window != self.window:
+            self.window = window
+            self._record()
+
+    def _record(self) -> None:
+        # Keep at most one entry per second (the latest window wins) so long scans stay small.
+        elapsed_ms = _ms(self._start)
+        if self.history and elapsed_ms - self.history[-1][0] < 1000 and len(self.history) > 1:
+            self.history[-1] = (self.history[-1][0], self.window)
+        else:
+            self.history.append((elapsed_ms, self.window))
+
+
+def _is_congestion(res: Result) -> bool:
+    if res.status != "error":
+        return False
+    if res.error_type == "dns":
+        return res.error_code in _CONGESTION_RCODES
+    return _is_retryable(res)
+
+
+def _retry_delay_s(retry_backoff_ms: int, attempt: int) -> float:
+    """Exponential backoff before re-dispatching attempt `attempt + 1` (0-based)."""
+    return retry_backoff_ms * (2.0**attempt) / 1000.0
+
+
+def _rotate_nameservers(
+    nameservers: list[tuple[str, int]] | None, attempt: int
+) -> list[tuple[str, int]] | None:
+    """Start each retry at the next resolver so it does not hit the one that just failed."""
+    if not nameservers or attempt == 0:
+        return nameservers
+    offset = attempt % len(nameservers)
+    return nameservers[offset:] + nameservers[:offset]
 
 
 def _ms(start: float) -> int:
     return int((time.time() - start) * 1000)
 
 
+@dataclass(frozen=True)
+class DomainSummary:
+    domain: str
+    attempted: int
+    written: int
+    resolved: int
+    wildcard: int
+    cname: int
+    not_found: int
+    error: int
+    labels_skipped_existing: int
+
+
 @dataclass(frozen=True)
 class ScanSummary:
     attempted: int
@@ -222,27 +374,492 @@ class ScanSummary:
     takeover_checked: int
     takeover_suspected: int
     elapsed_ms: int
+    domains: tuple[DomainSummary, ...] = ()
+    shard: str | None = None
+    labels_other_shard: int = 0
+    queries: int = 0
+    queries_delayed: int = 0
+    resolver_queries: tuple[tuple[str, int], ...] = ()
+    rate_limit: float | None = None
+    rate_limit_per_resolver: float | None = None
+    concurrency_auto: bool = False
+    concurrency_window: int = 0
+    # (elapsed_ms, window) samples for `--concurrency auto`.
+    concurrency_history: tuple[tuple[int, int], ...] = ()
+    # Where resolution ran: threads, processes, interpreters or remote (chunk dispatcher).
+    executor: str = "threads"
+    harvest: bool = False
+    # New in-scope names found in authority/additional sections and CNAME targets (`--harvest`).
+    labels_harvested: int = 0
+    # (source address, queries, errors) per `--bind` address.
+    source_queries: tuple[tuple[str, int, int], ...] = ()
+    mutate: bool = False
+    # Permutations of resolved names queued behind the input (`--mutate`).
+    labels_mutated: int = 0
+    # `--recursive` depth; discovered names scanned as zones, and names queued under them.
+    recursive: int = 0
+    zones_recursive: int = 0
+    labels_recursive: int = 0
+    # Candidates skipped because a name above them returned NXDOMAIN (RFC 8020).
+    labels_pruned: int = 0
+    query_budget: int | None = None
+    query_budget_exhausted: bool = False
+    # Labels the input will produce, counted up front (`--pattern` with a wordlist file).
+    labels_planned: int | None = None
+    # `--pattern` expansions dropped because they cannot be valid labels.
+    labels_invalid: int = 0
+    # Labels generated from a trained label model (`--generate`), scanned before the wordlist.
+    labels_generated: int = 0
+    # Historically frequent labels scanned ahead of the wordlist (`--label-stats`).
+    labels_prioritized: int = 0
+
+
+@dataclass
+class _Tally:
+    attempted: int = 0
+    written: int = 0
+    resolved: int = 0
+    wildcard: int = 0
+    cname: int = 0
+    not_found: int = 0
+    error: int = 0
+
+    def count(self, status: str) -> None:
+        self.attempted += 1
+        if status == "resolved":
+            self.resolved += 1
+        elif status == "wildcard":
+            self.wildcard += 1
+        elif status == "cname":
+            self.cname += 1
+        elif status == "not_found":
+            self.not_found += 1
+        else:
+            self.error += 1
+
+
+@dataclass
+class _LabelStats:
+    total: int = 0
+    unique: int = 0
+    deduped: int = 0
+    skipped_existing: int = 0
+    skipped_by_domain: dict[str, int] = field(default_factory=dict)
+    other_shard: int = 0
+    planned: int | None = None
+    invalid: int = 0
+    generated: int = 0
+    prioritized: int = 0
+
+    def skip_existing(self, domain: str) -> None:
+        self.skipped_existing += 1
+        self.skipped_by_domain[domain] = self.skipped_by_domain.get(domain, 0) + 1
+
+
+def _round_robin(iterables: Iterable[Iterable[_T]]) -> Iterator[_T]:
+    iterators = [iter(it) for it in iterables]
+    while iterators:
+        alive: list[Iterator[_T]] = []
+        for it in iterators:
+            try:
+                item = next(it)
+            except StopIteration:
+                continue
+            alive.append(it)
+            yield item
+        iterators = alive
 
 
-def _iter_labels_lines(lines: Iterable[str]) -> Iterable[str]:
-    for raw_line in lines:
-        line = raw_line.strip()
-        if not line or line.startswith("#"):
-            continue
-        label = line.split(maxsplit=1)[0].strip(".")
-        if not label or label.startswith("#"):
-            continue
-        yield normalize_label(label)
+def _shard_index(name: str, count: int) -> int:
+    # crc32 is stable across runs, platforms and Python versions (unlike hash()).
+    return zlib.crc32(name.encode("utf-8")) % count
 
 
-def _iter_labels(wordlist: Path) -> Iterable[str]:
-    with wordlist.open("r", encoding="utf-8") as fh:
-        yield from _iter_labels_lines(fh)
+def _in_shard(name: str, shard: tuple[int, int] | None) -> bool:
+    if shard is None:
+        return True
+    index, count = shard
+    return _shard_index(name, count) == index - 1
 
 
-def _iter_fqdns(domain: str, labels: Iterable[str]) -> Iterable[str]:
-    for label in labels:
-        yield f"{label}.{domain}"
+def _iter_domain_candidates(
+    domains: Sequence[str],
+    labels: Iterable[str],
+    *,
+    extra_labels: Mapping[str, Iterable[str]] | None,
+    resume_seen: FingerprintSet | None,
+    stats: _LabelStats,
+    shard: tuple[int, int] | None = None,
+    dedupe_memory: int | None = None,
+) -> Iterator[tuple[str, str]]:
+    """
+    Yield unique (domain, label) pairs, CT labels first, then label-major across domains.
+
+    Extra (CT) labels name hosts that existed, so they resolve far more often than wordlist
+    guesses and are scanned before anything else, round-robin over their domains. Shared labels
+    are interleaved across domains per label, spreading consecutive queries over every target
+    zone, so no single authoritative server receives a burst while the wordlist is read only
+    once. A shared label is skipped for domains its CT label already covered; counts match a
+    wordlist-first order (the CT entry is the one reported as a duplicate).
+    """
+    seen_labels = _dedupe_set(dedupe_memory)
+    # Extra labels are per-domain, so they are de-duplicated per (domain, label) pair.
+    seen_extra: set[tuple[str, str]] = set()
+    extra_labels_seen: set[str] = set()
+
+    def is_skipped(domain: str, label: str) -> bool:
+        host = f"{label}.{domain}"
+        if not _in_shard(host, shard):
+            stats.other_shard += 1
+            return True
+        if resume_seen is None or host not in resume_seen:
+            return False
+        stats.skip_existing(domain)
+        return True
+
+    try:
+        if extra_labels:
+            per_domain = (
+                ((domain, label) for label in extra_labels.get(domain, ()))
+                for domain in domains
+                if domain in extra_labels
+            )
+            for domain, label in _round_robin(per_domain):
+                stats.total += 1
+                if (domain, label) in seen_extra:
+                    stats.deduped += 1
+                    continue
+                seen_extra.add((domain, label))
+                extra_labels_seen.add(label)
+                stats.unique += 1
+                if not is_skipped(domain, label):
+                    yield domain, label
+
+        for label in labels:
+            stats.total += 1
+            if not seen_labels.add(label):
+                stats.deduped += 1
+                continue
+            stats.unique += 1
+            for domain in domains:
+                if label in extra_labels_seen and (domain, label) in seen_extra:
+                    stats.unique -= 1
+                    stats.deduped += 1
+                elif not is_skipped(domain, label):
+                    yield domain, label
+    finally:
+        seen_labels.close()
+
+
+def _iter_host_candidates(
+    lines: Iterable[str],
+    *,
+    resume_seen: FingerprintSet | None,
+    stats: _LabelStats,
+    shard: tuple[int, int] | None = None,
+    dedupe_memory: int | None = None,
+) -> Iterator[tuple[str, str]]:
+    """
+    Yield unique (zone, label) pairs from fully qualified hostnames.
+
+    Each host is split at its first dot, so wildcard and resume state are grouped by the
+    immediate parent zone, matching how wildcard probing already works for nested labels.
+    """
+    seen_hosts = _dedupe_set(dedupe_memory)
+    try:
+        for host in _iter_normalized(_iter_entries(lines), normalize_domains, normalize_domain):
+            stats.total += 1
+            if not seen_hosts.add(host):
+                stats.deduped += 1
+                continue
+            stats.unique += 1
+            if not _in_shard(host, shard):
+                stats.other_shard += 1
+                continue
+            label, zone = host.split(".", 1)
+            if resume_seen is not None and host in resume_seen:
+                stats.skip_existing(zone)
+                continue
+            yield zone, label
+    finally:
+        seen_hosts.close()
+
+
+# Longest hostname `--recursive` builds (RFC 1035, in presentation form without the root dot).
+_MAX_NAME_LENGTH = 253
+
+
+def _dedupe_set(memory_limit: int | None) -> FingerprintSet:
+    return FingerprintSet(
+        memory_limit=DEFAULT_MEMORY_LIMIT if memory_limit is None else memory_limit
+    )
+
+
+def _dedupe_share(
+    dedupe_memory: int | None,
+    *,
+    resume: bool,
+    harvest: bool,
+    mutate: bool,
+    recursive: int,
+    query_budget: int | None,
+    nameservers: list[tuple[str, int]] | None,
+) -> int:
+    """
+    Split `dedupe_memory` evenly over the indexes a scan keeps, so it caps their total.
+
+    Candidates always have one; `resume` adds the recorded names, a `_Feed` its handed-out
+    names, and NXDOMAIN pruning (`--recursive` with a custom resolver) the pruned names.
+    No share drops below the smallest ceiling an index accepts.
+    """
+    total = DEFAULT_MEMORY_LIMIT if dedupe_memory is None else dedupe_memory
+    feed = harvest or mutate or bool(recursive) or query_budget is not None
+    prune = bool(recursive) and nameservers is not None
+    return max(MIN_MEMORY_LIMIT, total // (1 + resume + feed + prune))
+
+
+class _Feed(Iterator[tuple[str, str]]):
+    """
+    Candidate feed that grows from scan results (`--harvest`, `--recursive`, `--mutate`).
+
+    Upstream candidates pass through in order; harvested names inside the zone that produced
+    them, not seen before and in this node's shard, are queued and handed out first. Once
+    upstream runs dry, names that exist (including ones without addresses, such as empty
+    non-terminals) become zones for `recursive_labels`, up to `recursive_depth` levels below
+    the targets; a zone is dropped as soon as one of its names is flagged as a wildcard.
+    Mutations of resolved names come last, each generated lazily when the scan has room for
+    it, until `mutate_budget` names have been handed out.
+
+    With `prune`, names below one that returned NXDOMAIN are skipped: nothing exists beneath a
+    nonexistent name (RFC 8020). Once `exhausted()` is true (`--query-budget`) the feed hands
+    out nothing more. Unlike a generator it can be polled again after running dry, so names
+    found from the last in-flight responses still reach the scan. Every name is handed out at
+    most once.
+
+    Polling, `offer` and `observe` share one lock: with `--listen`, coordinator threads pull
+    chunks while the scan thread feeds results back.
+    """
+
+    def __init__(
+        self,
+        candidates: Iterable[tuple[str, str]],
+        *,
+        shard: tuple[int, int] | None,
+        dedupe_memory: int | None = None,
+        mutate_budget: int = 0,
+        recursive_depth: int = 0,
+        recursive_labels: Sequence[str] = (),
+        prune: bool = False,
+        exhausted: Callable[[], bool] | None = None,
+    ) -> None:
+        self._source = iter(candidates)
+        self._source_done = False
+        self._shard = shard
+        self._queue: collections.deque[tuple[str, str]] = collections.deque()
+        self._recursion: collections.deque[tuple[str, Iterator[str]]] = collections.deque()
+        self._mutations: collections.deque[tuple[str, Iterator[str]]] = collections.deque()
+        self._mutate_budget = mutate_budget
+        self._recursive_depth = recursive_depth
+        self._recursive_labels = recursive_labels
+        # Depth of every zone queued for recursion; targets are depth 0.
+        self._zones: dict[str, int] = {}
+        self._wildcard_zones: set[str] = set()
+        self._exhausted = exhausted
+        self._seen = _dedupe_set(dedupe_memory)
+        self._nxdomain = _dedupe_set(dedupe_memory) if prune else None
+        self.added = 0
+        self.mutated = 0
+        self.recursed = 0
+        self.pruned = 0
+        self.budget_exhausted = False
+        self._lock = threading.Lock()
+
+    @property
+    def zones(self) -> int:
+        return len(self._zones)
+
+    def __next__(self) -> tuple[str, str]:
+        with self._lock:
+            return self._next()
+
+    def _next(self) -> tuple[str, str]:
+        if self._exhausted is not None and self._exhausted():
+            self.budget_exhausted = True
+            self._recursion.clear()
+            self._mutations.clear()
+            raise StopIteration
+        if self._queue:
+            return self._queue.popleft()
+        while not self._source_done:
+            try:
+                domain, label = next(self._source)
+            except StopIteration:
+                self._source_done = True
+                break
+            if not self._seen.add(f"{label}.{domain}"):
+                continue
+            if self._is_pruned(domain, label):
+                self.pruned += 1
+                continue
+            return domain, label
+        while self._recursion:
+            zone, words = self._recursion[0]
+            word = None if zone in self._wildcard_zones else next(words, None)
+            if word is None:
+                self._recursion.popleft()
+                continue
+            name = f"{word}.{zone}"
+            if len(name) > _MAX_NAME_LENGTH or not _in_shard(name, self._shard):
+                continue
+            if not self._seen.add(name):
+                continue
+            if self._is_pruned(zone, word):
+                self.pruned += 1
+                continue
+            self.recursed += 1
+            return zone, word
+        while self._mutations and self.mutated < self._mutate_budget:
+            domain, variants = self._mutations[0]
+            variant = next(variants, None)
+            if variant is None:
+                self._mutations.popleft()
+                continue
+            if not normalize_labels([variant], skip_invalid=True):
+                continue
+            name = f"{variant}.{domain}"
+            if not _in_shard(name, self._shard) or not self._seen.add(name):
+                continue
+            self.mutated += 1
+            return domain, variant
+        self._mutations.clear()
+        raise StopIteration
+
+    def offer(self, domain: str, names: Iterable[str]) -> None:
+        suffix = f".{domain}"
+        in_scope = [name for name in names if name.endswith(suffix)]
+        normalized = normalize_domains(in_scope, skip_invalid=True)
+        with self._lock:
+            for name in normalized:
+                if not name.endswith(suffix) or not self._seen.add(name):
+                    continue
+                if not _in_shard(name, self._shard):
+                    continue
+                self._queue.append((domain, name[: -len(suffix)]))
+                self.added += 1
+
+    def observe(self, domain: str, label: str, status: str, nodata: bool) -> None:
+        """Grow the feed from one scan result."""
+        name = f"{label}.{domain}"
+        with self._lock:
+            if status == "wildcard":
+                # A wildcard directly under a recursion zone would answer every remaining word.
+                if "." not in label and domain in self._zones:
+                    self._wildcard_zones.add(domain)
+                return
+            if status not in ("resolved", "cname") and not nodata:
+                if status == "not_found" and self._nxdomain is not None:
+                    self._nxdomain.add(name)
+                return
+            depth = self._zones.get(domain, 0) + 1
+            if depth <= self._recursive_depth and name not in self._zones:
+                self._zones[name] = depth
+                self._recursion.append((name, iter(self._recursive_labels)))
+            if status != "not_found" and self.mutated < self._mutate_budget:
+                self._mutations.append((domain, mutate_label(label)))
+
+    def _is_pruned(self, zone: str, label: str) -> bool:
+        if self._nxdomain is None or "." not in label:
+            return False
+        parts = label.split(".")
+        return any(
+            f"{'.'.join(parts[index:])}.{zone}" in self._nxdomain for index in range(1, len(parts))
+        )
+
+    def close(self) -> None:
+        self._seen.close()
+        if self._nxdomain is not None:
+            self._nxdomain.close()
+
+
+def _iter_results(
+    executor: Executor | None,
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    *,
+    window: int | Callable[[], int],
+    retry: Callable[[_R], tuple[float, _T] | None] | None = None,
+) -> Iterator[_R]:
+    """
+    Run `fn` over `items` keeping at most `window` calls in flight.
+
+    Unlike `Executor.map`, this never drains the whole input up front, and results are yielded
+    as they complete so one slow name cannot hold back the rest of the window. `window` may be
+    a callable, re-read before each refill, so a controller can resize it mid-stream.
+
+    `retry` sees every result first; returning `(delay_s, item)` parks `item` on a delay queue
+    instead of yielding the result. Parked items are re-dispatched ahead of fresh input once
+    their delay has passed, so waiting never occupies a slot in the window.
+
+    `items` is polled again after running dry, so a feed that the caller grows from the yielded
+    results (`_Feed`) keeps flowing until nothing is in flight.
+    """
+    window_size = window if callable(window) else (lambda: window)
+    it = iter(items)
+    delayed: list[tuple[float, int, _T]] = []
+    sequence = itertools.count()
+
+    def next_item() -> tuple[_T] | None:
+        if delayed and delayed[0][0] <= time.monotonic():
+            return (heapq.heappop(delayed)[2],)
+        try:
+            return (next(it),)
+        except StopIteration:
+            return None
+
+    def settle(result: _R) -> bool:
+        again = None if retry is None else retry(result)
+        if again is None:
+            return True
+        delay_s, item = again
+        heapq.heappush(delayed, (time.monotonic() + delay_s, next(sequence), item))
+        return False
+
+    def wait_for_delayed() -> None:
+        time.sleep(max(0.0, delayed[0][0] - time.monotonic()))
+
+    if executor is None:
+        while True:
+            picked = next_item()
+            if picked is None:
+                if not delayed:
+                    return
+                wait_for_delayed()
+                continue
+            result = fn(picked[0])
+            if settle(result):
+                yield result
+
+    pending: set[Future[_R]] = set()
+    while True:
+        while len(pending) < window_size():
+            picked = next_item()
+            if picked is None:
+                break
+            pending.add(executor.submit(fn, picked[0]))
+        if not pending:
+            if not delayed:
+                return
+            wait_for_delayed()
+            continue
+        timeout = None
+        if delayed and len(pending) < window_size():
+            # Wake up for a parked retry only when there is a free slot to dispatch it into.
+            timeout = max(0.0, delayed[0][0] - time.monotonic())
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for fut in done:
+            result = fut.result()
+            if settle(result):
+                yield result
 
 
 @contextlib.contextmanager
@@ -267,10 +884,452 @@ def scan_domains(domain: str, wordlist: Path, out_path: Path, timeout: float) ->
     return 0
 
 
+class _Classifier:
+    """
+    Post-resolution classification: wildcard matching and takeover checks.
+
+    Holds the per-zone wildcard caches, so one instance is shared by everything that feeds a
+    single output stream (or one per worker process). It is only called from the thread that
+    consumes results, never from resolver threads, so its caches and counters need no locks.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        nameservers: list[tuple[str, int]] | None,
+        detect_wildcard: bool,
+        wildcard_probes: int,
+        wildcard_threshold: int,
+        wildcard_verify_http: bool,
+        wildcard_http_timeout: float,
+        takeover_checker: Callable[[str], dict[str, Any] | None] | None,
+        limiter: RateLimiter | None = None,
+        sources: SourceAddresses | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.nameservers = nameservers
+        self.detect_wildcard = detect_wildcard
+        self.wildcard_probes = wildcard_probes
+        self.wildcard_threshold = wildcard_threshold
+        self.wildcard_verify_http = wildcard_verify_http
+        self.wildcard_http_timeout = wildcard_http_timeout
+        self.takeover_checker = takeover_checker
+        self.limiter = limiter
+        self.sources = sources
+        self.takeover_checked = 0
+        self.takeover_suspected = 0
+        self._wildcard_cache: dict[str, set[frozenset[str]]] = {}
+        self._wildcard_ipset_hit_counts: dict[tuple[str, frozenset[str]], int] = {}
+        self._wildcard_http_cache: dict[str, dict[str, tuple[int, str]]] = {}
+
+    def _wildcard_ipsets_for_zone(self, zone: str) -> set[frozenset[str]]:
+        cached = self._wildcard_cache.get(zone)
+        if cached is not None:
+            return cached
+        hits = _detect_wildcard_ipsets(
+            zone,
+            probes=self.wildcard_probes,
+            timeout=self.timeout,
+            nameservers=self.nameservers,
+            limiter=self.limiter,
+            sources=self.sources,
+        )
+        ipsets = {ipset for ipset, count in hits.items() if count >= 2}
+        self._wildcard_cache[zone] = ipsets
+        return ipsets
+
+    def _wildcard_http_sigs_for_zone(self, zone: str) -> dict[str, tuple[int, str]]:
+        cached = self._wildcard_http_cache.get(zone)
+        if cached is not None:
+            return cached
+        # Use a random label; this should hit the wildcard behavior if present.
+        label = f"_sdscout-{secrets.token_hex(8)}"
+        host = f"{label}.{zone}"
+        sigs = _http_signatures_for_host(host, timeout=self.wildcard_http_timeout)
+        self._wildcard_http_cache[zone] = sigs
+        return sigs
+
+    def classify(self, res: Result) -> Result:
+        if self.detect_wildcard and res.status == "resolved" and res.ips:
+            # Handle multi-level wildcards by probing the immediate suffix of the hostname.
+            # Example: for "foo.dev.example.com", probe "*.dev.example.com".
+            parts = res.subdomain.split(".", 1)
+            if len(parts) == 2:
+                zone = parts[1]
+                ipsets = self._wildcard_ipsets_for_zone(zone)
+                if ipsets:
+                    ipset = frozenset(res.ips)
+                    if ipset in ipsets:
+                        key = (zone, ipset)
+                        self._wildcard_ipset_hit_counts[key] = (
+                            self._wildcard_ipset_hit_counts.get(key, 0) + 1
+                        )
+                        if self._wildcard_ipset_hit_counts[key] >= self.wildcard_threshold:
+                            candidate = replace(res, status="wildcard")
+
+                            if self.wildcard_verify_http:
+                                baseline = self._wildcard_http_sigs_for_zone(zone)
+                                candidate_sigs = _http_signatures_for_host(
+                                    res.subdomain,
+                                    timeout=self.wildcard_http_timeout,
+                                )
+                                if baseline and candidate_sigs:
+                                    if not _http_signatures_match(baseline, candidate_sigs):
+                                        # DNS IP-set overlap can happen on CDNs; if HTTP content differs
+                                        # from a random wildcard probe, treat it as a real resolved host.
+                                        candidate = replace(candidate, status="resolved")
+
+                            res = candidate
+
+        if self.takeover_checker is not None and res.status in {"resolved", "wildcard"}:
+            self.takeover_checked += 1
+            try:
+                takeover = self.takeover_checker(res.subdomain)
+            except OSError:
+                takeover = None
+            if takeover is not None:
+                self.takeover_suspected += 1
+                res = replace(res, takeover=takeover)
+        return res
+
+
+@dataclass(frozen=True)
+class _WorkerConfig:
+    timeout: float
+    concurrency: int
+    statuses: set[str] | None
+    detect_wildcard: bool
+    wildcard_probes: int
+    wildcard_threshold: int
+    wildcard_verify_http: bool
+    wildcard_http_timeout: float
+    include_cname: bool
+    retries: int
+    retry_backoff_ms: int
+    takeover_checker: Callable[[str], dict[str, Any] | None] | None
+    nameservers: list[tuple[str, int]] | None
+    rate: float | None
+    rate_per_resolver: float | None
+    adaptive_concurrency: bool
+    deadline: float | None
+    sweep: bool
+    record_types: tuple[int, ...] = ()
+    harvest: bool = False
+    # Local source addresses (`--bind`); node-specific, so never shipped to remote workers.
+    bind: tuple[str, ...] = ()
+
+
+# `--record-types`: resolved names per pipelined pass, and questions in flight within one pass.
+_RECORD_BATCH_SIZE = 256
+_RECORD_PIPELINE_WINDOW = 64
+
+# (domain, label, attempt, per-name deadline) for one resolution attempt.
+_Attempt = tuple[str, str, int, float | None]
+
+# (domain, label, status, serialized record or None when filtered out by --status, hostnames
+# harvested from the responses for `--harvest`, whether the name exists without addresses)
+_Outcome = tuple[str, str, str, str | None, tuple[str, ...], bool]
+
+
+@dataclass(frozen=True)
+class _ChunkResult:
+    outcomes: list[_Outcome]
+    takeover_checked: int
+    takeover_suspected: int
+    queries: dict[str, int]
+    queries_delayed: int
+    # Worker's adaptive window after the chunk (0 with a fixed --concurrency).
+    concurrency_window: int
+    # {source address: (queries, errors)} for `--bind`.
+    source_counts: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+# Runs candidates elsewhere (worker processes, remote workers) and streams back chunk results.
+ChunkDispatcher = Callable[[Iterable[tuple[str, str]], _WorkerConfig], Iterator[_ChunkResult]]
+
+
+@dataclass
+class _WorkerState:
+    config: _WorkerConfig
+    classifier: _Classifier
+    executor: ThreadPoolExecutor | None
+    limiter: RateLimiter
+    controller: _ConcurrencyController | None
+    sources: SourceAddresses | None = None
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+# Per-process state for `--workers` processes (set by the pool initializer).
+_worker_state: _WorkerState | None = None
+
+
+def _classifier_for(
+    config: _WorkerConfig, limiter: RateLimiter, sources: SourceAddresses | None = None
+) -> _Classifier:
+    return _Classifier(
+        timeout=config.timeout,
+        nameservers=config.nameservers,
+        detect_wildcard=config.detect_wildcard,
+        wildcard_probes=config.wildcard_probes,
+        wildcard_threshold=config.wildcard_threshold,
+        wildcard_verify_http=config.wildcard_verify_http,
+        wildcard_http_timeout=config.wildcard_http_timeout,
+        takeover_checker=config.takeover_checker,
+        limiter=limiter,
+        sources=sources,
+    )
+
+
+def _new_sources(config: _WorkerConfig) -> SourceAddresses | None:
+    return SourceAddresses(config.bind) if config.bind else None
+
+
+def _new_limiter(config: _WorkerConfig) -> RateLimiter:
+    return RateLimiter(rate=config.rate, per_resolver_rate=config.rate_per_resolver)
+
+
+def _new_executor(config: _WorkerConfig) -> ThreadPoolExecutor | None:
+    # Threads start lazily, so the adaptive pool only grows as far as the window does.
+    if config.adaptive_concurrency:
+        return ThreadPoolExecutor(max_workers=_AUTO_CONCURRENCY_MAX)
+    if config.concurrency > 1:
+        return ThreadPoolExecutor(max_workers=config.concurrency)
+    return None
+
+
+def _new_controller(config: _WorkerConfig) -> _ConcurrencyController | None:
+    if not config.adaptive_concurrency:
+        return None
+    return _ConcurrencyController(initial=config.concurrency)
+
+
+def _iter_outcomes(
+    config: _WorkerConfig,
+    classifier: _Classifier,
+    executor: ThreadPoolExecutor | None,
+    candidates: Iterable[tuple[str, str]],
+    limiter: RateLimiter,
+    controller: _ConcurrencyController | None,
+    sources: SourceAddresses | None = None,
+) -> Iterator[_Outcome]:
+    # Work items are (domain, label, attempt, deadline); each call makes exactly one attempt.
+    # The deadline (monotonic) is fixed on the first attempt and bounds all of them.
+    def run_one(item: _Attempt) -> tuple[_Attempt, Result, tuple[str, ...]]:
+        domain, label, attempt, deadline = item
+        if deadline is None and config.deadline is not None:
+            deadline = time.monotonic() + config.deadline
+        harvested: list[str] | None = [] if config.harvest else None
+        res = _resolve(
+            f"{label}.{domain}",
+            timeout=config.timeout,
+            nameservers=_rotate_nameservers(config.nameservers, attempt),
+            include_cname=config.include_cname,
+            limiter=limiter,
+            deadline=deadline,
+            sweep=config.sweep,
+            harvest=harvested,
+            sources=sources,
+        )
+        return (domain, label, attempt, deadline), res, tuple(dict.fromkeys(harvested or ()))
+
+    def retry_later(
+        done: tuple[_Attempt, Result, tuple[str, ...]],
+    ) -> tuple[float, _Attempt] | None:
+        (domain, label, attempt, deadline), res, _harvested = done
+        if controller is not None:
+            controller.observe(res)
+        if attempt >= config.retries or not _is_retryable(res):
+            return None
+        delay_s = _retry_delay_s(config.retry_backoff_ms, attempt)
+        if deadline is not None:
+            # Come back no later than the deadline so the name settles as deadline_exceeded.
+            delay_s = min(delay_s, max(0.0, deadline - time.monotonic()))
+        return delay_s, (domain, label, attempt + 1, deadline)
+
+    window: int | Callable[[], int]
+    if controller is not None:
+        adaptive = controller
+
+        def window() -> int:
+            return adaptive.window
+    else:
+        # Keep a couple of names queued per thread so workers never idle between results.
+        window = config.concurrency * 2
+    attempts = _Attempts(iter(candidates))
+    # Existing names that will be written wait here until a batch is worth one record-type pass.
+    batch: list[tuple[str, str, Result, tuple[str, ...]]] = []
+    for (domain, label, attempt, _deadline), res, harvested in _iter_results(
+        executor, run_one, attempts, window=window, retry=retry_later
+    ):
+        # Always reflect retry metadata in the emitted record for observability.
+        res = classifier.classify(replace(res, attempts=attempt + 1, retries=attempt))
+        wanted = config.statuses is None or res.status in config.statuses
+        # Every name that exists gets its record types, including CNAME-only and NODATA names
+        # (a TXT-only name has no addresses but is exactly what `--record-types TXT` is for).
+        exists = res.status in ("resolved", "cname") or res.nodata
+        if config.record_types and wanted and exists:
+            batch.append((domain, label, res, harvested))
+            if len(batch) >= _RECORD_BATCH_SIZE:
+                yield from _with_records(config, limiter, batch, sources)
+                batch = []
+            continue
+        line = json.dumps(res.to_dict()) if wanted else None
+        yield domain, label, res.status, line, harvested, res.nodata
+    if batch:
+        yield from _with_records(config, limiter, batch, sources)
+
+
+def _with_records(
+    config: _WorkerConfig,
+    limiter: RateLimiter,
+    batch: list[tuple[str, str, Result, tuple[str, ...]]],
+    sources: SourceAddresses | None = None,
+) -> Iterator[_Outcome]:
+    """Fetch `--record-types` for a batch of existing names in one pipelined pass."""
+    assert config.nameservers is not None  # enforced by _scan_core
+    found = resolve_records(
+        [res.subdomain for _domain, _label, res, _harvested in batch],
+        record_types=config.record_types,
+        nameservers=config.nameservers,
+        timeout=config.timeout,
+        window=_RECORD_PIPELINE_WINDOW,
+        limiter=limiter,
+        sources=sources,
+    )
+    for domain, label, res, harvested in batch:
+        res = replace(res, records=found.get(res.subdomain.lower(), {}))
+        yield domain, label, res.status, json.dumps(res.to_dict()), harvested, res.nodata
+
+
+def _new_worker_state(config: _WorkerConfig) -> _WorkerState:
+    limiter = _new_limiter(config)
+    sources = _new_sources(config)
+    return _WorkerState(
+        config=config,
+        classifier=_classifier_for(config, limiter, sources),
+        executor=_new_executor(config),
+        limiter=limiter,
+        controller=_new_controller(config),
+        sources=sources,
+    )
+
+
+def _init_scan_worker(config: _WorkerConfig) -> None:
+    global _worker_state
+    _worker_state = _new_worker_state(config)
+
+
+def _scan_worker_chunk(chunk: list[tuple[str, str]]) -> _ChunkResult:
+    if _worker_state is None:  # pragma: no cover - initializer always runs first
+        raise RuntimeError("scan worker is not initialized")
+    return _run_chunk(_worker_state, chunk)
+
+
+def _run_chunk(state: _WorkerState, chunk: list[tuple[str, str]]) -> _ChunkResult:
+    """Resolve, classify and serialize one chunk of candidates (worker process or node)."""
+    config, classifier, executor = state.config, state.classifier, state.executor
+    checked_before = classifier.takeover_checked
+    suspected_before = classifier.takeover_suspected
+    queries_before, delayed_before = state.limiter.snapshot()
+    sources_before = {} if state.sources is None else state.sources.snapshot()
+    outcomes = list(
+        _iter_outcomes(
+            config,
+            classifier,
+            executor,
+            chunk,
+            state.limiter,
+            state.controller,
+            state.sources,
+        )
+    )
+    queries_after, delayed_after = state.limiter.snapshot()
+    sources_after = {} if state.sources is None else state.sources.snapshot()
+    return _ChunkResult(
+        outcomes=outcomes,
+        takeover_checked=classifier.takeover_checked - checked_before,
+        takeover_suspected=classifier.takeover_suspected - suspected_before,
+        queries={
+            resolver: count - queries_before.get(resolver, 0)
+            for resolver, count in queries_after.items()
+            if count != queries_before.get(resolver, 0)
+        },
+        queries_delayed=delayed_after - delayed_before,
+        concurrency_window=0 if state.controller is None else state.controller.window,
+        source_counts={
+            address: (queries - sources_before[address][0], errors - sources_before[address][1])
+            for address, (queries, errors) in sources_after.items()
+            if (queries, errors) != sources_before.get(address)
+        },
+    )
+
+
+_WORKER_EXECUTORS = ("processes", "interpreters")
+
+
+def _new_worker_pool(kind: str, workers: int, config: _WorkerConfig) -> Executor | None:
+    """
+    Pool that runs `_scan_worker_chunk` for `--workers`; None means resolve on local threads.
+
+    Sub-interpreters (Python 3.14+) each have their own GIL like processes, without forking;
+    on older interpreters they fall back to the threaded path with a logged warning.
+    """
+    if kind == "processes":
+        return ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_scan_worker, initargs=(config,)
+        )
+    interpreter_pool = getattr(concurrent.futures, "InterpreterPoolExecutor", None)
+    if interpreter_pool is None:
+        _log.warning(
+            "sub-interpreter workers need Python 3.14+ (running %d.%d); "
+            "resolving on threads in this process instead of %d workers",
+            *sys.version_info[:2],
+            workers,
+        )
+        return None
+    pool: Executor = interpreter_pool(
+        max_workers=workers, initializer=_init_scan_worker, initargs=(config,)
+    )
+    return pool
+
+
+def _chunked(items: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    return _Chunks(iter(items), size)
+
+
+class _Chunks(Iterator[list[_T]]):
+    """Lists of up to `size` items; like `_iter_results`, it can be polled again after running dry."""
+
+    def __init__(self, items: Iterator[_T], size: int) -> None:
+        self._items = items
+        self._size = size
+
+    def __next__(self) -> list[_T]:
+        chunk = list(itertools.islice(self._items, self._size))
+        if not chunk:
+            raise StopIteration
+        return chunk
+
+
+class _Attempts(Iterator[_Attempt]):
+    """First attempts for candidates; re-pollable like `_Chunks` so a `_Feed` can refill it."""
+
+    def __init__(self, candidates: Iterator[tuple[str, str]]) -> None:
+        self._candidates = candidates
+
+    def __next__(self) -> _Attempt:
+        domain, label = next(self._candidates)
+        return domain, label, 0, None
+
+
 def _scan_core(
     *,
-    domain: str,
-    labels: Iterable[str],
+    candidates: Iterable[tuple[str, str]],
+    label_stats: _LabelStats,
     out_path: Path | None,
     timeout: float,
     concurrency: int,
@@ -288,11 +1347,49 @@ def _scan_core(
     ct_labels: int,
     takeover_checker: Callable[[str], dict[str, Any] | None] | None,
     nameservers: list[tuple[str, int]] | None,
-    resume_seen_labels: set[str] | None,
     append_out: bool,
+    track_domains: bool,
+    workers: int,
+    shard: tuple[int, int] | None,
+    rate: float | None,
+    rate_per_resolver: float | None,
+    adaptive_concurrency: bool,
+    deadline: float | None,
+    worker_executor: str,
+    sweep: bool,
+    record_types: Sequence[str] | None = None,
+    harvest: bool = False,
+    bind: Sequence[str] | None = None,
+    dedupe_memory: int | None = None,
+    mutate: bool = False,
+    mutate_budget: int = DEFAULT_MUTATION_BUDGET,
+    recursive: int = 0,
+    recursive_wordlist: Path | None = None,
+    query_budget: int | None = None,
+    chunk_dispatcher: ChunkDispatcher | None = None,
 ) -> ScanSummary:
     if concurrency < 1:
         raise ValueError("concurrency must be >= 1")
+    if retries < 0:
+        raise ValueError("retries must be >= 0")
+    if deadline is not None and deadline <= 0:
+        raise ValueError("deadline must be > 0")
+    if retry_backoff_ms < 0:
+        raise ValueError("retry_backoff_ms must be >= 0")
+    if adaptive_concurrency and concurrency > _AUTO_CONCURRENCY_MAX:
+        raise ValueError(f"adaptive concurrency starts at most at {_AUTO_CONCURRENCY_MAX}")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be > 0")
+    if rate_per_resolver is not None and rate_per_resolver <= 0:
+        raise ValueError("rate_per_resolver must be > 0")
+    if shard is not None and not (1 <= shard[0] <= shard[1]):
+        raise ValueError("shard index must be between 1 and the shard count")
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if workers > 1 and chunk_dispatcher is not None:
+        raise ValueError("workers and chunk_dispatcher cannot both be set")
+    if worker_executor not in _WORKER_EXECUTORS:
+        raise ValueError(f"unknown worker executor: {worker_executor}")
     if timeout <= 0:
         raise ValueError("timeout must be > 0")
     if detect_wildcard and wildcard_probes < 2:
@@ -305,21 +1402,31 @@ def _scan_core(
         raise ValueError("wildcard_http_timeout must be > 0")
     if progress_stream is not None and progress_every_s < 0:
         raise ValueError("progress_every_s must be >= 0")
+    if include_cname and nameservers is None:
+        raise ValueError("include_cname requires custom resolver mode (--resolver/--resolver-file)")
+    qtypes = tuple(dict.fromkeys(parse_record_type(spec) for spec in record_types or ()))
+    if qtypes and nameservers is None:
+        raise ValueError("record_types requires custom resolver mode (--resolver/--resolver-file)")
+    if harvest and nameservers is None:
+        raise ValueError("harvest requires custom resolver mode (--resolver/--resolver-file)")
+    if bind and nameservers is None:
+        raise ValueError("bind requires custom resolver mode (--resolver/--resolver-file)")
+    if mutate_budget < 0:
+        raise ValueError("mutate_budget must be >= 0")
+    if recursive < 0:
+        raise ValueError("recursive must be >= 0")
+    if recursive and not detect_wildcard:
+        raise ValueError("recursive requires detect_wildcard")
+    if recursive and recursive_wordlist is None:
+        raise ValueError("recursive requires recursive_wordlist")
+    if query_budget is not None and query_budget < 1:
+        raise ValueError("query_budget must be >= 1")
+    if query_budget is not None and (workers > 1 or chunk_dispatcher is not None):
+        raise ValueError("query_budget cannot be used with workers or chunk_dispatcher")
 
     start = time.time()
-    attempted = 0
-    written = 0
-    resolved = 0
-    wildcard = 0
-    cname = 0
-    not_found = 0
-    error = 0
-    labels_total = 0
-    labels_unique = 0
-    labels_deduped = 0
-    labels_skipped_existing = 0
-    takeover_checked = 0
-    takeover_suspected = 0
+    totals = _Tally()
+    per_domain: dict[str, _Tally] = {}
 
     allowed_statuses = {"resolved", "wildcard", "cname", "not_found", "error"}
     if statuses is not None:
@@ -327,188 +1434,266 @@ def _scan_core(
         if unknown:
             raise ValueError(f"unknown statuses: {', '.join(sorted(unknown))}")
 
-    prev_timeout = socket.getdefaulttimeout()
-    socket.setdefaulttimeout(timeout)
-    try:
-        wildcard_cache: dict[str, set[frozenset[str]]] = {}
-        wildcard_ipset_hit_counts: dict[tuple[str, frozenset[str]], int] = {}
-        wildcard_http_cache: dict[str, dict[str, tuple[int, str]]] = {}
-
-        def wildcard_ipsets_for_zone(zone: str) -> set[frozenset[str]]:
-            cached = wildcard_cache.get(zone)
-            if cached is not None:
-                return cached
-            hits = _detect_wildcard_ipsets(
-                zone, probes=wildcard_probes, timeout=timeout, nameservers=nameservers
-            )
-            ipsets = {ipset for ipset, count in hits.items() if count >= 2}
-            wildcard_cache[zone] = ipsets
-            return ipsets
-
-        def wildcard_http_sigs_for_zone(zone: str) -> dict[str, tuple[int, str]]:
-            cached = wildcard_http_cache.get(zone)
-            if cached is not None:
-                return cached
-            # Use a random label; this should hit the wildcard behavior if present.
-            label = f"_sdscout-{secrets.token_hex(8)}"
-            host = f"{label}.{zone}"
-            sigs = _http_signatures_for_host(host, timeout=wildcard_http_timeout)
-            wildcard_http_cache[zone] = sigs
-            return sigs
-
-        executor: ThreadPoolExecutor | None = None
-        if concurrency > 1:
-            executor = ThreadPoolExecutor(max_workers=concurrency)
-
-        def run_one(name: str) -> Result:
-            return _resolve_with_retries(
-                name,
-                timeout=timeout,
-                nameservers=nameservers,
-                include_cname=include_cname,
-                retries=retries,
-                retry_backoff_ms=retry_backoff_ms,
+    config = _WorkerConfig(
+        timeout=timeout,
+        concurrency=concurrency,
+        statuses=statuses,
+        detect_wildcard=detect_wildcard,
+        wildcard_probes=wildcard_probes,
+        wildcard_threshold=wildcard_threshold,
+        wildcard_verify_http=wildcard_verify_http,
+        wildcard_http_timeout=wildcard_http_timeout,
+        include_cname=include_cname,
+        retries=retries,
+        retry_backoff_ms=retry_backoff_ms,
+        takeover_checker=takeover_checker,
+        nameservers=nameservers,
+        rate=rate,
+        rate_per_resolver=rate_per_resolver,
+        adaptive_concurrency=adaptive_concurrency,
+        deadline=deadline,
+        sweep=sweep,
+        record_types=qtypes,
+        harvest=harvest,
+        bind=tuple(bind or ()),
+    )
+
+    # Paces local queries; with worker processes or nodes it only aggregates their counts.
+    limiter = _new_limiter(config)
+    recursive_labels: list[str] = []
+    if recursive_wordlist is not None and recursive:
+        recursive_labels = list(dict.fromkeys(_iter_labels(recursive_wordlist)))
+    feed = None
+    if harvest or mutate or recursive or query_budget is not None:
+        feed = _Feed(
+            candidates,
+            shard=shard,
+            dedupe_memory=dedupe_memory,
+            mutate_budget=mutate_budget if mutate else 0,
+            recursive_depth=recursive,
+            recursive_labels=recursive_labels,
+            # Only a custom resolver tells NXDOMAIN apart from names without addresses.
+            prune=bool(recursive) and nameservers is not None,
+            exhausted=None if query_budget is None else lambda: limiter.total() >= query_budget,
+        )
+        candidates = feed
+    # Rotates local queries over --bind addresses; workers and nodes report their own counts.
+    sources = _new_sources(config)
+    source_counts: dict[str, tuple[int, int]] = {}
+    classifier = _classifier_for(config, limiter, sources)
+    # Drives the local window; with worker processes or nodes it mirrors their latest one.
+    controller = _new_controller(config)
+    with contextlib.ExitStack() as stack:
+        if feed is not None:
+            stack.callback(feed.close)
+        outcomes: Iterable[_Outcome]
+        backend = "threads" if chunk_dispatcher is None else "remote"
+        worker_pool = None
+        if workers > 1:
+            # Split the rate caps so the workers together stay within them.
+            worker_config = replace(
+                config,
+                rate=None if rate is None else rate / workers,
+                rate_per_resolver=None
+                if rate_per_resolver is None
+                else rate_per_resolver / workers,
             )
+            worker_pool = _new_worker_pool(worker_executor, workers, worker_config)
+        if worker_pool is not None:
+            # Each worker (process or sub-interpreter) runs its own resolver threads, sockets and
+            # wildcard caches; this thread only dedupes input, writes output and merges counters.
+            backend = worker_executor
+            pool = stack.enter_context(worker_pool)
+
+            def dispatch_to_pool(
+                items: Iterable[tuple[str, str]], _config: _WorkerConfig
+            ) -> Iterator[_ChunkResult]:
+                return _iter_results(
+                    pool,
+                    _scan_worker_chunk,
+                    _chunked(items, concurrency * 8),
+                    window=workers * 2,
+                )
+
+            chunk_dispatcher = dispatch_to_pool
+
+        if chunk_dispatcher is not None:
+            dispatcher = chunk_dispatcher
+
+            def merged_outcomes() -> Iterator[_Outcome]:
+                for chunk_result in dispatcher(candidates, config):
+                    classifier.takeover_checked += chunk_result.takeover_checked
+                    classifier.takeover_suspected += chunk_result.takeover_suspected
+                    limiter.merge(chunk_result.queries, chunk_result.queries_delayed)
+                    _add_source_counts(source_counts, chunk_result.source_counts)
+                    if controller is not None and chunk_result.concurrency_window:
+                        controller.follow(chunk_result.concurrency_window)
+                    yield from chunk_result.outcomes
 
-        with contextlib.ExitStack() as stack:
+            outcomes = merged_outcomes()
+        else:
+            executor = _new_executor(config)
             if executor is not None:
                 stack.enter_context(executor)
+            outcomes = _iter_outcomes(
+                config, classifier, executor, candidates, limiter, controller, sources
+            )
 
-            out, _tmp_path = stack.enter_context(_output_stream(out_path, append=append_out))
-
-            last_progress = start
-
-            seen_labels: set[str] = set()
-
-            def iter_unique_labels() -> Iterator[str]:
-                nonlocal labels_total, labels_unique, labels_deduped, labels_skipped_existing
-                for label in labels:
-                    labels_total += 1
-                    if label in seen_labels:
-                        labels_deduped += 1
-                        continue
-                    seen_labels.add(label)
-                    labels_unique += 1
-                    if resume_seen_labels is not None and label in resume_seen_labels:
-                        labels_skipped_existing += 1
-                        continue
-                    yield label
-
-            names = _iter_fqdns(domain, iter_unique_labels())
-
-            if executor is None:
-                results: Iterable[Result] = (run_one(name) for name in names)
-            else:
-                results = executor.map(run_one, names)
-
-            for res in results:
-                attempted += 1
-                if detect_wildcard and res.status == "resolved" and res.ips:
-                    # Handle multi-level wildcards by probing the immediate suffix of the hostname.
-                    # Example: for "foo.dev.example.com", probe "*.dev.example.com".
-                    parts = res.subdomain.split(".", 1)
-                    if len(parts) == 2:
-                        zone = parts[1]
-                        ipsets = wildcard_ipsets_for_zone(zone)
-                        if ipsets:
-                            ipset = frozenset(res.ips)
-                            if ipset in ipsets:
-                                key = (zone, ipset)
-                                wildcard_ipset_hit_counts[key] = (
-                                    wildcard_ipset_hit_counts.get(key, 0) + 1
-                                )
-                                if wildcard_ipset_hit_counts[key] >= wildcard_threshold:
-                                    candidate = replace(res, status="wildcard")
-
-                                    if wildcard_verify_http:
-                                        baseline = wildcard_http_sigs_for_zone(zone)
-                                        candidate_sigs = _http_signatures_for_host(
-                                            res.subdomain,
-                                            timeout=wildcard_http_timeout,
-                                        )
-                                        if baseline and candidate_sigs:
-                                            if not _http_signatures_match(baseline, candidate_sigs):
-                                                # DNS IP-set overlap can happen on CDNs; if HTTP content differs
-                                                # from a random wildcard probe, treat it as a real resolved host.
-                                                candidate = replace(candidate, status="resolved")
-
-                                    res = candidate
-
-                if takeover_checker is not None and res.status in {"resolved", "wildcard"}:
-                    takeover_checked += 1
-                    try:
-                        takeover = takeover_checker(res.subdomain)
-                    except OSError:
-                        takeover = None
-                    if takeover is not None:
-                        takeover_suspected += 1
-                        res = replace(res, takeover=takeover)
-
-                if res.status == "resolved":
-                    resolved += 1
-                elif res.status == "wildcard":
-                    wildcard += 1
-                elif res.status == "cname":
-                    cname += 1
-                elif res.status == "not_found":
-                    not_found += 1
-                else:
-                    error += 1
-
-                if progress_stream is not None:
-                    will_write = statuses is None or res.status in statuses
-                    wrote_now = written + (1 if will_write else 0)
-                    now = time.time()
-                    if progress_every_s == 0 or (now - last_progress) >= progress_every_s:
-                        elapsed_s = max(0.001, now - start)
-                        rate = attempted / elapsed_s
-                        print(
-                            "progress"
-                            f" attempted={attempted}"
-                            f" resolved={resolved}"
-                            f" wildcard={wildcard}"
-                            f" cname={cname}"
-                            f" not_found={not_found}"
-                            f" error={error}"
-                            f" wrote={wrote_now}"
-                            f" elapsed_ms={_ms(start)}"
-                            f" rate_s={rate:.2f}",
-                            file=progress_stream,
+        out, _tmp_path = stack.enter_context(_output_stream(out_path, append=append_out))
+
+        last_progress = start
+
+        for domain, label, status, line, harvested, nodata in outcomes:
+            if feed is not None:
+                if harvested:
+                    feed.offer(domain, harvested)
+                feed.observe(domain, label, status, nodata)
+            totals.count(status)
+            domain_tally: _Tally | None = None
+            if track_domains:
+                domain_tally = per_domain.setdefault(domain, _Tally())
+                domain_tally.count(status)
+
+            if progress_stream is not None:
+                wrote_now = totals.written + (1 if line is not None else 0)
+                now = time.time()
+                if progress_every_s == 0 or (now - last_progress) >= progress_every_s:
+                    elapsed_s = max(0.001, now - start)
+                    query_counts, queries_delayed = limiter.snapshot()
+                    queries = sum(query_counts.values())
+                    print(
+                        "progress"
+                        f" attempted={totals.attempted}"
+                        f" resolved={totals.resolved}"
+                        f" wildcard={totals.wildcard}"
+                        f" cname={totals.cname}"
+                        f" not_found={totals.not_found}"
+                        f" error={totals.error}"
+                        f" wrote={wrote_now}"
+                        f" elapsed_ms={_ms(start)}"
+                        f" rate_s={totals.attempted / elapsed_s:.2f}"
+                        f" queries={queries}"
+                        f" qps={queries / elapsed_s:.2f}"
+                        + (
+                            f" queries_delayed={queries_delayed}"
+                            if rate is not None or rate_per_resolver is not None
+                            else ""
                         )
-                        last_progress = now
+                        + ("" if controller is None else f" window={controller.window}")
+                        + _progress_eta(label_stats, elapsed_s),
+                        file=progress_stream,
+                    )
+                    last_progress = now
 
-                if statuses is not None and res.status not in statuses:
-                    continue
-                out.write(json.dumps(res.to_dict()) + "\n")
-                written += 1
-    finally:
-        socket.setdefaulttimeout(prev_timeout)
+            if line is None:
+                continue
+            out.write(line + "\n")
+            totals.written += 1
+            if domain_tally is not None:
+                domain_tally.written += 1
+
+    domain_summaries: tuple[DomainSummary, ...] = ()
+    if track_domains:
+        domain_names = list(dict.fromkeys([*per_domain, *label_stats.skipped_by_domain]))
+        domain_summaries = tuple(
+            _domain_summary(
+                domain,
+                per_domain.get(domain, _Tally()),
+                skipped_existing=label_stats.skipped_by_domain.get(domain, 0),
+            )
+            for domain in sorted(domain_names)
+        )
 
+    query_counts, queries_delayed = limiter.snapshot()
+    if sources is not None:
+        _add_source_counts(source_counts, sources.snapshot())
     return ScanSummary(
-        attempted=attempted,
-        written=written,
-        resolved=resolved,
-        wildcard=wildcard,
-        cname=cname,
-        not_found=not_found,
-        error=error,
-        labels_total=labels_total,
-        labels_unique=labels_unique,
-        labels_deduped=labels_deduped,
-        labels_skipped_existing=labels_skipped_existing,
+        attempted=totals.attempted,
+        written=totals.written,
+        resolved=totals.resolved,
+        wildcard=totals.wildcard,
+        cname=totals.cname,
+        not_found=totals.not_found,
+        error=totals.error,
+        labels_total=label_stats.total,
+        labels_unique=label_stats.unique,
+        labels_deduped=label_stats.deduped,
+        labels_skipped_existing=label_stats.skipped_existing,
         ct_labels=ct_labels,
-        takeover_checked=takeover_checked,
-        takeover_suspected=takeover_suspected,
+        takeover_checked=classifier.takeover_checked,
+        takeover_suspected=classifier.takeover_suspected,
         elapsed_ms=_ms(start),
+        domains=domain_summaries,
+        shard=None if shard is None else f"{shard[0]}/{shard[1]}",
+        labels_other_shard=label_stats.other_shard,
+        queries=sum(query_counts.values()),
+        queries_delayed=queries_delayed,
+        resolver_queries=tuple(sorted(query_counts.items())),
+        rate_limit=rate,
+        rate_limit_per_resolver=rate_per_resolver,
+        concurrency_auto=adaptive_concurrency,
+        concurrency_window=concurrency if controller is None else controller.window,
+        concurrency_history=() if controller is None else tuple(controller.history),
+        executor=backend,
+        harvest=harvest,
+        labels_harvested=0 if feed is None else feed.added,
+        mutate=mutate,
+        labels_mutated=0 if feed is None else feed.mutated,
+        recursive=recursive,
+        zones_recursive=0 if feed is None else feed.zones,
+        labels_recursive=0 if feed is None else feed.recursed,
+        labels_pruned=0 if feed is None else feed.pruned,
+        query_budget=query_budget,
+        query_budget_exhausted=feed is not None and feed.budget_exhausted,
+        labels_planned=label_stats.planned,
+        labels_invalid=label_stats.invalid,
+        labels_generated=label_stats.generated,
+        labels_prioritized=label_stats.prioritized,
+        source_queries=tuple(
+            (address, queries, errors)
+            for address, (queries, errors) in sorted(source_counts.items())
+        ),
+    )
+
+
+def _progress_eta(stats: _LabelStats, elapsed_s: float) -> str:
+    if stats.planned is None:
+        return ""
+    # Labels already pulled from the input, including ones dropped or skipped on the way.
+    done = min(stats.total + stats.invalid, stats.planned)
+    eta = "" if done == 0 else f" eta_s={elapsed_s * (stats.planned - done) / done:.0f}"
+    return f" labels={done}/{stats.planned}" + eta
+
+
+def _add_source_counts(
+    totals: dict[str, tuple[int, int]], counts: Mapping[str, tuple[int, int]]
+) -> None:
+    for address, (queries, errors) in counts.items():
+        total_queries, total_errors = totals.get(address, (0, 0))
+        totals[address] = (total_queries + queries, total_errors + errors)
+
+
+def _domain_summary(domain: str, tally: _Tally, *, skipped_existing: int) -> DomainSummary:
+    return DomainSummary(
+        domain=domain,
+        attempted=tally.attempted,
+        written=tally.written,
+        resolved=tally.resolved,
+        wildcard=tally.wildcard,
+        cname=tally.cname,
+        not_found=tally.not_found,
+        error=tally.error,
+        labels_skipped_existing=skipped_existing,
     )
 
 
 def scan_domains_summary(
     *,
-    domain: str,
+    domain: str | None = None,
     wordlist: Path,
     out_path: Path | None,
     timeout: float,
+    domains: Sequence[str] | None = None,
     concurrency: int = 20,
     only_resolved: bool = False,
     statuses: set[str] | None = None,
@@ -522,15 +1707,40 @@ def scan_domains_summary(
     progress_every_s: float = 2.0,
     retries: int = 0,
     retry_backoff_ms: int = 50,
-    extra_labels: Iterable[str] | None = None,
+    extra_labels: Iterable[str] | Mapping[str, Iterable[str]] | None = None,
     ct_labels_count: int = 0,
     takeover_checker: Callable[[str], dict[str, Any] | None] | None = None,
     nameservers: list[tuple[str, int]] | None = None,
     resume: bool = False,
+    workers: int = 1,
+    shard: tuple[int, int] | None = None,
+    rate: float | None = None,
+    rate_per_resolver: float | None = None,
+    adaptive_concurrency: bool = False,
+    deadline: float | None = None,
+    worker_executor: str = "processes",
+    sweep: bool = True,
+    record_types: Sequence[str] | None = None,
+    harvest: bool = False,
+    bind: Sequence[str] | None = None,
+    dedupe_memory: int | None = None,
+    mutate: bool = False,
+    mutate_budget: int = DEFAULT_MUTATION_BUDGET,
+    recursive: int = 0,
+    recursive_wordlist: Path | None = None,
+    query_budget: int | None = None,
+    patterns: Sequence[str] | None = None,
+    pattern_sets: Mapping[str, Sequence[str]] | None = None,
+    label_model: LabelModel | None = None,
+    generate: int = 0,
+    priority_labels: Sequence[str] | None = None,
+    chunk_dispatcher: ChunkDispatcher | None = None,
 ) -> ScanSummary:
+    prioritized, labels = _prioritize(lambda: _iter_labels(wordlist), priority_labels)
     return _scan_domains_summary_labels(
-        domain=domain,
-        labels=_iter_labels(wordlist),
+        domains=_target_domains(domain, domains),
+        labels=labels,
+        word_count=_count_labels(wordlist) if patterns else None,
         out_path=out_path,
         timeout=timeout,
         concurrency=concurrency,
@@ -551,15 +1761,40 @@ def scan_domains_summary(
         takeover_checker=takeover_checker,
         nameservers=nameservers,
         resume=resume,
+        workers=workers,
+        shard=shard,
+        rate=rate,
+        rate_per_resolver=rate_per_resolver,
+        adaptive_concurrency=adaptive_concurrency,
+        deadline=deadline,
+        worker_executor=worker_executor,
+        sweep=sweep,
+        record_types=record_types,
+        harvest=harvest,
+        bind=bind,
+        dedupe_memory=dedupe_memory,
+        mutate=mutate,
+        mutate_budget=mutate_budget,
+        recursive=recursive,
+        recursive_wordlist=recursive_wordlist,
+        query_budget=query_budget,
+        patterns=patterns,
+        pattern_sets=pattern_sets,
+        label_model=label_model,
+        generate=generate,
+        prioritized=prioritized,
+        chunk_dispatcher=chunk_dispatcher,
+        track_domains=domains is not None,
     )
 
 
 def scan_domains_summary_lines(
     *,
-    domain: str,
+    domain: str | None = None,
     wordlist_lines: Iterable[str],
     out_path: Path | None,
     timeout: float,
+    domains: Sequence[str] | None = None,
     concurrency: int = 20,
     only_resolved: bool = False,
     statuses: set[str] | None = None,
@@ -573,15 +1808,41 @@ def scan_domains_summary_lines(
     progress_every_s: float = 2.0,
     retries: int = 0,
     retry_backoff_ms: int = 50,
-    extra_labels: Iterable[str] | None = None,
+    extra_labels: Iterable[str] | Mapping[str, Iterable[str]] | None = None,
     ct_labels_count: int = 0,
     takeover_checker: Callable[[str], dict[str, Any] | None] | None = None,
     nameservers: list[tuple[str, int]] | None = None,
     resume: bool = False,
+    workers: int = 1,
+    shard: tuple[int, int] | None = None,
+    rate: float | None = None,
+    rate_per_resolver: float | None = None,
+    adaptive_concurrency: bool = False,
+    deadline: float | None = None,
+    worker_executor: str = "processes",
+    sweep: bool = True,
+    record_types: Sequence[str] | None = None,
+    harvest: bool = False,
+    bind: Sequence[str] | None = None,
+    dedupe_memory: int | None = None,
+    mutate: bool = False,
+    mutate_budget: int = DEFAULT_MUTATION_BUDGET,
+    recursive: int = 0,
+    recursive_wordlist: Path | None = None,
+    query_budget: int | None = None,
+    patterns: Sequence[str] | None = None,
+    pattern_sets: Mapping[str, Sequence[str]] | None = None,
+    label_model: LabelModel | None = None,
+    generate: int = 0,
+    priority_labels: Sequence[str] | None = None,
+    chunk_dispatcher: ChunkDispatcher | None = None,
 ) -> ScanSummary:
+    if priority_labels and not isinstance(wordlist_lines, Sequence):
+        raise ValueError("priority_labels requires a wordlist that can be read twice")
+    prioritized, labels = _prioritize(lambda: _iter_labels_lines(wordlist_lines), priority_labels)
     return _scan_domains_summary_labels(
-        domain=domain,
-        labels=_iter_labels_lines(wordlist_lines),
+        domains=_target_domains(domain, domains),
+        labels=labels,
         out_path=out_path,
         timeout=timeout,
         concurrency=concurrency,
@@ -602,13 +1863,82 @@ def scan_domains_summary_lines(
         takeover_checker=takeover_checker,
         nameservers=nameservers,
         resume=resume,
+        workers=workers,
+        shard=shard,
+        rate=rate,
+        rate_per_resolver=rate_per_resolver,
+        adaptive_concurrency=adaptive_concurrency,
+        deadline=deadline,
+        worker_executor=worker_executor,
+        sweep=sweep,
+        record_types=record_types,
+        harvest=harvest,
+        bind=bind,
+        dedupe_memory=dedupe_memory,
+        mutate=mutate,
+        mutate_budget=mutate_budget,
+        recursive=recursive,
+        recursive_wordlist=recursive_wordlist,
+        query_budget=query_budget,
+        patterns=patterns,
+        pattern_sets=pattern_sets,
+        label_model=label_model,
+        generate=generate,
+        prioritized=prioritized,
+        chunk_dispatcher=chunk_dispatcher,
+        track_domains=domains is not None,
     )
 
 
+def _target_domains(domain: str | None, domains: Sequence[str] | None) -> list[str]:
+    if (domain is None) == (domains is None):
+        raise ValueError("exactly one of domain and domains must be set")
+    if domain is not None:
+        return [domain]
+    assert domains is not None
+    if not domains:
+        raise ValueError("domains must be non-empty")
+    return list(dict.fromkeys(domains))
+
+
+def _output_statuses(*, only_resolved: bool, statuses: set[str] | None) -> set[str] | None:
+    if only_resolved and statuses is not None:
+        raise ValueError("only_resolved and statuses cannot both be set")
+    if only_resolved:
+        return {"resolved"}
+    return statuses
+
+
+def _prioritize(
+    read: Callable[[], Iterable[str]], priority_labels: Sequence[str] | None
+) -> tuple[list[str], Iterable[str]]:
+    """
+    Split a wordlist into the `priority_labels` it holds (in priority order) and the rest.
+
+    `read` is called twice: one pass finds which priority labels the wordlist contains, the
+    second streams the remaining labels in file order. Priority labels that are not in the
+    wordlist are not scanned.
+    """
+    ranked = dict.fromkeys(normalize_labels(list(priority_labels or ()), skip_invalid=True))
+    if not ranked:
+        return [], read()
+    present = {label for label in read() if label in ranked}
+    return [label for label in ranked if label in present], (
+        label for label in read() if label not in present
+    )
+
+
+def _count_generated(model: LabelModel, limit: int, stats: _LabelStats) -> Iterator[str]:
+    for label in generate_labels(model, limit):
+        stats.generated += 1
+        yield label
+
+
 def _scan_domains_summary_labels(
     *,
-    domain: str,
+    domains: Sequence[str],
     labels: Iterable[str],
+    word_count: int | None = None,
     out_path: Path | None,
     timeout: float,
     concurrency: int = 20,
@@ -624,25 +1954,91 @@ def _scan_domains_summary_labels(
     progress_every_s: float = 2.0,
     retries: int = 0,
     retry_backoff_ms: int = 50,
-    extra_labels: Iterable[str] | None = None,
+    extra_labels: Iterable[str] | Mapping[str, Iterable[str]] | None = None,
     ct_labels_count: int = 0,
     takeover_checker: Callable[[str], dict[str, Any] | None] | None = None,
     nameservers: list[tuple[str, int]] | None = None,
     resume: bool = False,
+    workers: int = 1,
+    shard: tuple[int, int] | None = None,
+    rate: float | None = None,
+    rate_per_resolver: float | None = None,
+    adaptive_concurrency: bool = False,
+    deadline: float | None = None,
+    worker_executor: str = "processes",
+    sweep: bool = True,
+    record_types: Sequence[str] | None = None,
+    harvest: bool = False,
+    bind: Sequence[str] | None = None,
+    dedupe_memory: int | None = None,
+    mutate: bool = False,
+    mutate_budget: int = DEFAULT_MUTATION_BUDGET,
+    recursive: int = 0,
+    recursive_wordlist: Path | None = None,
+    query_budget: int | None = None,
+    patterns: Sequence[str] | None = None,
+    pattern_sets: Mapping[str, Sequence[str]] | None = None,
+    label_model: LabelModel | None = None,
+    generate: int = 0,
+    prioritized: Sequence[str] = (),
+    chunk_dispatcher: ChunkDispatcher | None = None,
+    track_domains: bool = False,
 ) -> ScanSummary:
-    if only_resolved and statuses is not None:
-        raise ValueError("only_resolved and statuses cannot both be set")
-    if only_resolved:
-        statuses = {"resolved"}
-    if include_cname and nameservers is None:
-        raise ValueError("include_cname requires custom resolver mode (--resolver/--resolver-file)")
-    labels_iter: Iterable[str] = labels
-    if extra_labels:
-        labels_iter = itertools.chain(labels_iter, extra_labels)
-    resume_seen_labels = _load_resume_labels(out_path, domain=domain) if resume else None
+    statuses = _output_statuses(only_resolved=only_resolved, statuses=statuses)
+    extra_by_domain: Mapping[str, Iterable[str]] | None
+    if extra_labels is None or isinstance(extra_labels, Mapping):
+        extra_by_domain = extra_labels
+    else:
+        # A flat label list applies to every target domain.
+        shared_extra = list(extra_labels)
+        extra_by_domain = {domain: shared_extra for domain in domains}
+    dedupe_memory = _dedupe_share(
+        dedupe_memory,
+        resume=resume,
+        harvest=harvest,
+        mutate=mutate,
+        recursive=recursive,
+        query_budget=query_budget,
+        nameservers=nameservers,
+    )
+    resume_seen = (
+        _load_resume_labels(out_path, domains=domains, shard=shard, dedupe_memory=dedupe_memory)
+        if resume
+        else None
+    )
+    label_stats = _LabelStats()
+    if generate:
+        if label_model is None:
+            raise ValueError("generate requires a label model")
+        labels = itertools.chain(_count_generated(label_model, generate, label_stats), labels)
+        if word_count is not None:
+            word_count += generate
+    if prioritized:
+        # The wordlist's historically frequent labels go first (best first), ahead of generated
+        # labels; `labels` holds the rest of the wordlist.
+        labels = itertools.chain(prioritized, labels)
+        label_stats.prioritized = len(prioritized)
+    if patterns:
+        sets = {name.lower(): values for name, values in (pattern_sets or {}).items()}
+        parsed = [parse_pattern(template, sets) for template in patterns]
+        if word_count is not None:
+            label_stats.planned = count_expansions(parsed, word_count) + ct_labels_count
+
+        def count_invalid(count: int) -> None:
+            label_stats.invalid += count
+
+        labels = expand_patterns(labels, parsed, on_invalid=count_invalid)
     return _scan_core(
-        domain=domain,
-        labels=labels_iter,
+        candidates=_iter_domain_candidates(
+            domains,
+            labels,
+            extra_labels=extra_by_domain,
+            resume_seen=resume_seen,
+            stats=label_stats,
+            shard=shard,
+            dedupe_memory=dedupe_memory,
+        ),
+        label_stats=label_stats,
         out_path=out_path,
         timeout=timeout,
         concurrency=concurrency,
@@ -660,8 +2056,137 @@ def _scan_domains_summary_labels(
         ct_labels=ct_labels_count,
         takeover_checker=takeover_checker,
         nameservers=nameservers,
-        resume_seen_labels=resume_seen_labels,
         append_out=bool(resume),
+        workers=workers,
+        shard=shard,
+        rate=rate,
+        rate_per_resolver=rate_per_resolver,
+        adaptive_concurrency=adaptive_concurrency,
+        deadline=deadline,
+        worker_executor=worker_executor,
+        sweep=sweep,
+        record_types=record_types,
+        harvest=harvest,
+        bind=bind,
+        dedupe_memory=dedupe_memory,
+        mutate=mutate,
+        mutate_budget=mutate_budget,
+        recursive=recursive,
+        recursive_wordlist=recursive_wordlist,
+        query_budget=query_budget,
+        chunk_dispatcher=chunk_dispatcher,
+        track_domains=track_domains,
+    )
+
+
+def scan_hosts_summary_lines(
+    *,
+    hosts_lines: Iterable[str],
+    out_path: Path | None,
+    timeout: float,
+    concurrency: int = 20,
+    only_resolved: bool = False,
+    statuses: set[str] | None = None,
+    detect_wildcard: bool = False,
+    wildcard_probes: int = 2,
+    wildcard_threshold: int = 1,
+    wildcard_verify_http: bool = False,
+    wildcard_http_timeout: float = 3.0,
+    include_cname: bool = False,
+    progress_stream: TextIO | None = None,
+    progress_every_s: float = 2.0,
+    retries: int = 0,
+    retry_backoff_ms: int = 50,
+    takeover_checker: Callable[[str], dict[str, Any] | None] | None = None,
+    nameservers: list[tuple[str, int]] | None = None,
+    resume: bool = False,
+    workers: int = 1,
+    shard: tuple[int, int] | None = None,
+    rate: float | None = None,
+    rate_per_resolver: float | None = None,
+    adaptive_concurrency: bool = False,
+    deadline: float | None = None,
+    worker_executor: str = "processes",
+    sweep: bool = True,
+    record_types: Sequence[str] | None = None,
+    harvest: bool = False,
+    bind: Sequence[str] | None = None,
+    dedupe_memory: int | None = None,
+    mutate: bool = False,
+    mutate_budget: int = DEFAULT_MUTATION_BUDGET,
+    recursive: int = 0,
+    recursive_wordlist: Path | None = None,
+    query_budget: int | None = None,
+    chunk_dispatcher: ChunkDispatcher | None = None,
+) -> ScanSummary:
+    """
+    Scan fully qualified hostnames (one per line) instead of wordlist labels under a domain.
+
+    Hosts may span any number of zones; input is streamed with the same comment and whitespace
+    rules as wordlists.
+    """
+    statuses = _output_statuses(only_resolved=only_resolved, statuses=statuses)
+    dedupe_memory = _dedupe_share(
+        dedupe_memory,
+        resume=resume,
+        harvest=harvest,
+        mutate=mutate,
+        recursive=recursive,
+        query_budget=query_budget,
+        nameservers=nameservers,
+    )
+    resume_seen = (
+        _load_resume_labels(out_path, domains=None, shard=shard, dedupe_memory=dedupe_memory)
+        if resume
+        else None
+    )
+    label_stats = _LabelStats()
+    return _scan_core(
+        candidates=_iter_host_candidates(
+            hosts_lines,
+            resume_seen=resume_seen,
+            stats=label_stats,
+            shard=shard,
+            dedupe_memory=dedupe_memory,
+        ),
+        label_stats=label_stats,
+        out_path=out_path,
+        timeout=timeout,
+        concurrency=concurrency,
+        statuses=statuses,
+        detect_wildcard=detect_wildcard,
+        wildcard_probes=wildcard_probes,
+        wildcard_threshold=wildcard_threshold,
+        wildcard_verify_http=wildcard_verify_http,
+        wildcard_http_timeout=wildcard_http_timeout,
+        include_cname=include_cname,
+        progress_stream=progress_stream,
+        progress_every_s=progress_every_s,
+        retries=retries,
+        retry_backoff_ms=retry_backoff_ms,
+        ct_labels=0,
+        takeover_checker=takeover_checker,
+        nameservers=nameservers,
+        append_out=bool(resume),
+        workers=workers,
+        shard=shard,
+        rate=rate,
+        rate_per_resolver=rate_per_resolver,
+        adaptive_concurrency=adaptive_concurrency,
+        deadline=deadline,
+        worker_executor=worker_executor,
+        sweep=sweep,
+        record_types=record_types,
+        harvest=harvest,
+        bind=bind,
+        dedupe_memory=dedupe_memory,
+        mutate=mutate,
+        mutate_budget=mutate_budget,
+        recursive=recursive,
+        recursive_wordlist=recursive_wordlist,
+        query_budget=query_budget,
+        chunk_dispatcher=chunk_dispatcher,
+        track_domains=False,
     )
 
 
@@ -688,6 +2213,8 @@ def _detect_wildcard_ipsets(
     probes: int,
     timeout: float,
     nameservers: list[tuple[str, int]] | None,
+    limiter: RateLimiter | None = None,
+    sources: SourceAddresses | None = None,
 ) -> dict[frozenset[str], int]:
     hits: dict[frozenset[str], int] = {}
     for _ in range(probes):
@@ -697,6 +2224,8 @@ def _detect_wildcard_ipsets(
             timeout=timeout,
             nameservers=nameservers,
             include_cname=False,
+            limiter=limiter,
+            sources=sources,
         )
         if res.status != "resolved" or not res.ips:
             continue
@@ -705,14 +2234,31 @@ def _detect_wildcard_ipsets(
     return hits
 
 
-def _load_resume_labels(out_path: Path | None, *, domain: str) -> set[str]:
+_RESUME_BATCH = 1024
+
+
+def _load_resume_labels(
+    out_path: Path | None,
+    *,
+    domains: Sequence[str] | None,
+    shard: tuple[int, int] | None = None,
+    dedupe_memory: int | None = None,
+) -> FingerprintSet:
+    """
+    Collect the `label.domain` names already recorded under a target domain in `out_path`.
+
+    With `domains=None` (hosts mode) every recorded name with a parent zone is collected.
+    With `shard`, names owned by other shards are ignored so merged outputs resume correctly.
+    """
     if out_path is None:
         raise ValueError("resume requires file output (--out path, not '-')")
+    seen = _dedupe_set(dedupe_memory)
     if not out_path.exists():
-        return set()
+        return seen
+    targets = None if domains is None else set(domains)
+    # Names under a target are validated in batches: a recorded name is `label.domain` itself.
+    pending: list[str] = []
 
-    suffix = f".{domain}"
-    seen: set[str] = set()
     with out_path.open("r", encoding="utf-8") as fh:
         for raw in fh:
             line = raw.strip()
@@ -728,16 +2274,27 @@ def _load_resume_labels(out_path: Path | None, *, domain: str) -> set[str]:
             if not isinstance(subdomain_raw, str):
                 continue
             subdomain = subdomain_raw.strip().strip(".").lower()
-            if not subdomain.endswith(suffix) or subdomain == domain:
+            if not _in_shard(subdomain, shard):
                 continue
-            label = subdomain[: -len(suffix)]
-            if not label:
-                continue
-            try:
-                normalized = normalize_label(label)
-            except ValueError:
+            if targets is None:
+                label, _, zone = subdomain.partition(".")
+                if label and zone:
+                    seen.add(subdomain)
                 continue
-            seen.add(normalized)
+            # A name can sit under more than one target (e.g. example.com and dev.example.com);
+            # it is the same key for each, so one parent in the target set is enough.
+            pos = subdomain.find(".")
+            while pos != -1:
+                if subdomain[pos + 1 :] in targets:
+                    pending.append(subdomain)
+                    break
+                pos = subdomain.find(".", pos + 1)
+            if len(pending) >= _RESUME_BATCH:
+                for name in normalize_domains(pending, skip_invalid=True):
+                    seen.add(name)
+                pending.clear()
+    for name in normalize_domains(pending, skip_invalid=True):
+        seen.add(name)
     return seen
 
 
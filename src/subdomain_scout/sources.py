@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import ipaddress
+import itertools
+import socket
+import threading
+from typing import Iterator, Sequence
+
+
+class SourceAddresses:
+    """
+    Thread-safe round robin over local source addresses for outgoing queries (`--bind`).
+
+    IPv4 sources are used for IPv4 resolvers and IPv6 sources for IPv6 ones; a resolver whose
+    family has no source falls back to the kernel's choice. Counts queries and errors per source.
+    """
+
+    def __init__(self, addresses: Sequence[str]) -> None:
+        normalized: list[str] = []
+        for raw in addresses:
+            try:
+                address = str(ipaddress.ip_address(str(raw).strip()))
+            except ValueError as e:
+                raise ValueError(f"invalid source address: {raw!r}") from e
+            if address in normalized:
+                continue
+            # Fail fast on addresses this host does not own instead of erroring on every query.
+            try:
+                with socket.socket(_family(address), socket.SOCK_DGRAM) as probe:
+                    probe.bind((address, 0))
+            except OSError as e:
+                raise ValueError(f"cannot bind source address {address}: {e.strerror}") from e
+            normalized.append(address)
+        if not normalized:
+            raise ValueError("source addresses must be non-empty")
+        self.addresses = tuple(normalized)
+        self._lock = threading.Lock()
+        self._cycles: dict[int, Iterator[str]] = {}
+        for family in (socket.AF_INET, socket.AF_INET6):
+            members = [a for a in normalized if _family(a) == family]
+            if members:
+                self._cycles[family] = itertools.cycle(members)
+        self._queries = dict.fromkeys(normalized, 0)
+        self._errors = dict.fromkeys(normalized, 0)
+
+    def pick(self, nameserver_host: str) -> str | None:
+        """Return the next source address for a query to `nameserver_host`, and count it."""
+        with self._lock:
+            cycle = self._cycles.get(_family(nameserver_host))
+            if cycle is None:
+                return None
+            address = next(cycle)
+            self._queries[address] += 1
+            return address
+
+    def failed(self, address: str | None) -> None:
+        """Count a query sent from `address` that timed out, failed or got an error rcode."""
+        if address is None:
+            return
+        with self._lock:
+            self._errors[address] = self._errors.get(address, 0) + 1
+
+    def snapshot(self) -> dict[str, tuple[int, int]]:
+        """Return {address: (queries, errors)}."""
+        with self._lock:
+            return {
+                address: (count, self._errors.get(address, 0))
+                for address, count in self._queries.items()
+            }
+
+
+def _family(host: str) -> int:
+    return socket.AF_INET6 if ":" in host else socket.AF_INET
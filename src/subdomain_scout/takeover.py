@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 import urllib.error
 import urllib.request
@@ -64,11 +65,8 @@ def build_takeover_checker(
     if timeout <= 0:
         raise ValueError("takeover timeout must be > 0")
     catalog = load_fingerprint_catalog(fingerprints_path)
-
-    def check(hostname: str) -> dict[str, Any] | None:
-        return detect_takeover(hostname, timeout=timeout, catalog=catalog)
-
-    return check
+    # A partial (not a closure) so the checker can be shipped to `scan --workers` processes.
+    return functools.partial(detect_takeover, timeout=timeout, catalog=catalog)
 
 
 def load_fingerprint_catalog(path: Path | None) -> FingerprintCatalog:
@@ -77,7 +75,10 @@ def load_fingerprint_catalog(path: Path | None) -> FingerprintCatalog:
 
     with path.open("r", encoding="utf-8") as fh:
         raw = json.load(fh)
+    return parse_fingerprint_catalog(raw)
+
 
+def parse_fingerprint_catalog(raw: object) -> FingerprintCatalog:
     if not isinstance(raw, dict):
         raise ValueError("takeover fingerprint catalog must be a JSON object")
 
@@ -127,6 +128,21 @@ def load_fingerprint_catalog(path: Path | None) -> FingerprintCatalog:
     return FingerprintCatalog(version=version.strip(), fingerprints=tuple(fingerprints))
 
 
+def catalog_to_dict(catalog: FingerprintCatalog) -> dict[str, Any]:
+    """Inverse of `parse_fingerprint_catalog` (same JSON shape as custom catalog files)."""
+    return {
+        "version": catalog.version,
+        "fingerprints": [
+            {
+                "service": fp.service,
+                "body_substrings": list(fp.body_substrings),
+                "status_codes": list(fp.status_codes),
+            }
+            for fp in catalog.fingerprints
+        ],
+    }
+
+
 def detect_takeover(
     hostname: str,
     *,
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import re
+from pathlib import Path
+from typing import Sequence
 
 _LABEL_RE = re.compile(r"^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$")
+# The same rule as _LABEL_RE for every dot-separated part, checked in a single match.
+_HOSTNAME_RE = re.compile(
+    r"(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)*[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?"
+)
 
 
 def normalize_domain(raw: str) -> str:
     domain = str(raw).strip().strip(".").lower()
     if not domain:
         raise ValueError("domain must be non-empty")
-    _validate_hostname(domain, allow_single_label=False, value_name="domain")
+    if not _is_hostname(domain) or "." not in domain:
+        _validate_hostname(domain, allow_single_label=False, value_name="domain")
     return domain
 
 
@@ -17,10 +24,76 @@ def normalize_label(raw: str) -> str:
     label = str(raw).strip().strip(".").lower()
     if not label:
         raise ValueError("label must be non-empty")
-    _validate_hostname(label, allow_single_label=True, value_name="label")
+    if not _is_hostname(label):
+        _validate_hostname(label, allow_single_label=True, value_name="label")
     return label
 
 
+def normalize_labels(raw_labels: Sequence[str], *, skip_invalid: bool = False) -> list[str]:
+    """
+    Normalize a batch of labels with the rules of `normalize_label`, keeping order.
+
+    Raises ValueError for the first invalid entry (with `normalize_label`'s message), or drops
+    invalid entries with `skip_invalid`. Much cheaper per name than calling `normalize_label`
+    in a loop, especially when the batch repeats labels.
+    """
+    return _normalize_batch(raw_labels, single_label=True, skip_invalid=skip_invalid)
+
+
+def normalize_domains(raw_domains: Sequence[str], *, skip_invalid: bool = False) -> list[str]:
+    """Normalize a batch of domains or hostnames with the rules of `normalize_domain`."""
+    return _normalize_batch(raw_domains, single_label=False, skip_invalid=skip_invalid)
+
+
+def _normalize_batch(raws: Sequence[str], *, single_label: bool, skip_invalid: bool) -> list[str]:
+    unique = dict.fromkeys(raws)
+    if len(unique) * 2 > len(raws):
+        normalized = _normalize_all(raws, single_label=single_label)
+    else:
+        # Mostly repeats: normalize each distinct entry once and map the batch through it.
+        keys = list(unique)
+        memo = dict(zip(keys, _normalize_all(keys, single_label=single_label)))
+        normalized = [memo[raw] for raw in raws]
+    if skip_invalid:
+        return [value for value in normalized if value is not None]
+    if None in normalized:
+        normalize = normalize_label if single_label else normalize_domain
+        normalize(raws[normalized.index(None)])  # raises with the precise reason
+    return normalized  # type: ignore[return-value]
+
+
+def _normalize_all(raws: Sequence[str], *, single_label: bool) -> list[str | None]:
+    # One combined regex match per name, with the per-name work done in list comprehensions and
+    # map() rather than a Python-level call per name.
+    values = [raw.strip().strip(".").lower() for raw in raws]
+    return [
+        value
+        if match is not None and len(value) <= 253 and (single_label or "." in value)
+        else None
+        for value, match in zip(values, map(_HOSTNAME_RE.fullmatch, values))
+    ]
+
+
+def _is_hostname(value: str) -> bool:
+    return len(value) <= 253 and _HOSTNAME_RE.fullmatch(value) is not None
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse a 1-based shard spec like "2/8" into (index, count)."""
+    raw = str(spec).strip()
+    index_raw, sep, count_raw = raw.partition("/")
+    try:
+        if not sep:
+            raise ValueError
+        index = int(index_raw)
+        count = int(count_raw)
+    except ValueError as e:
+        raise ValueError(f"invalid shard {raw!r} (expected i/N, e.g. 1/4)") from e
+    if count < 1 or not (1 <= index <= count):
+        raise ValueError(f"invalid shard {raw!r} (index must be between 1 and N)")
+    return index, count
+
+
 def _validate_hostname(value: str, *, allow_single_label: bool, value_name: str) -> None:
     if len(value) > 253:
         raise ValueError(f"{value_name} is too long (max 253 characters)")
@@ -31,3 +104,32 @@ def _validate_hostname(value: str, *, allow_single_label: bool, value_name: str)
     for part in parts:
         if not _LABEL_RE.match(part):
             raise ValueError(f"invalid {value_name}: {value!r}")
+
+
+def load_domains_file(path: Path) -> list[str]:
+    """
+    Load target domains from a file.
+
+    - Skips blank lines and lines starting with '#'.
+    - Allows inline comments after '#'.
+    - Dedupes entries while preserving order.
+    """
+    entries: list[tuple[int, str]] = []
+    with path.open("r", encoding="utf-8") as fh:
+        for lineno, raw_line in enumerate(fh, start=1):
+            line = raw_line.split("#", 1)[0].strip()
+            if line:
+                entries.append((lineno, line.split(maxsplit=1)[0]))
+    try:
+        normalized = normalize_domains([entry for _, entry in entries])
+    except ValueError:
+        for lineno, entry in entries:
+            try:
+                normalize_domain(entry)
+            except ValueError as e:
+                raise ValueError(f"invalid domain in {path}:{lineno}: {e}") from e
+        raise
+    domains = list(dict.fromkeys(normalized))
+    if not domains:
+        raise ValueError(f"domains file {path} contains no valid entries")
+    return domains
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import itertools
+import mmap
+import multiprocessing
+import os
+import struct
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence, TextIO
+
+from .compression import detect_compression, open_text
+from .dedupe import FingerprintSet
+from .validation import normalize_label, normalize_labels
+
+# Plain-text wordlists at least this large are memory-mapped and normalized in worker processes;
+# below it, process start-up costs more than the parsing it saves.
+_PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+_CHUNK_BYTES = 8 * 1024 * 1024
+_NORMALIZE_BATCH = 1024
+
+# Compiled wordlist (`wordlist compile`): a fixed header followed by one record per label.
+#   magic(8) version(u16) flags(u16) reserved(u32) count(u64) sha256(32)
+# Each record is a length-prefixed ASCII label, followed (with _FLAG_WIRE) by the length-prefixed
+# DNS wire form of the label (length octet + bytes per dot-separated part, no root terminator).
+# The digest covers every record byte, so equal label lists compile to equal hashes.
+_COMPILED_MAGIC = b"SDSCOUTW"
+_COMPILED_VERSION = 1
+_COMPILED_HEADER = struct.Struct("!8sHHIQ32s")
+_FLAG_WIRE = 0x0001
+
+
+@dataclass(frozen=True)
+class CompiledWordlist:
+    labels: int
+    wire: bool
+    sha256: str
+    labels_total: int = 0
+    labels_deduped: int = 0
+    size_bytes: int = 0
+
+
+def _iter_entries(lines: Iterable[str]) -> Iterator[str]:
+    # First whitespace-separated token per line; blank and '#' comment lines are skipped.
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        entry = line.split(maxsplit=1)[0].strip(".")
+        if not entry or entry.startswith("#"):
+            continue
+        yield entry
+
+
+def _iter_labels_lines(lines: Iterable[str]) -> Iterable[str]:
+    return _iter_normalized(_iter_entries(lines), normalize_labels, normalize_label)
+
+
+def _iter_normalized(
+    entries: Iterable[str],
+    normalize_batch: Callable[[Sequence[str]], list[str]],
+    normalize_one: Callable[[str], str],
+) -> Iterator[str]:
+    # Normalize in batches; small enough that a slow pipe is not held back for long.
+    it = iter(entries)
+    while batch := list(itertools.islice(it, _NORMALIZE_BATCH)):
+        try:
+            normalized = normalize_batch(batch)
+        except ValueError:
+            # Yield the valid entries before the bad one, then raise its error, exactly as
+            # item-by-item normalization would.
+            for entry in batch:
+                yield normalize_one(entry)
+            raise
+        yield from normalized
+
+
+def _iter_labels(wordlist: Path) -> Iterable[str]:
+    if _is_compiled(wordlist):
+        yield from _iter_compiled(wordlist)
+        return
+    workers = os.cpu_count() or 1
+    if (
+        workers > 1
+        and wordlist.is_file()
+        and wordlist.stat().st_size >= _PARALLEL_MIN_BYTES
+        and detect_compression(wordlist) is None
+    ):
+        yield from _iter_labels_mmap(wordlist, workers=workers)
+        return
+    with open_text(wordlist) as fh:
+        yield from _iter_labels_lines(fh)
+
+
+def _count_labels(wordlist: Path) -> int:
+    """Count the labels `_iter_labels` yields, without normalizing them."""
+    if _is_compiled(wordlist):
+        return read_compiled_header(wordlist).labels
+    with open_text(wordlist) as fh:
+        return sum(1 for _ in _iter_entries(fh))
+
+
+def _iter_labels_mmap(
+    wordlist: Path, *, workers: int, chunk_bytes: int = _CHUNK_BYTES
+) -> Iterator[str]:
+    """
+    Stream normalized labels from a memory-mapped wordlist, parsing chunks in worker processes.
+
+    The file is cut into chunks of about `chunk_bytes` at newline boundaries; each worker maps
+    the file itself and normalizes its byte range with the same rules as `_iter_labels_lines`.
+    A chunk whose entries are already in normal form (the usual case) comes back as a flag and
+    is re-split here, so only chunks that normalization changed pay for shipping their labels.
+    Results are yielded in file order with at most `2 * workers` chunks in flight, so memory
+    stays bounded however far ahead the workers get. An invalid label raises on the consumer
+    once everything before it has been yielded, exactly like the line-by-line reader.
+
+    Workers are started with forkserver (or spawn) rather than fork: by the time the stream is
+    first advanced, resolver and coordinator threads may already be running.
+    """
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be >= 1")
+    with wordlist.open("rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bounds = _chunk_bounds(mm, chunk_bytes)
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context())
+            try:
+                in_flight: collections.deque[tuple[int, int, Future[_ChunkLabels]]] = (
+                    collections.deque()
+                )
+                for start, end in bounds:
+                    future = pool.submit(_normalize_chunk, str(wordlist), start, end)
+                    in_flight.append((start, end, future))
+                    if len(in_flight) >= workers * 2:
+                        yield from _chunk_labels(mm, *in_flight.popleft())
+                while in_flight:
+                    yield from _chunk_labels(mm, *in_flight.popleft())
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _chunk_bounds(data: mmap.mmap, chunk_bytes: int) -> Iterator[tuple[int, int]]:
+    size = len(data)
+    start = 0
+    while start < size:
+        cut = start + chunk_bytes
+        if cut >= size:
+            end = size
+        else:
+            newline = data.find(b"\n", cut - 1)
+            end = size if newline == -1 else newline + 1
+        yield start, end
+        start = end
+
+
+# A chunk's labels (None: its entries are already normalized, re-split them from the file),
+# and the error of the invalid label that cut it short, if any.
+_ChunkLabels = tuple[list[str] | None, str | None]
+
+
+def _chunk_labels(
+    data: mmap.mmap, start: int, end: int, future: Future[_ChunkLabels]
+) -> Iterator[str]:
+    labels, error = future.result()
+    if labels is None:
+        yield from _iter_entries(_chunk_lines(data[start:end]))
+    else:
+        yield from labels
+    if error is not None:
+        raise ValueError(error)
+
+
+def _chunk_lines(data: bytes) -> list[str]:
+    # Universal newlines, as in text mode: "\r\n" and a lone "\r" both end a line.
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+
+def _normalize_chunk(path: str, start: int, end: int) -> _ChunkLabels:
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entries = list(_iter_entries(_chunk_lines(mm[start:end])))
+    labels: list[str] = []
+    try:
+        for label in _iter_normalized(entries, normalize_labels, normalize_label):
+            labels.append(label)
+    except ValueError as e:
+        # Keep the valid labels before the bad one; the reader yields them, then raises.
+        return labels, str(e)
+    return (None if labels == entries else labels), None
+
+
+def compile_wordlist(
+    wordlist: Path | TextIO, out_path: Path, *, wire: bool = False
+) -> CompiledWordlist:
+    """
+    Compile a wordlist (path or text stream) into `out_path`, dropping duplicate labels.
+
+    Entries are parsed and validated exactly as `scan --wordlist` does, keeping first-occurrence
+    order. The file is written next to `out_path` and renamed into place once complete, so a
+    failed compile never leaves a partial file behind.
+    """
+    labels = _iter_labels(wordlist) if isinstance(wordlist, Path) else _iter_labels_lines(wordlist)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    digest = hashlib.sha256()
+    seen = FingerprintSet()
+    total = 0
+    try:
+        with tmp_path.open("wb") as out:
+            out.write(b"\0" * _COMPILED_HEADER.size)
+            for label in labels:
+                total += 1
+                if not seen.add(label):
+                    continue
+                record = _encode_record(label, wire=wire)
+                digest.update(record)
+                out.write(record)
+            out.seek(0)
+            out.write(
+                _COMPILED_HEADER.pack(
+                    _COMPILED_MAGIC,
+                    _COMPILED_VERSION,
+                    _FLAG_WIRE if wire else 0,
+                    0,
+                    len(seen),
+                    digest.digest(),
+                )
+            )
+            size = out.seek(0, os.SEEK_END)
+        unique = len(seen)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        seen.close()
+    tmp_path.replace(out_path)
+    return CompiledWordlist(
+        labels=unique,
+        wire=wire,
+        sha256=digest.hexdigest(),
+        labels_total=total,
+        labels_deduped=total - unique,
+        size_bytes=size,
+    )
+
+
+def read_compiled_header(path: Path) -> CompiledWordlist:
+    """Return the header of a compiled wordlist; raises ValueError if `path` is not one."""
+    with path.open("rb") as fh:
+        header = fh.read(_COMPILED_HEADER.size)
+        size = os.fstat(fh.fileno()).st_size
+    return _parse_header(header, size=size)
+
+
+def _parse_header(header: bytes, *, size: int) -> CompiledWordlist:
+    if len(header) < _COMPILED_HEADER.size or not header.startswith(_COMPILED_MAGIC):
+        raise ValueError("not a compiled wordlist")
+    _magic, version, flags, _reserved, count, digest = _COMPILED_HEADER.unpack_from(header)
+    if version != _COMPILED_VERSION:
+        raise ValueError(f"unsupported compiled wordlist version: {version}")
+    return CompiledWordlist(
+        labels=count,
+        wire=bool(flags & _FLAG_WIRE),
+        sha256=digest.hex(),
+        labels_total=count,
+        size_bytes=size,
+    )
+
+
+def _encode_record(label: str, *, wire: bool) -> bytes:
+    text = label.encode("ascii")
+    record = bytearray((len(text),))
+    record += text
+    if wire:
+        encoded = bytearray()
+        for part in text.split(b"."):
+            encoded.append(len(part))
+            encoded += part
+        record.append(len(encoded))
+        record += encoded
+    return bytes(record)
+
+
+def _is_compiled(path: Path) -> bool:
+    try:
+        with path.open("rb") as fh:
+            return fh.read(len(_COMPILED_MAGIC)) == _COMPILED_MAGIC
+    except (IsADirectoryError, FileNotFoundError):
+        return False
+
+
+def _iter_compiled(path: Path) -> Iterator[str]:
+    for label, _wire in _iter_compiled_records(path):
+        yield label
+
+
+def _iter_compiled_records(path: Path) -> Iterator[tuple[str, bytes | None]]:
+    """
+    Stream (label, wire form or None) from a compiled wordlist.
+
+    Labels were validated and deduplicated when the file was compiled, so they are yielded as
+    stored; only the record framing is checked, and a truncated or padded file raises ValueError.
+    """
+    with path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header = _parse_header(mm[: _COMPILED_HEADER.size], size=size)
+            pos = _COMPILED_HEADER.size
+            for _ in range(header.labels):
+                if pos >= size:
+                    raise ValueError("truncated compiled wordlist")
+                end = pos + 1 + mm[pos]
+                label = mm[pos + 1 : end].decode("ascii")
+                wire: bytes | None = None
+                if header.wire:
+                    if end >= size:
+                        raise ValueError("truncated compiled wordlist")
+                    wire_end = end + 1 + mm[end]
+                    wire = mm[end + 1 : wire_end]
+                    end = wire_end
+                if end > size:
+                    raise ValueError("truncated compiled wordlist")
+                pos = end
+                yield label, wire
+            if pos != size:
+                raise ValueError("trailing data in compiled wordlist")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import socketserver
+import struct
+import threading
+from typing import Final, Iterator
+
+import pytest
+
+
+class _DnsHandler(socketserver.BaseRequestHandler):
+    A_RDATA: Final[bytes] = b"\x01\x02\x03\x04"  # 1.2.3.4
+    CNAME_TO_A: Final[bytes] = b"\x01a\x03res\x04test\x00"  # a.res.test
+    CNAME_TO_MISSING: Final[bytes] = b"\x07missing\x03res\x04test\x00"  # missing.res.test
+    # a.res.test posture records for --record-types.
+    EXTRA_RDATA: Final[dict[int, bytes]] = {
+        15: b"\x00\x0a\x04mail\xc0\x0e",  # MX 10 mail.res.test (pointer to "res.test")
+        16: b"\x06v=spf1\x05 -all",  # TXT split over two character-strings
+        257: b"\x00\x05issueletsencrypt.org",  # CAA 0 issue "letsencrypt.org"
+        65: b"\x00\x01",  # HTTPS, rendered in RFC 3597 form
+    }
+
+    def handle(self) -> None:
+        data, sock = self.request
+        if len(data) < 12:
+            return
+        rid = struct.unpack("!H", data[:2])[0]
+
+        try:
+            qname, qtype, qclass, qend = _parse_question(data)
+        except ValueError:
+            return
+
+        question = data[12:qend]
+
+        if qclass != 1:
+            # REFUSED
+            hdr = struct.pack("!HHHHHH", rid, 0x8185, 1, 0, 0, 0)
+            sock.sendto(hdr + question, self.client_address)
+            return
+
+        if qname == "a.res.test" and qtype == 1:
+            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 1, 2, 1)
+            # NAME pointer to offset 12
+            ans = (
+                b"\xc0\x0c"
+                + struct.pack("!H", 1)  # TYPE A
+                + struct.pack("!H", 1)  # CLASS IN
+                + struct.pack("!I", 60)  # TTL
+                + struct.pack("!H", len(self.A_RDATA))
+                + self.A_RDATA
+            )
+            # Authority: in-zone and out-of-zone NS; additional: glue for the in-zone one.
+            res_test = b"\x03res\x04test\x00"
+            ns_in = b"\x03ns1" + res_test
+            ns_out = b"\x02ns\x05other\x04test\x00"
+            authority = b"".join(
+                res_test + struct.pack("!HHIH", 2, 1, 60, len(target)) + target
+                for target in (ns_in, ns_out)
+            )
+            glue = ns_in + struct.pack("!HHIH", 1, 1, 60, 4) + self.A_RDATA
+            sock.sendto(hdr + question + ans + authority + glue, self.client_address)
+            return
+
+        if qname == "a.res.test" and qtype in self.EXTRA_RDATA:
+            rdata = self.EXTRA_RDATA[qtype]
+            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 1, 0, 0)
+            ans = b"\xc0\x0c" + struct.pack("!HHIH", qtype, 1, 300, len(rdata)) + rdata
+            sock.sendto(hdr + question + ans, self.client_address)
+            return
+
+        if qname == "t.res.test":
+            # TXT-only name: NOERROR with an empty answer (NODATA) for every other type.
+            rdata = self.EXTRA_RDATA[16]
+            answers = 1 if qtype == 16 else 0
+            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, answers, 0, 0)
+            ans = b"\xc0\x0c" + struct.pack("!HHIH", 16, 1, 300, len(rdata)) + rdata
+            sock.sendto(hdr + question + (ans if answers else b""), self.client_address)
+            return
+
+        if qname == "a.res.test" and qtype == 28:
+            # NOERROR, empty AAAA
+            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 0, 0, 0)
+            sock.sendto(hdr + question, self.client_address)
+            return
+
+        if qname == "b.res.test" and qtype in {1, 28}:
+            # Return only a CNAME (no A/AAAA); client should follow to a.res.test.
+            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 1, 0, 0)
+            ans = (
+                b"\xc0\x0c"
+                + struct.pack("!H", 5)  # TYPE CNAME
+                + struct.pack("!H", 1)  # CLASS IN
+                + struct.pack("!I", 60)  # TTL
+                + struct.pack("!H", len(self.CNAME_TO_A))
+                + self.CNAME_TO_A
+            )
+            sock.sendto(hdr + question + ans, self.client_address)
+            return
+
+        if qname == "d.res.test" and qtype in {1, 28}:
+            # CNAME-only response that points to a missing name; should be surfaced as status=cname
+            # when --include-cname is enabled.
+            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 1, 0, 0)
+            ans = (
+                b"\xc0\x0c"
+                + struct.pack("!H", 5)  # TYPE CNAME
+                + struct.pack("!H", 1)  # CLASS IN
+                + struct.pack("!I", 60)  # TTL
+                + struct.pack("!H", len(self.CNAME_TO_MISSING))
+                + self.CNAME_TO_MISSING
+            )
+            sock.sendto(hdr + question + ans, self.client_address)
+            return
+
+        # NXDOMAIN for everything else, with the zone SOA (MNAME ns0.res.test) in authority.
+        hdr = struct.pack("!HHHHHH", rid, 0x8183, 1, 0, 1, 0)
+        soa_rdata = (
+            b"\x03ns0\x03res\x04test\x00"
+            + b"\x0ahostmaster\x03res\x04test\x00"
+            + struct.pack("!IIIII", 1, 3600, 600, 86400, 60)
+        )
+        soa = b"\x03res\x04test\x00" + struct.pack("!HHIH", 6, 1, 60, len(soa_rdata)) + soa_rdata
+        sock.sendto(hdr + question + soa, self.client_address)
+
+
+def _parse_question(data: bytes) -> tuple[str, int, int, int]:
+    off = 12
+    labels: list[str] = []
+    while True:
+        if off >= len(data):
+            raise ValueError("truncated qname")
+        ln = data[off]
+        off += 1
+        if ln == 0:
+            break
+        if off + ln > len(data):
+            raise ValueError("truncated label")
+        labels.append(data[off : off + ln].decode("ascii", errors="ignore"))
+        off += ln
+    if off + 4 > len(data):
+        raise ValueError("truncated qtype/qclass")
+    qtype, qclass = struct.unpack("!HH", data[off : off + 4])
+    off += 4
+    return ".".join(labels).lower(), int(qtype), int(qclass), off
+
+
+@pytest.fixture()
+def dns_server() -> Iterator[tuple[str, int]]:
+    server = socketserver.UDPServer(("127.0.0.1", 0), _DnsHandler)
+    host, port = server.server_address
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield str(host), int(port)
+    finally:
+        server.shutdown()
+        server.server_close()
+        t.join(timeout=1)
@@ -164,3 +164,258 @@ def test_scan_resume_requires_file_output(tmp_path: Path) -> None:
     )
     assert proc.returncode == 2
     assert "resume requires file output" in proc.stderr.lower()
+
+
+def test_scan_domains_file_emits_per_domain_summaries(tmp_path: Path) -> None:
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("www\n", encoding="utf-8")
+    domains = tmp_path / "domains.txt"
+    domains.write_text("one.invalid.test\ntwo.invalid.test\n", encoding="utf-8")
+
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--domains-file",
+            str(domains),
+            "--wordlist",
+            str(wordlist),
+            "--out",
+            "-",
+            "--summary-json",
+            "--only-resolved",
+            "--timeout",
+            "0.1",
+            "--concurrency",
+            "1",
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0
+    payload = json.loads(proc.stderr.strip())
+    assert payload["attempted"] == 2
+    assert [item["domain"] for item in payload["domains"]] == [
+        "one.invalid.test",
+        "two.invalid.test",
+    ]
+    assert all(item["attempted"] == 1 for item in payload["domains"])
+
+
+def test_scan_hosts_from_stdin(tmp_path: Path) -> None:
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--hosts",
+            "-",
+            "--out",
+            "-",
+            "--summary-json",
+            "--only-resolved",
+            "--timeout",
+            "0.1",
+            "--concurrency",
+            "1",
+        ],
+        input="www.one.invalid.test\napi.two.invalid.test\n",
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0
+    payload = json.loads(proc.stderr.strip())
+    assert payload["attempted"] == 2
+
+
+def test_scan_domain_requires_wordlist() -> None:
+    proc = subprocess.run(
+        [sys.executable, "-m", "subdomain_scout", "scan", "--domain", "invalid.test"],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 2
+    assert "--wordlist is required" in proc.stderr
+
+
+def test_scan_listen_serves_worker(tmp_path: Path) -> None:
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("a\nb\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    coordinator = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--domain",
+            "invalid.test",
+            "--wordlist",
+            str(wordlist),
+            "--out",
+            str(out),
+            "--timeout",
+            "0.5",
+            "--listen",
+            "127.0.0.1:0",
+            "--summary-json",
+        ],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert coordinator.stderr is not None
+    first = coordinator.stderr.readline()
+    assert first.startswith("coordinator listening=127.0.0.1:")
+    address = first.strip().split("=", 1)[1]
+    worker = subprocess.run(
+        [sys.executable, "-m", "subdomain_scout", "worker", "--connect", address],
+        check=False,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    rest = coordinator.stderr.read()
+    coordinator.wait(timeout=60)
+    assert worker.returncode == 0
+    assert "worker chunks=1 attempted=2" in worker.stderr
+    payload = json.loads(rest.strip().splitlines()[-1])
+    assert payload["attempted"] == 2
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_scan_listen_rejects_workers() -> None:
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--domain",
+            "invalid.test",
+            "--wordlist",
+            "-",
+            "--listen",
+            "127.0.0.1:0",
+            "--workers",
+            "2",
+        ],
+        input="a\n",
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 2
+    assert "--listen and --workers" in proc.stderr
+
+
+def test_scan_rate_reports_query_rates_in_summary_json() -> None:
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--domain",
+            "invalid.test",
+            "--wordlist",
+            "-",
+            "--out",
+            "-",
+            "--summary-json",
+            "--timeout",
+            "0.1",
+            "--rate",
+            "50",
+        ],
+        input="a\nb\n",
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0
+    payload = json.loads(proc.stderr.strip())
+    assert payload["queries"] == 2
+    assert payload["rate_limit"] == 50
+    assert payload["rate_limit_per_resolver"] is None
+    assert payload["resolvers"][0]["resolver"] == "system"
+    assert payload["qps"] > 0
+
+
+def test_scan_rejects_non_positive_rate() -> None:
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--domain",
+            "invalid.test",
+            "--wordlist",
+            "-",
+            "--rate",
+            "0",
+        ],
+        input="a\n",
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 2
+    assert "--rate must be > 0" in proc.stderr
+
+
+def test_scan_concurrency_auto_reports_window() -> None:
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--domain",
+            "invalid.test",
+            "--wordlist",
+            "-",
+            "--out",
+            "-",
+            "--summary-json",
+            "--timeout",
+            "0.1",
+            "--concurrency",
+            "auto",
+        ],
+        input="a\nb\n",
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0
+    payload = json.loads(proc.stderr.strip())
+    assert payload["attempted"] == 2
+    assert payload["concurrency_window"] >= 1
+    assert payload["concurrency_history"][0][1] == 20
+
+
+def test_scan_rejects_invalid_concurrency() -> None:
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "scan",
+            "--domain",
+            "x.test",
+            "--concurrency",
+            "lots",
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 2
+    assert "expected an integer or 'auto'" in proc.stderr
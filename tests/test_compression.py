@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import json
+import lzma
+import socket
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from subdomain_scout.compression import detect_compression, open_text
+from subdomain_scout.scanner import scan_hosts_summary_lines
+from subdomain_scout.wordlist import _iter_labels
+
+_CODECS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.compress,
+    "xz": lzma.compress,
+    "bz2": bz2.compress,
+}
+
+
+@pytest.mark.parametrize("codec", sorted(_CODECS))
+def test_wordlist_is_decompressed_by_magic_bytes(tmp_path: Path, codec: str) -> None:
+    text = "# comment\nwww\nAPI\n" + "".join(f"host{i}\n" for i in range(20000))
+    # The name says nothing about the codec: detection only looks at the content.
+    path = tmp_path / "words.dat"
+    path.write_bytes(_CODECS[codec](text.encode("utf-8")))
+
+    assert detect_compression(path) == codec
+    labels = list(_iter_labels(path))
+    assert labels[:3] == ["www", "api", "host0"]
+    assert len(labels) == 20002
+
+
+def test_plain_text_passes_through(tmp_path: Path) -> None:
+    path = tmp_path / "words.txt.gz"
+    path.write_text("www\n", encoding="utf-8")
+    assert detect_compression(path) is None
+    with open_text(path) as fh:
+        assert fh.read() == "www\n"
+
+
+def test_corrupt_compressed_input_raises_value_error(tmp_path: Path) -> None:
+    path = tmp_path / "words.gz"
+    path.write_bytes(gzip.compress(b"www\napi\n" * 1000)[:-40])
+    with pytest.raises(ValueError, match=r"corrupt compressed input .*words\.gz \(gzip\)"):
+        list(_iter_labels(path))
+
+
+def test_scan_hosts_reads_compressed_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        if name == "www.a.test":
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    hosts = tmp_path / "hosts.xz"
+    hosts.write_bytes(lzma.compress(b"www.a.test\nmail.b.test\n"))
+
+    with open_text(hosts) as fh:
+        summary = scan_hosts_summary_lines(
+            hosts_lines=fh, out_path=tmp_path / "out.jsonl", timeout=0.1, concurrency=1
+        )
+    assert summary.attempted == 2
+    assert summary.resolved == 1
+
+
+def test_diff_reads_compressed_inputs(tmp_path: Path) -> None:
+    old_path = tmp_path / "old.jsonl.gz"
+    new_path = tmp_path / "new.jsonl.bz2"
+    row = {"subdomain": "a.example.com", "status": "resolved", "ips": ["1.1.1.1"]}
+    old_path.write_bytes(gzip.compress((json.dumps(row) + "\n").encode("utf-8")))
+    row["ips"] = ["2.2.2.2"]
+    new_path.write_bytes(bz2.compress((json.dumps(row) + "\n").encode("utf-8")))
+
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "diff",
+            "--old",
+            str(old_path),
+            "--new",
+            str(new_path),
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    events = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [event["kind"] for event in events] == ["changed"]
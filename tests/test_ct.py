@@ -3,10 +3,13 @@ from __future__ import annotations
 import io
 import json
 import urllib.request
+from typing import Sequence
 
 import pytest
 
+from subdomain_scout import ct
 from subdomain_scout.ct import fetch_ct_subdomains, subdomains_to_labels
+from subdomain_scout.validation import normalize_domains
 
 
 class _FakeResponse(io.BytesIO):
@@ -61,3 +64,28 @@ def test_subdomains_to_labels_filters_apex_and_dedupes() -> None:
         domain="example.com",
     )
     assert labels == ["www", "deep.api"]
+
+
+def test_fetch_ct_subdomains_limit_stops_normalizing_early(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    names = ["x.other.com", "*.a.example.com"] + [f"h{i}.example.com" for i in range(5000)]
+    payload = [{"name_value": "\n".join(names)}]
+    monkeypatch.setattr(
+        urllib.request,
+        "urlopen",
+        lambda _url, timeout: _FakeResponse(json.dumps(payload).encode("utf-8")),
+    )
+    normalized: list[int] = []
+
+    def counting_normalize(raws: Sequence[str], *, skip_invalid: bool = False) -> list[str]:
+        normalized.append(len(raws))
+        return normalize_domains(raws, skip_invalid=skip_invalid)
+
+    monkeypatch.setattr(ct, "normalize_domains", counting_normalize)
+
+    subdomains, summary = fetch_ct_subdomains("example.com", timeout=2.0, limit=3)
+    assert subdomains == ["a.example.com", "h0.example.com", "h1.example.com"]
+    assert summary.names_seen == 4
+    # Only the first batch is validated, not all 5002 names.
+    assert normalized == [1023]
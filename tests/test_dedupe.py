@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import socket
+from pathlib import Path
+
+import pytest
+
+from subdomain_scout import scanner
+from subdomain_scout.dedupe import FingerprintSet
+from subdomain_scout.scanner import scan_domains_summary
+
+_SMALL = 32 * 1024
+
+
+def test_fingerprint_set_spills_and_stays_exact_across_runs() -> None:
+    members = FingerprintSet(memory_limit=_SMALL)
+    keys = [f"host{i}.example.com" for i in range(40000)]
+    try:
+        assert all(members.add(key) for key in keys)
+        # 4096 slots hold ~2.8k keys, so this spilled often enough to merge runs at least once.
+        assert 1 <= members.spilled_runs <= 9
+        assert len(members) == len(keys)
+        assert not any(members.add(key) for key in keys[::7])
+        assert all(key in members for key in keys[::13])
+        assert "host40000.example.com" not in members
+        assert len(members) == len(keys)
+    finally:
+        members.close()
+    assert len(members) == 0
+    assert keys[0] not in members
+
+
+def test_fingerprint_set_rejects_tiny_ceiling() -> None:
+    with pytest.raises(ValueError, match="memory limit"):
+        FingerprintSet(memory_limit=1024)
+
+
+def test_scan_dedupe_counts_match_with_spilling(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    labels = [f"w{i}" for i in range(6000)]
+    wordlist = tmp_path / "words.txt"
+    # Every label shows up again after the index has spilled at least once.
+    wordlist.write_text("\n".join(labels + labels[::2]) + "\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    out.write_text("".join(f'{{"subdomain":"w{i}.spill.test"}}\n' for i in range(100)))
+
+    summary = scan_domains_summary(
+        domain="spill.test",
+        wordlist=wordlist,
+        out_path=out,
+        timeout=0.1,
+        concurrency=20,
+        resume=True,
+        dedupe_memory=_SMALL,
+    )
+    assert summary.labels_total == 9000
+    assert summary.labels_unique == 6000
+    assert summary.labels_deduped == 3000
+    assert summary.labels_skipped_existing == 100
+    assert summary.attempted == 5900
+
+
+def test_scan_dedupe_memory_caps_all_indexes_together(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    limits: list[int] = []
+
+    class RecordingSet(FingerprintSet):
+        def __init__(self, *, memory_limit: int) -> None:
+            limits.append(memory_limit)
+            super().__init__(memory_limit=memory_limit)
+
+    monkeypatch.setattr(scanner, "FingerprintSet", RecordingSet)
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("www\napi\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    out.write_text('{"subdomain":"www.cap.test"}\n', encoding="utf-8")
+
+    scan_domains_summary(
+        domain="cap.test",
+        wordlist=wordlist,
+        out_path=out,
+        timeout=0.1,
+        resume=True,
+        mutate=True,
+        dedupe_memory=1024 * 1024,
+    )
+    # Resume names, candidates and the mutation feed share the one ceiling.
+    assert limits == [1024 * 1024 // 3] * 3
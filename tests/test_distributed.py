@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from subdomain_scout.distributed import Coordinator, parse_host_port, run_worker
+from subdomain_scout.scanner import ScanSummary, scan_domains_summary_lines
+
+
+def _fake_dns(monkeypatch: pytest.MonkeyPatch) -> None:
+    real_getaddrinfo = socket.getaddrinfo
+
+    def fake_getaddrinfo(name: str, port: object, *args: object) -> list[tuple[object, ...]]:
+        if not name.endswith(".dist.test"):
+            return real_getaddrinfo(name, port, *args)  # type: ignore[arg-type,return-value]
+        if name.startswith("ok"):
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+
+def _start_scan(
+    coordinator: Coordinator, labels: list[str], out: Path
+) -> tuple[threading.Thread, list[ScanSummary]]:
+    summaries: list[ScanSummary] = []
+
+    def run() -> None:
+        summaries.append(
+            scan_domains_summary_lines(
+                domain="dist.test",
+                wordlist_lines=labels,
+                out_path=out,
+                timeout=0.5,
+                concurrency=4,
+                chunk_dispatcher=coordinator.dispatch,
+            )
+        )
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, summaries
+
+
+def test_parse_host_port() -> None:
+    assert parse_host_port("127.0.0.1:8765") == ("127.0.0.1", 8765)
+    assert parse_host_port("[::1]:53") == ("::1", 53)
+    assert parse_host_port(":9000") == ("127.0.0.1", 9000)
+    assert parse_host_port("10.0.0.1", default_port=8765) == ("10.0.0.1", 8765)
+    with pytest.raises(ValueError):
+        parse_host_port("10.0.0.1")
+    with pytest.raises(ValueError):
+        parse_host_port("host:notaport")
+
+
+def test_coordinator_scans_with_multiple_workers(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _fake_dns(monkeypatch)
+    labels = [f"ok{i}" for i in range(10)] + [f"miss{i}" for i in range(10)] + ["ok0"]
+    out = tmp_path / "out.jsonl"
+    coordinator = Coordinator(chunk_size=3)
+    host, port = coordinator.address
+    scan_thread, summaries = _start_scan(coordinator, labels, out)
+
+    worker_summaries = []
+    worker_threads = [
+        threading.Thread(
+            target=lambda: worker_summaries.append(run_worker(host, port, concurrency=2)),
+            daemon=True,
+        )
+        for _ in range(2)
+    ]
+    for t in worker_threads:
+        t.start()
+    scan_thread.join(timeout=20)
+    for t in worker_threads:
+        t.join(timeout=20)
+
+    assert summaries, "scan did not finish"
+    summary = summaries[0]
+    assert summary.attempted == 20
+    assert summary.resolved == 10
+    assert summary.not_found == 10
+    assert summary.labels_deduped == 1
+    assert sum(w.attempted for w in worker_summaries) == 20
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert sorted(r["subdomain"] for r in rows) == sorted(
+        f"{label}.dist.test" for label in labels[:20]
+    )
+
+
+def test_coordinator_requeues_chunk_from_lost_worker(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _fake_dns(monkeypatch)
+    labels = [f"ok{i}" for i in range(6)]
+    out = tmp_path / "out.jsonl"
+    coordinator = Coordinator(chunk_size=2)
+    host, port = coordinator.address
+    scan_thread, summaries = _start_scan(coordinator, labels, out)
+
+    # A worker that takes a chunk and disconnects without answering.
+    with socket.create_connection((host, port), timeout=5) as sock:
+        rfile = sock.makefile("rb")
+        sock.sendall(json.dumps({"type": "hello"}).encode() + b"\n")
+        assert json.loads(rfile.readline())["type"] == "config"
+        sock.sendall(json.dumps({"type": "next"}).encode() + b"\n")
+        lost = json.loads(rfile.readline())
+        assert lost["type"] == "chunk"
+        assert len(lost["candidates"]) == 2
+
+    worker = run_worker(host, port, concurrency=2)
+    scan_thread.join(timeout=20)
+
+    assert summaries, "scan did not finish"
+    assert summaries[0].attempted == 6
+    assert summaries[0].resolved == 6
+    assert worker.attempted == 6
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 6
+
+
+def test_coordinator_keeps_worker_that_heartbeats_through_a_slow_chunk(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    real_getaddrinfo = socket.getaddrinfo
+
+    def slow_getaddrinfo(name: str, port: object, *args: object) -> list[tuple[object, ...]]:
+        if not name.endswith(".dist.test"):
+            return real_getaddrinfo(name, port, *args)  # type: ignore[arg-type,return-value]
+        time.sleep(0.25)
+        return [(None, None, None, None, ("192.0.2.1", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    out = tmp_path / "out.jsonl"
+    coordinator = Coordinator(chunk_size=4)
+    host, port = coordinator.address
+    summaries: list[ScanSummary] = []
+    scan = threading.Thread(
+        target=lambda: summaries.append(
+            scan_domains_summary_lines(
+                domain="dist.test",
+                wordlist_lines=[f"ok{i}" for i in range(4)],
+                out_path=out,
+                timeout=0.1,
+                chunk_dispatcher=coordinator.dispatch,
+            )
+        ),
+        daemon=True,
+    )
+    scan.start()
+
+    # The chunk takes ~1s, well past the 0.4s the coordinator allows a silent connection.
+    worker = run_worker(host, port, concurrency=1)
+    scan.join(timeout=20)
+
+    assert summaries, "scan did not finish"
+    assert summaries[0].attempted == 4
+    assert worker.chunks == 1
+
+
+def test_worker_rejected_with_wrong_token(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _fake_dns(monkeypatch)
+    coordinator = Coordinator(token="s3cret")
+    host, port = coordinator.address
+    scan_thread, summaries = _start_scan(coordinator, ["ok1"], tmp_path / "out.jsonl")
+
+    with pytest.raises(ValueError, match="token"):
+        run_worker(host, port, token="wrong")
+    run_worker(host, port, token="s3cret")
+    scan_thread.join(timeout=20)
+    assert summaries and summaries[0].resolved == 1
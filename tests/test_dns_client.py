@@ -2,17 +2,24 @@ from __future__ import annotations
 
 import json
 import re
-import socketserver
-import struct
+import socket
 import subprocess
 import sys
 import threading
+import time
 from pathlib import Path
-from typing import Final, Iterator
+from typing import Iterator
 
 import pytest
 
-from subdomain_scout.dns_client import load_nameservers_file, parse_nameserver, resolve_host_details
+from subdomain_scout.dns_client import (
+    DeadlineExceeded,
+    load_nameservers_file,
+    parse_nameserver,
+    parse_record_type,
+    resolve_host_details,
+    resolve_records,
+)
 
 
 def test_parse_nameserver_ipv4_and_port() -> None:
@@ -29,6 +36,17 @@ def test_parse_nameserver_ipv6_unbracketed_no_port() -> None:
     assert parse_nameserver("2606:4700:4700::1111") == ("2606:4700:4700::1111", 53)
 
 
+def test_parse_record_type_accepts_names_and_rfc3597_forms() -> None:
+    assert parse_record_type("mx") == 15
+    assert parse_record_type(" CAA ") == 257
+    assert parse_record_type("TYPE65") == 65
+    assert parse_record_type("64") == 64
+    with pytest.raises(ValueError, match="unknown record type"):
+        parse_record_type("BOGUS")
+    with pytest.raises(ValueError, match="unsupported record type"):
+        parse_record_type("TYPE255")
+
+
 def test_load_nameservers_file_skips_comments_and_dedupes(tmp_path: Path) -> None:
     p = tmp_path / "resolvers.txt"
     p.write_text(
@@ -45,119 +63,6 @@ def test_load_nameservers_file_errors_on_empty(tmp_path: Path) -> None:
         load_nameservers_file(p)
 
 
-class _DnsHandler(socketserver.BaseRequestHandler):
-    A_RDATA: Final[bytes] = b"\x01\x02\x03\x04"  # 1.2.3.4
-    CNAME_TO_A: Final[bytes] = b"\x01a\x03res\x04test\x00"  # a.res.test
-    CNAME_TO_MISSING: Final[bytes] = b"\x07missing\x03res\x04test\x00"  # missing.res.test
-
-    def handle(self) -> None:
-        data, sock = self.request
-        if len(data) < 12:
-            return
-        rid = struct.unpack("!H", data[:2])[0]
-
-        try:
-            qname, qtype, qclass, qend = _parse_question(data)
-        except ValueError:
-            return
-
-        question = data[12:qend]
-
-        if qclass != 1:
-            # REFUSED
-            hdr = struct.pack("!HHHHHH", rid, 0x8185, 1, 0, 0, 0)
-            sock.sendto(hdr + question, self.client_address)
-            return
-
-        if qname == "a.res.test" and qtype == 1:
-            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 1, 0, 0)
-            # NAME pointer to offset 12
-            ans = (
-                b"\xc0\x0c"
-                + struct.pack("!H", 1)  # TYPE A
-                + struct.pack("!H", 1)  # CLASS IN
-                + struct.pack("!I", 60)  # TTL
-                + struct.pack("!H", len(self.A_RDATA))
-                + self.A_RDATA
-            )
-            sock.sendto(hdr + question + ans, self.client_address)
-            return
-
-        if qname == "a.res.test" and qtype == 28:
-            # NOERROR, empty AAAA
-            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 0, 0, 0)
-            sock.sendto(hdr + question, self.client_address)
-            return
-
-        if qname == "b.res.test" and qtype in {1, 28}:
-            # Return only a CNAME (no A/AAAA); client should follow to a.res.test.
-            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 1, 0, 0)
-            ans = (
-                b"\xc0\x0c"
-                + struct.pack("!H", 5)  # TYPE CNAME
-                + struct.pack("!H", 1)  # CLASS IN
-                + struct.pack("!I", 60)  # TTL
-                + struct.pack("!H", len(self.CNAME_TO_A))
-                + self.CNAME_TO_A
-            )
-            sock.sendto(hdr + question + ans, self.client_address)
-            return
-
-        if qname == "d.res.test" and qtype in {1, 28}:
-            # CNAME-only response that points to a missing name; should be surfaced as status=cname
-            # when --include-cname is enabled.
-            hdr = struct.pack("!HHHHHH", rid, 0x8180, 1, 1, 0, 0)
-            ans = (
-                b"\xc0\x0c"
-                + struct.pack("!H", 5)  # TYPE CNAME
-                + struct.pack("!H", 1)  # CLASS IN
-                + struct.pack("!I", 60)  # TTL
-                + struct.pack("!H", len(self.CNAME_TO_MISSING))
-                + self.CNAME_TO_MISSING
-            )
-            sock.sendto(hdr + question + ans, self.client_address)
-            return
-
-        # NXDOMAIN for everything else.
-        hdr = struct.pack("!HHHHHH", rid, 0x8183, 1, 0, 0, 0)
-        sock.sendto(hdr + question, self.client_address)
-
-
-def _parse_question(data: bytes) -> tuple[str, int, int, int]:
-    off = 12
-    labels: list[str] = []
-    while True:
-        if off >= len(data):
-            raise ValueError("truncated qname")
-        ln = data[off]
-        off += 1
-        if ln == 0:
-            break
-        if off + ln > len(data):
-            raise ValueError("truncated label")
-        labels.append(data[off : off + ln].decode("ascii", errors="ignore"))
-        off += ln
-    if off + 4 > len(data):
-        raise ValueError("truncated qtype/qclass")
-    qtype, qclass = struct.unpack("!HH", data[off : off + 4])
-    off += 4
-    return ".".join(labels).lower(), int(qtype), int(qclass), off
-
-
-@pytest.fixture()
-def dns_server() -> Iterator[tuple[str, int]]:
-    server = socketserver.UDPServer(("127.0.0.1", 0), _DnsHandler)
-    host, port = server.server_address
-    t = threading.Thread(target=server.serve_forever, daemon=True)
-    t.start()
-    try:
-        yield str(host), int(port)
-    finally:
-        server.shutdown()
-        server.server_close()
-        t.join(timeout=1)
-
-
 def test_resolve_host_details_includes_record_metadata(dns_server: tuple[str, int]) -> None:
     host, port = dns_server
     details = resolve_host_details("b.res.test", nameservers=[(host, port)], timeout=0.2)
@@ -170,6 +75,16 @@ def test_resolve_host_details_includes_record_metadata(dns_server: tuple[str, in
     assert details.canonical_target == "a.res.test"
 
 
+def test_resolve_host_details_tells_nxdomain_from_dangling_cname(
+    dns_server: tuple[str, int],
+) -> None:
+    missing = resolve_host_details("gone.res.test", nameservers=[dns_server], timeout=0.2)
+    assert missing.ips == [] and missing.nxdomain
+    # d.res.test exists as a CNAME; only its target is NXDOMAIN.
+    dangling = resolve_host_details("d.res.test", nameservers=[dns_server], timeout=0.2)
+    assert dangling.cnames == ["missing.res.test"] and not dangling.nxdomain
+
+
 def test_cli_scan_with_custom_resolver(tmp_path: Path, dns_server: tuple[str, int]) -> None:
     host, port = dns_server
     wordlist = tmp_path / "words.txt"
@@ -421,3 +336,312 @@ def test_cli_scan_with_resolver_file(tmp_path: Path, dns_server: tuple[str, int]
     assert record["subdomain"] == "a.res.test"
     assert record["status"] == "resolved"
     assert record["ips"] == ["1.2.3.4"]
+
+
+@pytest.fixture()
+def silent_resolver() -> Iterator[tuple[str, int]]:
+    # Bound but never answers, so every query to it runs into its timeout.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    try:
+        host, port = sock.getsockname()
+        yield str(host), int(port)
+    finally:
+        sock.close()
+
+
+def test_resolve_host_details_deadline_bounds_resolver_fallbacks(
+    silent_resolver: tuple[str, int],
+) -> None:
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        resolve_host_details(
+            "slow.res.test",
+            nameservers=[silent_resolver] * 5,
+            timeout=0.3,
+            deadline=time.monotonic() + 0.4,
+        )
+    # Without the deadline this would take 5 resolvers * 2 qtypes * 0.3s.
+    assert time.monotonic() - start < 1.0
+
+
+def test_scan_deadline_exceeded_is_reported_per_name(
+    tmp_path: Path, silent_resolver: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["slow"],
+        out_path=out,
+        timeout=0.2,
+        concurrency=1,
+        nameservers=[silent_resolver] * 3,
+        retries=3,
+        retry_backoff_ms=0,
+        deadline=0.3,
+    )
+    assert summary.error == 1
+    row = json.loads(out.read_text(encoding="utf-8").splitlines()[0])
+    assert row["error_type"] == "deadline_exceeded"
+    assert row["elapsed_ms"] < 1000
+
+
+def test_scan_sweep_matches_full_resolution_with_fewer_queries(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    host, port = dns_server
+    labels = ["a", "b", "c", "d", "e", "x1", "x2", "x3"]
+
+    def run(*, sweep: bool) -> tuple[list[dict[str, object]], int]:
+        out = tmp_path / f"out-{sweep}.jsonl"
+        summary = scan_domains_summary_lines(
+            domain="res.test",
+            wordlist_lines=labels,
+            out_path=out,
+            timeout=0.5,
+            concurrency=1,
+            include_cname=True,
+            nameservers=[(host, port)],
+            sweep=sweep,
+        )
+        rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        for row in rows:
+            del row["elapsed_ms"]
+        return rows, summary.queries
+
+    swept_rows, swept_queries = run(sweep=True)
+    full_rows, full_queries = run(sweep=False)
+    assert swept_rows == full_rows
+    # The five NXDOMAIN names cost one query instead of A + AAAA; the three existing names
+    # reuse the sweep's A answer and cost nothing extra.
+    assert swept_queries == full_queries - 5
+
+
+def test_resolve_records_merges_types_into_one_mapping_per_host(
+    dns_server: tuple[str, int],
+) -> None:
+    records = resolve_records(
+        ["A.res.test.", "missing.res.test", "a.res.test"],
+        record_types=[15, 16, 257, 65, 2],
+        nameservers=[dns_server],
+        timeout=0.5,
+    )
+    assert records == {
+        "a.res.test": {
+            "MX": ["10 mail.res.test"],
+            "TXT": ["v=spf1 -all"],
+            "CAA": ['0 issue "letsencrypt.org"'],
+            "TYPE65": ["\\# 2 0001"],
+        },
+        "missing.res.test": {},
+    }
+
+
+def test_resolve_records_moves_past_unresponsive_resolver(
+    dns_server: tuple[str, int], silent_resolver: tuple[str, int]
+) -> None:
+    hosts = [f"h{i}.res.test" for i in range(20)] + ["a.res.test"]
+    start = time.monotonic()
+    records = resolve_records(
+        hosts,
+        record_types=[15, 16],
+        nameservers=[silent_resolver, dns_server],
+        timeout=0.3,
+        window=16,
+    )
+    assert records["a.res.test"] == {"MX": ["10 mail.res.test"], "TXT": ["v=spf1 -all"]}
+    # Questions stuck on the silent resolver time out together instead of one after another.
+    assert time.monotonic() - start < 2.0
+
+
+def test_scan_record_types_adds_records_to_resolved_hosts(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a", "b", "x1"],
+        out_path=out,
+        timeout=0.5,
+        concurrency=2,
+        nameservers=[dns_server],
+        record_types=["MX", "txt"],
+    )
+    rows = {
+        row["subdomain"]: row
+        for row in (json.loads(line) for line in out.read_text(encoding="utf-8").splitlines())
+    }
+    assert rows["a.res.test"]["records"] == {"MX": ["10 mail.res.test"], "TXT": ["v=spf1 -all"]}
+    # b.res.test resolves through a CNAME whose target has no MX/TXT in this fixture.
+    assert rows["b.res.test"]["records"] == {}
+    assert "records" not in rows["x1.res.test"]
+
+
+def test_scan_record_types_covers_names_without_addresses(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_hosts_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    summary = scan_hosts_summary_lines(
+        hosts_lines=["t.res.test", "d.res.test", "x1.res.test"],
+        out_path=out,
+        timeout=0.5,
+        concurrency=2,
+        nameservers=[dns_server],
+        record_types=["TXT"],
+    )
+    assert summary.not_found == 3
+    rows = {
+        row["subdomain"]: row
+        for row in (json.loads(line) for line in out.read_text(encoding="utf-8").splitlines())
+    }
+    # The TXT-only name is NODATA for A/AAAA, but it exists and its TXT record is reported.
+    assert rows["t.res.test"]["records"] == {"TXT": ["v=spf1 -all"]}
+    # A CNAME to a missing target exists too; the NXDOMAIN name gets no record pass.
+    assert rows["d.res.test"]["records"] == {}
+    assert "records" not in rows["x1.res.test"]
+
+
+def test_scan_harvest_adds_in_scope_names_from_responses(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a", "b", "x1", "ns0"],
+        out_path=out,
+        timeout=0.5,
+        concurrency=2,
+        nameservers=[dns_server],
+        harvest=True,
+    )
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    subdomains = sorted(row["subdomain"] for row in rows)
+    # ns1 (authority NS + glue) is new; ns0 (SOA MNAME) and a (CNAME target of b) are already
+    # in the wordlist; ns.other.test is out of scope.
+    assert subdomains == ["a.res.test", "b.res.test", "ns0.res.test", "ns1.res.test", "x1.res.test"]
+    assert summary.labels_harvested == 1
+    assert summary.attempted == 5
+
+
+def test_scan_threaded_harvest_continues_after_input_runs_dry(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    # One input name fits in the first window, so every later name is only known from a result.
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a"],
+        out_path=out,
+        timeout=0.5,
+        concurrency=4,
+        nameservers=[dns_server],
+        harvest=True,
+    )
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert sorted(row["subdomain"] for row in rows) == [
+        "a.res.test",
+        "ns0.res.test",
+        "ns1.res.test",
+    ]
+    assert summary.labels_harvested == 2
+    assert summary.attempted == 3
+
+
+def test_scan_recursive_without_sweep_skips_and_prunes_nxdomain(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    words = tmp_path / "second.txt"
+    words.write_text("x\ny.x\n", encoding="utf-8")
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a", "gone", "old"],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.5,
+        concurrency=1,
+        nameservers=[dns_server],
+        detect_wildcard=True,
+        sweep=False,
+        recursive=1,
+        recursive_wordlist=words,
+    )
+    # Only a.res.test exists; NXDOMAIN names are neither zones nor queried below.
+    assert summary.zones_recursive == 1
+    assert summary.labels_recursive == 1
+    assert summary.labels_pruned == 1
+    assert summary.attempted == 4
+
+
+def test_coordinator_serves_names_harvested_after_input_runs_dry(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.distributed import Coordinator, run_worker
+    from subdomain_scout.scanner import ScanSummary, scan_domains_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    coordinator = Coordinator(chunk_size=1)
+    summaries: list[ScanSummary] = []
+    scan = threading.Thread(
+        target=lambda: summaries.append(
+            scan_domains_summary_lines(
+                domain="res.test",
+                wordlist_lines=["a"],
+                out_path=out,
+                timeout=0.5,
+                nameservers=[dns_server],
+                harvest=True,
+                chunk_dispatcher=coordinator.dispatch,
+            )
+        ),
+        daemon=True,
+    )
+    scan.start()
+    host, port = coordinator.address
+    worker = run_worker(host, port, concurrency=1)
+    scan.join(timeout=20)
+
+    assert summaries, "scan did not finish"
+    # a -> ns1 (authority) -> ns0 (SOA MNAME in ns1's NXDOMAIN), each only known from a result.
+    assert summaries[0].labels_harvested == 2
+    assert worker.attempted == 3
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert sorted(row["subdomain"] for row in rows) == [
+        "a.res.test",
+        "ns0.res.test",
+        "ns1.res.test",
+    ]
+
+
+def test_scan_bind_rotates_source_addresses(tmp_path: Path, dns_server: tuple[str, int]) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a", "b", "x1", "x2"],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.5,
+        concurrency=2,
+        nameservers=[dns_server],
+        bind=["127.0.0.1", "127.0.0.2"],
+        record_types=["MX"],
+    )
+    assert summary.resolved == 2
+    counts = {address: (queries, errors) for address, queries, errors in summary.source_queries}
+    assert set(counts) == {"127.0.0.1", "127.0.0.2"}
+    # Strict round robin: the two addresses never differ by more than one query.
+    assert abs(counts["127.0.0.1"][0] - counts["127.0.0.2"][0]) <= 1
+    assert sum(queries for queries, _errors in counts.values()) == summary.queries
+    assert all(errors == 0 for _queries, errors in counts.values())
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+import socket
+from pathlib import Path
+
+import pytest
+
+from subdomain_scout.cli import main
+from subdomain_scout.model import (
+    HitStats,
+    build_hit_stats,
+    generate_labels,
+    load_hit_stats,
+    load_label_model,
+    read_host_outcomes,
+    read_observed_hosts,
+    save_label_model,
+    train_label_model,
+)
+from subdomain_scout.scanner import scan_domains_summary_lines
+
+_HISTORY = [
+    '{"subdomain":"www.a.test","status":"resolved","ips":["192.0.2.1"]}',
+    '{"subdomain":"www.a.test","status":"resolved","ips":["192.0.2.1"]}',
+    '{"subdomain":"mail.a.test","status":"cname"}',
+    '{"subdomain":"nope.a.test","status":"not_found"}',
+    '{"subdomain":"www.b.test","source":"crt.sh","status":"passive"}',
+    "# plain host lists work too",
+    "API.b.test",
+    "www.c.test",
+    "not a host",
+    "{broken",
+]
+
+
+def test_train_counts_distinct_observed_hosts_and_round_trips(tmp_path: Path) -> None:
+    skipped: list[int] = []
+    hosts = list(read_observed_hosts(_HISTORY, on_skipped=skipped.append))
+    assert hosts == ["www.a.test", "www.a.test", "mail.a.test", "www.b.test", "api.b.test"] + [
+        "www.c.test"
+    ]
+    assert skipped == [3]
+
+    model = train_label_model(hosts, order=3)
+    assert model.hosts == 5
+    path = tmp_path / "labels.model"
+    assert save_label_model(model, path) == path.stat().st_size
+    loaded = load_label_model(path)
+    assert loaded == model
+    assert loaded.log_prob("www") > loaded.log_prob("mail") > loaded.log_prob("wxq")
+
+
+def test_generate_labels_is_best_first_and_valid() -> None:
+    hosts = [f"{label}.z{zone}.test" for zone in range(20) for label in ("www", "mail", "vpn")]
+    hosts += [f"web{n}.z0.test" for n in range(1, 9)]
+    model = train_label_model(hosts)
+
+    labels = list(generate_labels(model, 200))
+    assert len(labels) == len(set(labels)) == 200
+    assert set(labels[:3]) == {"www", "mail", "vpn"}
+    scores = [model.log_prob(label) for label in labels]
+    assert scores == sorted(scores, reverse=True)
+    assert not any(label.startswith("-") or label.endswith("-") for label in labels)
+    assert list(generate_labels(model, 0)) == []
+
+
+def test_load_label_model_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "other.json"
+    path.write_text('{"kind":"scan_summary"}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="not a label model"):
+        load_label_model(path)
+
+
+def test_scan_generate_scans_model_labels_first(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        if name == "www.gen.test":
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    history = tmp_path / "history.jsonl"
+    history.write_text("\n".join(_HISTORY) + "\n", encoding="utf-8")
+    model_path = tmp_path / "labels.model"
+    assert main(["model", "train", "--input", str(history), "--out", str(model_path)]) == 0
+    assert "trained hosts=5 skipped=3" in capsys.readouterr().err
+
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("www\nzzz\n", encoding="utf-8")
+    rc = main(
+        [
+            "scan",
+            "--domain",
+            "gen.test",
+            "--wordlist",
+            str(wordlist),
+            "--model",
+            str(model_path),
+            "--generate",
+            "5",
+            "--concurrency",
+            "1",
+            "--out",
+            str(tmp_path / "out.jsonl"),
+            "--summary-json",
+        ]
+    )
+    assert rc == 0
+    summary = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert summary["labels_generated"] == 5
+    assert summary["labels_deduped"] == 1
+    assert summary["attempted"] == 6
+    assert queried[0] == "www.gen.test"
+    assert queried[-1] == "zzz.gen.test"
+
+
+def test_scan_generate_requires_model() -> None:
+    assert main(["scan", "--domain", "gen.test", "--generate", "5", "--out", "-"]) == 2
+
+
+def test_hit_stats_rank_labels_by_smoothed_hit_rate() -> None:
+    lines = [
+        *(f'{{"subdomain":"www.z{n}.test","status":"resolved"}}' for n in range(3)),
+        *(f'{{"subdomain":"api.z{n}.test","status":"not_found"}}' for n in range(3)),
+        '{"subdomain":"api.z0.test","status":"cname"}',
+        '{"subdomain":"dev.z0.test","status":"not_found"}',
+        '{"subdomain":"old.z0.test","status":"error"}',
+        "mail.z9.test",
+    ]
+    skipped: list[int] = []
+    stats = build_hit_stats(read_host_outcomes(lines, on_skipped=skipped.append))
+
+    assert skipped == [1]
+    assert stats.hosts == 8
+    assert stats.labels["api"] == (1, 3)
+    # 5 of 8 tried hosts existed; dev never existed, so it is never scheduled.
+    assert stats.base_rate == 5 / 8
+    assert stats.top_labels(10) == ["www", "mail", "api"]
+    assert stats.top_labels(1) == ["www"]
+
+
+def test_hit_stats_rank_high_volume_label_above_one_off() -> None:
+    stats = HitStats(labels={"mail": (400, 1000), "once": (1, 1), "dev": (0, 2000)})
+    assert stats.hit_rate("mail") > stats.hit_rate("once")
+    assert stats.top_labels(2) == ["mail", "once"]
+
+
+def test_scan_puts_ct_then_frequent_labels_first(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    history = tmp_path / "history.jsonl"
+    history.write_text("\n".join(_HISTORY) + "\n", encoding="utf-8")
+    stats_path = tmp_path / "labels.stats"
+    assert main(["model", "stats", "--input", str(history), "--out", str(stats_path)]) == 0
+    assert "stats hosts=6 skipped=2 labels=4 labels_hit=3" in capsys.readouterr().err
+    stdin_scan = ["scan", "--domain", "prio.test", "--wordlist", "-", "--out", "-"]
+    assert main([*stdin_scan, "--label-stats", str(stats_path)]) == 2
+    assert "needs a wordlist file" in capsys.readouterr().err
+    top = load_hit_stats(stats_path).top_labels(2)
+    assert top == ["www", "api"]
+
+    summary = scan_domains_summary_lines(
+        domain="prio.test",
+        wordlist_lines=["zzz\n", "api\n", "blog\n"],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=1,
+        extra_labels=["blog"],
+        ct_labels_count=1,
+        priority_labels=top,
+    )
+
+    # www is not in the wordlist, so it is not scanned; api moves to the front of it.
+    assert queried == [f"{label}.prio.test" for label in ("blog", "api", "zzz")]
+    assert summary.labels_prioritized == 1
+    assert summary.labels_total == 4
+    assert summary.labels_deduped == 1
+
+
+def test_load_hit_stats_normalizes_labels_and_scan_counts_valid_ones(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    stats_path = tmp_path / "labels.stats"
+    labels = {"WWW": [2, 3], "www": [1, 1], "bad_label!": [5, 5], "api": [1, 4]}
+    stats_path.write_text(
+        json.dumps({"kind": "label_stats", "version": 1, "hosts": 9, "labels": labels}) + "\n",
+        encoding="utf-8",
+    )
+    stats = load_hit_stats(stats_path)
+    assert stats.labels == {"www": (3, 4), "api": (1, 4)}
+
+    summary = scan_domains_summary_lines(
+        domain="prio.test",
+        wordlist_lines=["zzz\n", "www\n", "api\n"],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=1,
+        priority_labels=["API", "bad_label!", *stats.top_labels(10)],
+    )
+    assert queried == ["api.prio.test", "www.prio.test", "zzz.prio.test"]
+    assert summary.labels_prioritized == 2
+    assert summary.labels_deduped == 0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        '"labels":{"www":[1]},"hosts":1',
+        '"labels":{"www":5},"hosts":1',
+        '"labels":{"www":["1","2"]},"hosts":1',
+        '"labels":{"www":[3,2]},"hosts":1',
+        '"labels":{"www":[1,2]},"hosts":"many"',
+    ],
+)
+def test_load_hit_stats_rejects_corrupt_values(tmp_path: Path, body: str) -> None:
+    path = tmp_path / "stats.json"
+    path.write_text(f'{{"kind":"label_stats","version":1,{body}}}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="corrupt label statistics file"):
+        load_hit_stats(path)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        '"order":3,"contexts":{"":5},"hosts":1',
+        '"order":3,"contexts":{"":{"a":[1]}},"hosts":1',
+        '"order":3,"contexts":{"":{"a":-1}},"hosts":1',
+        '"order":3,"contexts":{"":{"a":1}},"hosts":null',
+    ],
+)
+def test_load_label_model_rejects_corrupt_values(
+    capsys: pytest.CaptureFixture[str], tmp_path: Path, body: str
+) -> None:
+    path = tmp_path / "model.json"
+    path.write_text(f'{{"kind":"label_model","version":1,{body}}}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="corrupt label model"):
+        load_label_model(path)
+    # The CLI reports it like any other unreadable model instead of a traceback.
+    rc = main(
+        ["scan", "--domain", "m.test", "--wordlist", str(path), "--out", "-"]
+        + ["--model", str(path), "--generate", "5"]
+    )
+    assert rc == 2
+    assert "error: --model: corrupt label model" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import itertools
+import socket
+from pathlib import Path
+
+import pytest
+
+from subdomain_scout.mutations import mutate_label
+from subdomain_scout.scanner import scan_domains_summary
+
+
+def test_mutate_label_orders_variants_and_keeps_the_rest() -> None:
+    variants = list(mutate_label("web09.eu", words=("dev", "prod")))
+    assert variants[:4] == ["web10.eu", "web08.eu", "web11.eu", "web07.eu"]
+    assert variants[4:] == ["web09-dev.eu", "web09-prod.eu", "dev-web09.eu", "prod-web09.eu"]
+
+    swapped = list(mutate_label("api-dev", words=("dev", "stg", "prod")))
+    assert swapped[:2] == ["api-stg", "api-prod"]
+    assert swapped[2:5] == ["api-dev2", "api-dev1", "api-dev3"]
+    assert "api-dev-dev" not in swapped
+    assert len(swapped) == len(set(swapped))
+
+
+def test_scan_mutate_tries_each_permutation_once_within_budget(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    live = {"web01.mut.test", "api-dev.mut.test", "web02.mut.test"}
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        if name in live:
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("web01\napi-dev\nmissing\n", encoding="utf-8")
+
+    summary = scan_domains_summary(
+        domain="mut.test",
+        wordlist=wordlist,
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=1,
+        mutate=True,
+        mutate_budget=30,
+    )
+
+    # The input goes first; permutations of what resolved follow, up to the budget.
+    assert queried[:3] == ["web01.mut.test", "api-dev.mut.test", "missing.mut.test"]
+    assert queried[3] == "web02.mut.test"
+    assert len(queried) == len(set(queried))
+    assert summary.mutate and summary.labels_mutated == 30
+    assert summary.attempted == 33
+    assert summary.resolved == 3
+
+
+def test_scan_mutate_threaded_queues_permutations_after_input_runs_dry(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    live = {"web01.mut.test", "web02.mut.test"}
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        if name in live:
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("web01\n", encoding="utf-8")
+
+    summary = scan_domains_summary(
+        domain="mut.test",
+        wordlist=wordlist,
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=4,
+        mutate=True,
+        mutate_budget=10,
+    )
+
+    # The single input name fits in the first window; every permutation comes from its result.
+    expected = itertools.islice(mutate_label("web01"), 10)
+    assert sorted(queried) == sorted(["web01.mut.test", *(f"{v}.mut.test" for v in expected)])
+    assert summary.labels_mutated == 10
+    assert summary.attempted == 11
+    assert summary.resolved == 2
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+import socket
+from pathlib import Path
+
+import pytest
+
+from subdomain_scout.patterns import (
+    count_expansions,
+    expand_patterns,
+    load_pattern_set,
+    parse_pattern,
+)
+from subdomain_scout.scanner import scan_domains_summary
+
+
+def test_parse_pattern_fields() -> None:
+    assert list(parse_pattern("{word}{0-2}").expand("api")) == ["api0", "api1", "api2"]
+    assert list(parse_pattern("v{08-10}").expand(None)) == ["v08", "v09", "v10"]
+    assert list(parse_pattern("{Dev|stg}.{word}").expand("www")) == ["dev.www", "stg.www"]
+    # An empty alternative makes a part optional.
+    assert list(parse_pattern("{word}{|-v2}").expand("api")) == ["api", "api-v2"]
+    env = parse_pattern("{word}-{ENV}", {"env": ["qa", "prod"]})
+    assert list(env.expand("db")) == ["db-qa", "db-prod"]
+    assert env.uses_word and env.combinations == 2
+
+
+def test_numeric_ranges_stay_lazy() -> None:
+    # A hundred million values: parsing, counting and starting the expansion must not build them.
+    pattern = parse_pattern("{word}{0-99999999}x{a|b}")
+    assert pattern.combinations == 200_000_000
+    assert count_expansions([pattern], 3) == 600_000_003
+    expansions = pattern.expand("api")
+    assert [next(expansions) for _ in range(3)] == ["api0xa", "api0xb", "api1xa"]
+
+
+@pytest.mark.parametrize(
+    ("template", "message"),
+    [
+        ("", "non-empty"),
+        ("static", "no fields"),
+        ("{word}_{0-1}", "invalid literal"),
+        ("{word}-{9-1}", "empty range"),
+        ("{word}-{env}", "unknown field"),
+    ],
+)
+def test_parse_pattern_rejects_bad_templates(template: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        parse_pattern(template)
+
+
+def test_load_pattern_set(tmp_path: Path) -> None:
+    path = tmp_path / "envs.txt"
+    path.write_text("# envs\nDev\nstaging\ndev\n", encoding="utf-8")
+    assert load_pattern_set(f"env={path}") == ("env", ["dev", "staging"])
+    with pytest.raises(ValueError, match="NAME=PATH"):
+        load_pattern_set("env")
+
+
+def test_expansion_count_is_exact_and_drops_invalid_labels() -> None:
+    patterns = [
+        parse_pattern("{word}-{a|b}"),
+        parse_pattern("x{0-3}"),
+        parse_pattern("{word}{0-9}"),
+    ]
+    words = ["api", "w" * 62, "db"]
+    dropped: list[int] = []
+    labels = list(expand_patterns(iter(words), patterns, on_invalid=dropped.append))
+
+    # "w" * 62 + "0" is 63 characters (valid); "w" * 62 + "-a" is 64 (dropped).
+    assert sum(dropped) == 2
+    assert len(labels) + sum(dropped) == count_expansions(patterns, len(words))
+    assert labels[:4] == ["api", "api-a", "api-b", "api0"]
+    assert labels[-4:] == ["x0", "x1", "x2", "x3"]
+
+
+def test_scan_patterns_dedupe_against_wordlist_and_report_plan(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        if name == "api-dev.pattern.test":
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("# comment\napi\napi-dev\n", encoding="utf-8")
+    progress = io.StringIO()
+
+    summary = scan_domains_summary(
+        domain="pattern.test",
+        wordlist=wordlist,
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=1,
+        patterns=["{word}-{env}"],
+        pattern_sets={"env": ["dev", "prod"]},
+        progress_stream=progress,
+        progress_every_s=0,
+    )
+
+    # api, api-dev, api-prod, api-dev (again), api-dev-dev, api-dev-prod
+    assert summary.labels_planned == 6
+    assert summary.labels_total == 6
+    assert summary.labels_deduped == 1
+    assert summary.attempted == 5
+    assert summary.resolved == 1
+    assert summary.labels_invalid == 0
+    assert "labels=6/6 eta_s=0" in progress.getvalue().splitlines()[-1]
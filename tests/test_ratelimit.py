@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from subdomain_scout.ratelimit import RateLimiter, resolver_key
+
+
+def test_rate_limiter_paces_queries_evenly() -> None:
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire("system")
+    # Five 20ms slots after the first (immediate) query.
+    assert time.monotonic() - start >= 0.09
+    counts, delayed = limiter.snapshot()
+    assert counts == {"system": 6}
+    assert delayed == 5
+
+
+def test_rate_limiter_per_resolver_caps_are_independent() -> None:
+    limiter = RateLimiter(per_resolver_rate=20)
+    start = time.monotonic()
+    threads = [
+        threading.Thread(target=limiter.acquire, args=(resolver,))
+        for resolver in ("1.1.1.1:53", "8.8.8.8:53", "9.9.9.9:53")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # One query per resolver never waits on the others.
+    assert time.monotonic() - start < 0.04
+    limiter.acquire("1.1.1.1:53")
+    assert time.monotonic() - start >= 0.04
+    counts, delayed = limiter.snapshot()
+    assert counts["1.1.1.1:53"] == 2
+    assert delayed == 1
+
+
+def test_rate_limiter_without_caps_only_counts() -> None:
+    limiter = RateLimiter()
+    for _ in range(100):
+        limiter.acquire("system")
+    limiter.merge({"system": 5, "1.1.1.1:53": 2}, 3)
+    assert limiter.snapshot() == ({"system": 105, "1.1.1.1:53": 2}, 3)
+
+
+def test_rate_limiter_validates_rates() -> None:
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        RateLimiter(per_resolver_rate=-1)
+
+
+def test_resolver_key_brackets_ipv6() -> None:
+    assert resolver_key(("1.1.1.1", 53)) == "1.1.1.1:53"
+    assert resolver_key(("2606:4700:4700::1111", 53)) == "[2606:4700:4700::1111]:53"
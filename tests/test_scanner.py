@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import itertools
 import json
 import socket
+import sys
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -135,7 +143,7 @@ def test_scan_takeover_checker_preserves_cnames(
 ) -> None:
     import subdomain_scout.scanner as scanner
 
-    def fake_resolve_with_retries(_name: str, **_kwargs: object) -> scanner.Result:
+    def fake_resolve(_name: str, **_kwargs: object) -> scanner.Result:
         return scanner.Result(
             subdomain="a.cname.test",
             ips=["1.1.1.1"],
@@ -144,7 +152,7 @@ def test_scan_takeover_checker_preserves_cnames(
             cnames=["target.example.com"],
         )
 
-    monkeypatch.setattr(scanner, "_resolve_with_retries", fake_resolve_with_retries)
+    monkeypatch.setattr(scanner, "_resolve", fake_resolve)
 
     out = tmp_path / "out.jsonl"
     summary = scanner.scan_domains_summary_lines(
@@ -159,3 +167,688 @@ def test_scan_takeover_checker_preserves_cnames(
     row = json.loads(out.read_text(encoding="utf-8").splitlines()[0])
     assert row["cnames"] == ["target.example.com"]
     assert row["takeover"]["service"] == "TestSvc"
+
+
+def test_scan_multiple_domains_interleaves_and_summarizes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        if name == "www.one.test":
+            return [(None, None, None, None, ("1.1.1.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    summary = scan_domains_summary_lines(
+        domains=["one.test", "two.test"],
+        wordlist_lines=["www\n", "api\n", "www\n"],
+        out_path=out,
+        timeout=0.1,
+        concurrency=1,
+        extra_labels={"two.test": ["ct", "www"]},
+    )
+
+    # CT labels go first; the wordlist then skips pairs they already covered.
+    assert queried == [
+        "ct.two.test",
+        "www.two.test",
+        "www.one.test",
+        "api.one.test",
+        "api.two.test",
+    ]
+    assert summary.attempted == 5
+    assert summary.labels_total == 5
+    assert summary.labels_deduped == 2
+    by_domain = {item.domain: item for item in summary.domains}
+    assert by_domain["one.test"].attempted == 2
+    assert by_domain["one.test"].resolved == 1
+    assert by_domain["two.test"].attempted == 3
+    assert by_domain["two.test"].not_found == 3
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_scan_multiple_domains_resume_is_per_domain(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        return [(None, None, None, None, ("8.8.8.8", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    out.write_text(json.dumps({"subdomain": "a.one.test", "status": "resolved"}) + "\n")
+    summary = scan_domains_summary_lines(
+        domains=["one.test", "two.test"],
+        wordlist_lines=["a\n"],
+        out_path=out,
+        timeout=0.1,
+        concurrency=1,
+        resume=True,
+    )
+
+    assert summary.attempted == 1
+    assert summary.labels_skipped_existing == 1
+    by_domain = {item.domain: item for item in summary.domains}
+    assert by_domain["one.test"].labels_skipped_existing == 1
+    assert by_domain["two.test"].attempted == 1
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row["subdomain"] for row in rows] == ["a.one.test", "a.two.test"]
+
+
+def test_scan_hosts_streams_fqdns_across_zones(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        return [(None, None, None, None, ("1.1.1.1", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import scan_hosts_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    summary = scan_hosts_summary_lines(
+        hosts_lines=[
+            "# tool output\n",
+            "WWW.one.test.\n",
+            "api.dev.two.test extra\n",
+            "www.one.test\n",
+        ],
+        out_path=out,
+        timeout=0.1,
+        concurrency=1,
+    )
+
+    assert queried == ["www.one.test", "api.dev.two.test"]
+    assert summary.attempted == 2
+    assert summary.labels_total == 3
+    assert summary.labels_deduped == 1
+
+
+def test_scan_hosts_resume_skips_recorded_hosts(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        return [(None, None, None, None, ("1.1.1.1", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import scan_hosts_summary_lines
+
+    out = tmp_path / "out.jsonl"
+    out.write_text(json.dumps({"subdomain": "a.one.test", "status": "resolved"}) + "\n")
+    summary = scan_hosts_summary_lines(
+        hosts_lines=["a.one.test\n", "a.two.test\n"],
+        out_path=out,
+        timeout=0.1,
+        concurrency=1,
+        resume=True,
+    )
+
+    assert summary.attempted == 1
+    assert summary.labels_skipped_existing == 1
+
+
+def test_scan_hosts_rejects_invalid_hostnames(tmp_path: Path) -> None:
+    from subdomain_scout.scanner import scan_hosts_summary_lines
+
+    with pytest.raises(ValueError, match="at least one dot"):
+        scan_hosts_summary_lines(
+            hosts_lines=["localhost\n"],
+            out_path=tmp_path / "out.jsonl",
+            timeout=0.1,
+            concurrency=1,
+        )
+
+
+def test_scan_shards_partition_candidates_exactly(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    queried: list[str] = []
+
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        queried.append(name)
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    words = [f"w{i}\n" for i in range(40)]
+    per_shard: list[list[str]] = []
+    for index in (1, 2, 3):
+        queried.clear()
+        summary = scan_domains_summary_lines(
+            domain="shard.test",
+            wordlist_lines=words,
+            out_path=tmp_path / f"out{index}.jsonl",
+            timeout=0.1,
+            concurrency=1,
+            shard=(index, 3),
+        )
+        assert summary.shard == f"{index}/3"
+        assert summary.attempted + summary.labels_other_shard == 40
+        per_shard.append(list(queried))
+
+    assert all(per_shard)
+    scanned = [name for names in per_shard for name in names]
+    assert sorted(scanned) == sorted(f"w{i}.shard.test" for i in range(40))
+
+
+def test_scan_shard_resume_ignores_other_shards(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        return [(None, None, None, None, ("1.1.1.1", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import _shard_index, scan_domains_summary_lines
+
+    words = [f"w{i}" for i in range(20)]
+    mine = [w for w in words if _shard_index(f"{w}.shard.test", 2) == 0]
+    theirs = [w for w in words if _shard_index(f"{w}.shard.test", 2) == 1]
+    out = tmp_path / "out.jsonl"
+    out.write_text(
+        "".join(
+            json.dumps({"subdomain": f"{w}.shard.test", "status": "resolved"}) + "\n"
+            for w in (mine[0], theirs[0])
+        )
+    )
+
+    summary = scan_domains_summary_lines(
+        domain="shard.test",
+        wordlist_lines=[f"{w}\n" for w in words],
+        out_path=out,
+        timeout=0.1,
+        concurrency=1,
+        shard=(1, 2),
+        resume=True,
+    )
+
+    assert summary.labels_skipped_existing == 1
+    assert summary.attempted == len(mine) - 1
+    assert summary.labels_other_shard == len(theirs)
+
+
+def test_scan_rate_limit_paces_queries_and_reports_rates(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        return [(None, None, None, None, ("192.0.2.1", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    start = time.monotonic()
+    summary = scan_domains_summary_lines(
+        domain="rate.test",
+        wordlist_lines=[f"w{i}" for i in range(8)],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.5,
+        concurrency=8,
+        rate=100,
+    )
+    assert time.monotonic() - start >= 0.065
+    assert summary.attempted == 8
+    assert summary.queries == 8
+    assert summary.queries_delayed == 7
+    assert summary.resolver_queries == (("system", 8),)
+    assert summary.rate_limit == 100
+
+
+def test_concurrency_controller_grows_then_backs_off_on_congestion() -> None:
+    from subdomain_scout.scanner import Result, _ConcurrencyController
+
+    ok = Result(subdomain="a.test", ips=["192.0.2.1"], status="resolved", elapsed_ms=10)
+    timeout = Result(
+        subdomain="b.test", ips=[], status="error", elapsed_ms=10, error_type="timeout"
+    )
+    refused = replace(timeout, error_type="dns", error_code=5)
+    controller = _ConcurrencyController(initial=4, maximum=64)
+
+    for _ in range(4):
+        controller.observe(ok)
+    assert controller.window == 8  # slow start doubles per clean round
+    for _ in range(8):
+        controller.observe(ok)
+    assert controller.window == 16
+
+    controller.observe(timeout)
+    assert controller.window == 16  # a single failure is tolerated
+    controller.observe(refused)
+    assert controller.window == 8  # then it halves immediately
+
+    for _ in range(8):
+        controller.observe(ok)
+    assert controller.window == 9  # additive increase after the first back-off
+
+    slow = replace(ok, elapsed_ms=500)
+    for _ in range(9):
+        controller.observe(slow)
+    assert controller.window == 4  # latency blow-up counts as congestion
+    assert [window for _elapsed, window in controller.history][0] == 4
+
+
+def test_scan_adaptive_concurrency_reports_window(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        if name.startswith("ok"):
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    summary = scan_domains_summary_lines(
+        domain="auto.test",
+        wordlist_lines=[f"ok{i}" for i in range(50)] + [f"miss{i}" for i in range(50)],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.5,
+        concurrency=4,
+        adaptive_concurrency=True,
+    )
+    assert summary.attempted == 100
+    assert summary.resolved == 50
+    assert summary.concurrency_auto
+    assert summary.concurrency_window > 4
+    assert summary.concurrency_history[0] == (summary.concurrency_history[0][0], 4)
+
+
+def test_scan_retries_are_deferred_and_rotate_resolvers(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    import subdomain_scout.scanner as scanner
+
+    first_resolver: dict[str, list[str]] = {}
+
+    def fake_resolve(name: str, **kwargs: object) -> scanner.Result:
+        nameservers = kwargs["nameservers"]
+        assert isinstance(nameservers, list)
+        tries = first_resolver.setdefault(name, [])
+        tries.append(nameservers[0][0])
+        if name == "flaky.defer.test" and len(tries) == 1:
+            return scanner.Result(
+                subdomain=name, ips=[], status="error", elapsed_ms=1, error_type="timeout"
+            )
+        return scanner.Result(subdomain=name, ips=["192.0.2.1"], status="resolved", elapsed_ms=1)
+
+    monkeypatch.setattr(scanner, "_resolve", fake_resolve)
+
+    out = tmp_path / "out.jsonl"
+    summary = scanner.scan_domains_summary_lines(
+        domain="defer.test",
+        wordlist_lines=["flaky"] + [f"w{i}" for i in range(5)],
+        out_path=out,
+        timeout=0.5,
+        concurrency=2,
+        retries=2,
+        retry_backoff_ms=200,
+        nameservers=[("192.0.2.53", 53), ("198.51.100.53", 53)],
+    )
+    assert summary.resolved == 6
+    assert first_resolver["flaky.defer.test"] == ["192.0.2.53", "198.51.100.53"]
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    # The retry waited on the delay queue while fresh names used the freed slot.
+    assert rows[-1]["subdomain"] == "flaky.defer.test"
+    assert rows[-1]["attempts"] == 2
+    assert rows[-1]["retries"] == 1
+    assert all(row["attempts"] == 1 for row in rows[:-1])
+
+
+def test_iter_results_blocks_while_window_is_full_and_retry_is_due(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import concurrent.futures
+
+    import subdomain_scout.scanner as scanner
+
+    waits: list[float | None] = []
+    real_wait = concurrent.futures.wait
+
+    def counting_wait(*args: Any, **kwargs: Any) -> Any:
+        waits.append(kwargs.get("timeout"))
+        return real_wait(*args, **kwargs)
+
+    monkeypatch.setattr(scanner, "wait", counting_wait)
+    failed: set[str] = set()
+
+    def work(item: str) -> str:
+        if item == "slow":
+            time.sleep(0.5)
+        if item == "flaky" and item not in failed:
+            failed.add(item)
+            return "retry"
+        return item
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            scanner._iter_results(
+                executor,
+                work,
+                iter(["flaky", "slow"]),
+                window=1,
+                retry=lambda result: (0.1, "flaky") if result == "retry" else None,
+            )
+        )
+
+    assert results == ["slow", "flaky"]
+    # The retry falls due while "slow" fills the window; that must not spin on wait(timeout=0).
+    assert len(waits) < 10
+
+
+def test_scan_recursive_scans_existing_names_as_zones_and_prunes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    import subdomain_scout.scanner as scanner
+
+    queried: list[str] = []
+    live = {"dev.rec.test", "wild.rec.test", "api.dev.rec.test", "api.eu.rec.test"}
+
+    def fake_resolve(name: str, **_kwargs: object) -> scanner.Result:
+        if not name.startswith("_sdscout-"):
+            queried.append(name)
+        if name in live or name.endswith(".wild.rec.test"):
+            ips = ["192.0.2.99"] if "wild" in name else ["192.0.2.1"]
+            return scanner.Result(subdomain=name, ips=ips, status="resolved", elapsed_ms=1)
+        # eu.rec.test only exists as the parent of api.eu.rec.test (NOERROR, no addresses).
+        nodata = name == "eu.rec.test"
+        return scanner.Result(
+            subdomain=name, ips=[], status="not_found", elapsed_ms=1, nodata=nodata
+        )
+
+    monkeypatch.setattr(scanner, "_resolve", fake_resolve)
+    words = tmp_path / "second.txt"
+    words.write_text("api\nold\na.old\nwww\n", encoding="utf-8")
+
+    summary = scanner.scan_domains_summary_lines(
+        domain="rec.test",
+        wordlist_lines=["dev", "eu", "wild", "gone"],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=1,
+        detect_wildcard=True,
+        nameservers=[("192.0.2.53", 53)],
+        recursive=1,
+        recursive_wordlist=words,
+    )
+
+    assert queried[:4] == ["dev.rec.test", "eu.rec.test", "wild.rec.test", "gone.rec.test"]
+    assert queried[4:] == [
+        "api.dev.rec.test",
+        "old.dev.rec.test",
+        "www.dev.rec.test",
+        "api.eu.rec.test",
+        "old.eu.rec.test",
+        "www.eu.rec.test",
+        # The wildcard zone is dropped after its first answer.
+        "api.wild.rec.test",
+    ]
+    assert summary.zones_recursive == 3
+    assert summary.labels_recursive == 7
+    assert summary.labels_pruned == 2
+    assert summary.resolved == 4
+    assert summary.wildcard == 1
+
+
+def test_scan_recursive_threaded_scans_zones_found_after_input_runs_dry(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    import subdomain_scout.scanner as scanner
+
+    queried: list[str] = []
+    live = {"dev.rec.test", "api.dev.rec.test", "api.eu.rec.test"}
+
+    def fake_resolve(name: str, **_kwargs: object) -> scanner.Result:
+        if not name.startswith("_sdscout-"):
+            queried.append(name)
+        if name in live:
+            return scanner.Result(
+                subdomain=name, ips=["192.0.2.1"], status="resolved", elapsed_ms=1
+            )
+        nodata = name == "eu.rec.test"
+        return scanner.Result(
+            subdomain=name, ips=[], status="not_found", elapsed_ms=1, nodata=nodata
+        )
+
+    monkeypatch.setattr(scanner, "_resolve", fake_resolve)
+    words = tmp_path / "second.txt"
+    words.write_text("api\nwww\n", encoding="utf-8")
+
+    # All input fits in the first window, so every zone is only known from a later result.
+    summary = scanner.scan_domains_summary_lines(
+        domain="rec.test",
+        wordlist_lines=["dev", "eu", "gone"],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=4,
+        detect_wildcard=True,
+        nameservers=[("192.0.2.53", 53)],
+        recursive=1,
+        recursive_wordlist=words,
+    )
+
+    assert sorted(queried) == sorted(
+        [
+            "dev.rec.test",
+            "eu.rec.test",
+            "gone.rec.test",
+            "api.dev.rec.test",
+            "www.dev.rec.test",
+            "api.eu.rec.test",
+            "www.eu.rec.test",
+        ]
+    )
+    assert summary.zones_recursive == 2
+    assert summary.labels_recursive == 4
+    assert summary.resolved == 3
+
+
+def test_feed_hands_out_each_name_once_across_threads() -> None:
+    import subdomain_scout.scanner as scanner
+
+    # Coordinator threads poll the feed while the scan thread offers harvested names.
+    feed = scanner._Feed((("t.test", f"w{i}") for i in range(2000)), shard=None)
+    taken: list[tuple[str, str]] = []
+
+    def poll() -> None:
+        for _ in range(4000):
+            taken.extend(itertools.islice(feed, 1))
+
+    threads = [threading.Thread(target=poll) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(2000):
+        feed.offer("t.test", [f"h{i}.t.test", f"w{i}.t.test"])
+    for thread in threads:
+        thread.join()
+    taken.extend(feed)
+    feed.close()
+
+    expected = {("t.test", f"{prefix}{i}") for prefix in ("w", "h") for i in range(2000)}
+    assert len(taken) == len(expected)
+    assert set(taken) == expected
+
+
+def test_scan_query_budget_stops_new_names(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    summary = scan_domains_summary_lines(
+        domain="budget.test",
+        wordlist_lines=[f"w{i}" for i in range(10)],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=1,
+        query_budget=3,
+    )
+    assert summary.attempted == 3
+    assert summary.queries == 3
+    assert summary.query_budget_exhausted
+
+
+def test_query_budget_rejects_workers_and_listen(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    from subdomain_scout.cli import main
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    with pytest.raises(ValueError, match="query_budget cannot be used with workers"):
+        scan_domains_summary_lines(
+            domain="budget.test",
+            wordlist_lines=["www"],
+            out_path=tmp_path / "out.jsonl",
+            timeout=0.1,
+            workers=2,
+            query_budget=3,
+        )
+    for extra in (["--workers", "2"], ["--listen", "127.0.0.1:0"]):
+        rc = main(
+            ["scan", "--domain", "budget.test", "--wordlist", "-", "--out", "-"]
+            + ["--query-budget", "3", *extra]
+        )
+        assert rc == 2
+        assert "--query-budget cannot be used with --workers or --listen" in capsys.readouterr().err
+
+
+def test_scan_with_worker_processes_merges_output_and_counters(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    host, port = dns_server
+    out = tmp_path / "out.jsonl"
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a\n", "b\n", "c\n", "d\n", "e\n", "a\n"],
+        out_path=out,
+        timeout=0.5,
+        concurrency=2,
+        workers=2,
+        include_cname=True,
+        nameservers=[(host, port)],
+    )
+
+    assert summary.attempted == 5
+    assert summary.labels_deduped == 1
+    assert summary.resolved == 2
+    assert summary.cname == 1
+    assert summary.not_found == 2
+    assert summary.written == 5
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert sorted(row["subdomain"] for row in rows) == [
+        "a.res.test",
+        "b.res.test",
+        "c.res.test",
+        "d.res.test",
+        "e.res.test",
+    ]
+    assert summary.executor == "processes"
+
+
+def test_scan_with_interpreter_workers_matches_threaded_scan(
+    tmp_path: Path, dns_server: tuple[str, int]
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    host, port = dns_server
+    out = tmp_path / "out.jsonl"
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a\n", "b\n", "c\n", "d\n", "e\n"],
+        out_path=out,
+        timeout=0.5,
+        concurrency=2,
+        workers=2,
+        worker_executor="interpreters",
+        include_cname=True,
+        nameservers=[(host, port)],
+    )
+
+    has_interpreters = hasattr(concurrent.futures, "InterpreterPoolExecutor")
+    assert summary.executor == ("interpreters" if has_interpreters else "threads")
+    assert summary.attempted == 5
+    assert summary.resolved == 2
+    assert summary.cname == 1
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_scan_interpreter_workers_fall_back_to_threads(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: Path,
+    dns_server: tuple[str, int],
+) -> None:
+    from subdomain_scout.scanner import scan_domains_summary_lines
+
+    monkeypatch.delattr(concurrent.futures, "InterpreterPoolExecutor", raising=False)
+    host, port = dns_server
+    summary = scan_domains_summary_lines(
+        domain="res.test",
+        wordlist_lines=["a\n", "zz\n"],
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.5,
+        workers=4,
+        worker_executor="interpreters",
+        nameservers=[(host, port)],
+    )
+    assert summary.executor == "threads"
+    assert summary.resolved == 1
+    assert summary.not_found == 1
+    assert [record.levelname for record in caplog.records] == ["WARNING"]
+    assert "resolving on threads in this process instead of 4 workers" in caplog.text
+
+
+@pytest.mark.skipif(sys.version_info < (3, 14), reason="InterpreterPoolExecutor needs 3.14+")
+def test_interpreter_worker_pool_runs_chunks_with_partial_takeover_checker(
+    dns_server: tuple[str, int],
+) -> None:
+    from subdomain_scout.scanner import _new_worker_pool, _scan_worker_chunk, _WorkerConfig
+
+    # `build_takeover_checker` hands out a functools.partial; it reaches each interpreter
+    # through the pool initializer along with the rest of the config.
+    checker = functools.partial(dict.get, {"a.res.test": {"service": "demo"}})
+    config = _WorkerConfig(
+        timeout=0.5,
+        concurrency=2,
+        statuses=None,
+        detect_wildcard=False,
+        wildcard_probes=2,
+        wildcard_threshold=1,
+        wildcard_verify_http=False,
+        wildcard_http_timeout=3.0,
+        include_cname=False,
+        retries=0,
+        retry_backoff_ms=0,
+        takeover_checker=checker,
+        nameservers=[dns_server],
+        rate=None,
+        rate_per_resolver=None,
+        adaptive_concurrency=False,
+        deadline=None,
+        sweep=True,
+    )
+    pool = _new_worker_pool("interpreters", 2, config)
+    assert pool is not None and type(pool).__name__ == "InterpreterPoolExecutor"
+    with pool:
+        result = pool.submit(_scan_worker_chunk, [("res.test", "a"), ("res.test", "zz")]).result()
+    statuses = {label: status for _domain, label, status, *_rest in result.outcomes}
+    assert statuses == {"a": "resolved", "zz": "not_found"}
+    assert result.takeover_checked == 1
+    assert result.takeover_suspected == 1
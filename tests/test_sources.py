@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import socket
+
+import pytest
+
+from subdomain_scout.dns_client import name_exists
+from subdomain_scout.sources import SourceAddresses
+
+
+def test_source_addresses_rotate_per_family_and_count() -> None:
+    sources = SourceAddresses(["127.0.0.1", "127.0.0.2", "127.0.0.1", "::1"])
+    assert sources.addresses == ("127.0.0.1", "127.0.0.2", "::1")
+    assert [sources.pick("192.0.2.53") for _ in range(3)] == ["127.0.0.1", "127.0.0.2", "127.0.0.1"]
+    assert sources.pick("2001:db8::53") == "::1"
+    sources.failed("127.0.0.2")
+    sources.failed(None)
+    assert sources.snapshot() == {"127.0.0.1": (2, 0), "127.0.0.2": (1, 1), "::1": (1, 0)}
+
+
+def test_source_addresses_without_matching_family_use_kernel_default() -> None:
+    sources = SourceAddresses(["127.0.0.1"])
+    assert sources.pick("2001:db8::53") is None
+    assert sources.snapshot() == {"127.0.0.1": (0, 0)}
+
+
+def test_source_addresses_reject_invalid_or_foreign_addresses() -> None:
+    with pytest.raises(ValueError, match="invalid source address"):
+        SourceAddresses(["not-an-ip"])
+    with pytest.raises(ValueError, match="cannot bind source address 192.0.2.1"):
+        SourceAddresses(["192.0.2.1"])
+
+
+def test_failed_queries_are_counted_against_their_source() -> None:
+    sources = SourceAddresses(["127.0.0.1", "127.0.0.2"])
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as silent:
+        silent.bind(("127.0.0.1", 0))
+        with pytest.raises(TimeoutError):
+            name_exists(
+                "slow.res.test",
+                nameservers=[silent.getsockname()] * 2,
+                timeout=0.1,
+                sources=sources,
+            )
+    assert sources.snapshot() == {"127.0.0.1": (1, 1), "127.0.0.2": (1, 1)}
@@ -1,8 +1,43 @@
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Callable
+
 import pytest
 
-from subdomain_scout.validation import normalize_domain, normalize_label
+from subdomain_scout.validation import (
+    load_domains_file,
+    normalize_domain,
+    normalize_domains,
+    normalize_label,
+    normalize_labels,
+    parse_shard,
+)
+
+_MIXED = [
+    "WWW",
+    " api. ",
+    "deep.Api",
+    "bad_name",
+    "",
+    "-lead",
+    "a" * 63,
+    "a" * 64,
+    ".".join(["abc"] * 63),
+    ".".join(["abc"] * 64),
+    "example.com",
+    "localhost",
+]
+
+
+def _one_by_one(normalize: Callable[[str], str], raws: list[str]) -> list[str]:
+    out = []
+    for raw in raws:
+        try:
+            out.append(normalize(raw))
+        except ValueError:
+            continue
+    return out
 
 
 def test_normalize_domain_lowercases_and_strips_dots() -> None:
@@ -21,3 +56,43 @@ def test_normalize_label_accepts_nested_labels() -> None:
 def test_normalize_label_rejects_invalid_chars() -> None:
     with pytest.raises(ValueError):
         normalize_label("bad_name")
+
+
+@pytest.mark.parametrize("repeats", [1, 4])
+def test_batch_normalization_matches_single_name_rules(repeats: int) -> None:
+    # Repeats take the memoized path; both must agree with the per-name functions.
+    raws = _MIXED * repeats
+    assert normalize_labels(raws, skip_invalid=True) == _one_by_one(normalize_label, raws)
+    assert normalize_domains(raws, skip_invalid=True) == _one_by_one(normalize_domain, raws)
+    assert normalize_labels(["A", "b.C", "A"]) == ["a", "b.c", "a"]
+
+
+def test_batch_normalization_raises_first_invalid_entry_error() -> None:
+    with pytest.raises(ValueError, match="invalid label: 'bad_name'"):
+        normalize_labels(["ok", "bad_name", "-lead"])
+    with pytest.raises(ValueError, match="domain must contain at least one dot"):
+        normalize_domains(["example.com", "localhost"] * 3)
+
+
+def test_load_domains_file_normalizes_and_dedupes(tmp_path: Path) -> None:
+    p = tmp_path / "domains.txt"
+    p.write_text("# targets\nExample.com\nexample.com. # dup\n\nother.test\n", encoding="utf-8")
+    assert load_domains_file(p) == ["example.com", "other.test"]
+
+
+def test_load_domains_file_reports_line_numbers(tmp_path: Path) -> None:
+    p = tmp_path / "domains.txt"
+    p.write_text("example.com\nlocalhost\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"domains\.txt:2"):
+        load_domains_file(p)
+
+
+def test_parse_shard_accepts_one_based_specs() -> None:
+    assert parse_shard("1/4") == (1, 4)
+    assert parse_shard(" 4/4 ") == (4, 4)
+
+
+@pytest.mark.parametrize("spec", ["0/4", "5/4", "1", "a/b", "1/0"])
+def test_parse_shard_rejects_invalid_specs(spec: str) -> None:
+    with pytest.raises(ValueError, match="invalid shard"):
+        parse_shard(spec)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from subdomain_scout.scanner import scan_domains_summary
+from subdomain_scout.wordlist import (
+    _iter_compiled_records,
+    _iter_labels,
+    _iter_labels_lines,
+    _iter_labels_mmap,
+    _worker_context,
+    compile_wordlist,
+    read_compiled_header,
+)
+
+_TRICKY = (
+    "# header comment\n"
+    "www\n"
+    "  API  trailing words\r\n"
+    "\n"
+    "mail.\r"
+    "   # indented comment\n"
+    ".dev.staging.\n"
+    "\t\n"
+    "www\n"
+    "#notalabel\n"
+    "x1\n"
+    "last-without-newline"
+)
+
+
+def test_mmap_reader_matches_line_reader_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "words.txt"
+    lines = [_TRICKY] + [f"host{i}\n" for i in range(500)]
+    path.write_bytes("".join(lines).encode("utf-8"))
+    with path.open("r", encoding="utf-8") as fh:
+        expected = list(_iter_labels_lines(fh))
+
+    # Tiny chunks force many cuts, including next to "\r\n" pairs and comment lines.
+    for chunk_bytes in (1, 7, 64, 1 << 20):
+        assert list(_iter_labels_mmap(path, workers=2, chunk_bytes=chunk_bytes)) == expected
+    assert expected[:6] == ["www", "api", "mail", "dev.staging", "www", "x1"]
+    assert list(_iter_labels(path)) == expected
+    # Workers never fork the (possibly multithreaded) scan process.
+    assert _worker_context().get_start_method() in ("forkserver", "spawn")
+
+
+@pytest.mark.parametrize("chunk_bytes", [4, 1024])
+def test_mmap_reader_raises_after_yielding_valid_prefix(tmp_path: Path, chunk_bytes: int) -> None:
+    # With 1024 bytes the valid labels share the chunk that holds the bad one.
+    path = tmp_path / "words.txt"
+    path.write_text("ok1\nok2\nbad_label!\nok3\n", encoding="utf-8")
+    labels: list[str] = []
+    with pytest.raises(ValueError, match="invalid label"):
+        for label in _iter_labels_mmap(path, workers=2, chunk_bytes=chunk_bytes):
+            labels.append(label)
+    assert labels == ["ok1", "ok2"]
+
+
+def test_line_reader_raises_after_yielding_valid_prefix() -> None:
+    lines = [f"ok{i}\n" for i in range(1500)] + ["bad_label!\n", "late\n"]
+    labels: list[str] = []
+    with pytest.raises(ValueError, match="invalid label"):
+        for label in _iter_labels_lines(lines):
+            labels.append(label)
+    assert labels == [f"ok{i}" for i in range(1500)]
+
+
+def test_mmap_reader_handles_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(_iter_labels_mmap(path, workers=2)) == []
+
+
+def test_compiled_wordlist_round_trips_deduplicated_labels(tmp_path: Path) -> None:
+    source = tmp_path / "words.txt"
+    source.write_text(_TRICKY, encoding="utf-8")
+    compiled_path = tmp_path / "words.sdw"
+
+    compiled = compile_wordlist(source, compiled_path, wire=True)
+
+    assert compiled.labels_total == 7
+    assert compiled.labels == 6
+    assert compiled.labels_deduped == 1
+    assert compiled.size_bytes == compiled_path.stat().st_size
+    assert not compiled_path.with_name("words.sdw.tmp").exists()
+    header = read_compiled_header(compiled_path)
+    assert (header.labels, header.wire, header.sha256) == (6, True, compiled.sha256)
+
+    expected = ["www", "api", "mail", "dev.staging", "x1", "last-without-newline"]
+    assert list(_iter_labels(compiled_path)) == expected
+    records = dict(_iter_compiled_records(compiled_path))
+    assert records["dev.staging"] == b"\x03dev\x07staging"
+
+    # The digest covers labels only: same list, same hash; wire form changes the records.
+    other = tmp_path / "again.sdw"
+    with source.open("r", encoding="utf-8") as fh:
+        assert compile_wordlist(fh, other, wire=True).sha256 == compiled.sha256
+    assert compile_wordlist(source, other).sha256 != compiled.sha256
+
+
+def test_compiled_wordlist_rejects_truncated_files(tmp_path: Path) -> None:
+    source = tmp_path / "words.txt"
+    source.write_text("alpha\nbeta\n", encoding="utf-8")
+    compiled_path = tmp_path / "words.sdw"
+    compile_wordlist(source, compiled_path)
+    compiled_path.write_bytes(compiled_path.read_bytes()[:-2])
+
+    with pytest.raises(ValueError, match="truncated compiled wordlist"):
+        list(_iter_labels(compiled_path))
+    with pytest.raises(ValueError, match="not a compiled wordlist"):
+        read_compiled_header(source)
+
+
+def test_compile_leaves_no_output_on_invalid_label(tmp_path: Path) -> None:
+    source = tmp_path / "words.txt"
+    source.write_text("ok\nbad_label!\n", encoding="utf-8")
+    compiled_path = tmp_path / "words.sdw"
+    with pytest.raises(ValueError, match="invalid label"):
+        compile_wordlist(source, compiled_path)
+    assert list(tmp_path.iterdir()) == [source]
+
+
+def test_scan_streams_compiled_wordlist(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def fake_getaddrinfo(name: str, _port: object) -> list[tuple[object, ...]]:
+        if name == "www.compiled.test":
+            return [(None, None, None, None, ("192.0.2.1", 0))]
+        raise socket.gaierror(getattr(socket, "EAI_NONAME", 8), "not found")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+    source = tmp_path / "words.txt"
+    source.write_text("www\nmail\nwww\n", encoding="utf-8")
+    compiled_path = tmp_path / "words.sdw"
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "subdomain_scout",
+            "wordlist",
+            "compile",
+            "--wordlist",
+            str(source),
+            "--out",
+            str(compiled_path),
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "compiled labels_total=3 labels_unique=2 labels_deduped=1" in proc.stderr
+
+    summary = scan_domains_summary(
+        domain="compiled.test",
+        wordlist=compiled_path,
+        out_path=tmp_path / "out.jsonl",
+        timeout=0.1,
+        concurrency=1,
+    )
+    assert summary.attempted == 2
+    assert summary.resolved == 1
+    assert summary.labels_total == 2